@@ -11,10 +11,12 @@ import typer
 
 from zendesk_skill import __version__
 from zendesk_skill import operations
-from zendesk_skill.client import ZendeskClientError
+from zendesk_skill.client import ZendeskClientError, close_client
 from zendesk_skill.operations import get_session_markers
 from zendesk_skill.queries import execute_jq, get_queries_for_tool, get_query
+from zendesk_skill.reporting import prepare_report_view
 from zendesk_skill.storage import load_response
+from zendesk_skill.utils import jsonio
 from zendesk_skill.utils.security import wrap_external_data, is_security_enabled
 
 # Main app
@@ -46,8 +48,18 @@ def output_error(message: str, exit_code: int = 1) -> None:
 
 
 def run_async(coro):
-    """Run async coroutine synchronously."""
-    return asyncio.run(coro)
+    """Run async coroutine synchronously.
+
+    The pooled HTTP connections are closed before the event loop ends, while
+    their sockets can still be shut down cleanly.
+    """
+    async def run():
+        try:
+            return await coro
+        finally:
+            await close_client()
+
+    return asyncio.run(run())
 
 
 def zendesk_command(func: Callable) -> Callable:
@@ -997,11 +1009,18 @@ def slack_report_cmd(
         str | None,
         typer.Option("--channel", "-c", help="Override Slack channel"),
     ] = None,
+    markdown_file: Annotated[
+        str | None,
+        typer.Option("--markdown", "-m", help="Also write the markdown report to this file"),
+    ] = None,
 ) -> None:
     """Send support metrics report to Slack.
 
     Uses the analysis file generated by the analyze script, or searches
     for the most recent support_analysis.json in the temp directory.
+
+    With --markdown, the markdown report is rendered in a worker thread
+    while the Slack request is in flight.
     """
     from zendesk_skill.storage import DEFAULT_STORAGE_DIR
 
@@ -1010,31 +1029,50 @@ def slack_report_cmd(
         path = Path(analysis_file)
     else:
         # Search for most recent analysis file
-        candidates = list(DEFAULT_STORAGE_DIR.glob("**/support_analysis.json"))
-        if not candidates:
+        path = max(
+            DEFAULT_STORAGE_DIR.glob("**/support_analysis.json"),
+            key=lambda f: f.stat().st_mtime,
+            default=None,
+        )
+        if path is None:
             output_error(
                 "No analysis file found. Run the analysis first or provide a file path.\n"
                 "Example: python src/zendesk_skill/scripts/analyze_support_metrics.py"
             )
-        path = max(candidates, key=lambda f: f.stat().st_mtime)
 
     if not path.exists():
         output_error(f"File not found: {path}")
 
     # Load analysis data
-    with open(path) as f:
-        report_data = json.load(f)
+    report_data = jsonio.load_file(path)
+
+    async def send_and_render() -> tuple[dict, str | None]:
+        if not markdown_file:
+            return await operations.send_slack_report(report_data, channel=channel), None
+        # Both renderers share one prepared view
+        prepared = prepare_report_view(report_data)
+        md_task = asyncio.create_task(
+            asyncio.to_thread(operations.generate_markdown_report, report_data, prepared)
+        )
+        slack_result = await operations.send_slack_report(report_data, channel=channel, prepared=prepared)
+        return slack_result, await md_task
 
     # Send to Slack
-    result = run_async(operations.send_slack_report(report_data, channel=channel))
+    result, markdown = run_async(send_and_render())
+
+    if markdown is not None:
+        Path(markdown_file).write_text(markdown)
 
     if result.get("success"):
-        output_json({
+        response = {
             "success": True,
             "message": result["message"],
             "channel": result["channel"],
             "source_file": str(path),
-        })
+        }
+        if markdown is not None:
+            response["markdown_file"] = markdown_file
+        output_json(response)
     else:
         output_error(result.get("error", "Failed to send report"))
 
@@ -1065,20 +1103,22 @@ def markdown_report_cmd(
         path = Path(analysis_file)
     else:
         # Search for most recent analysis file
-        candidates = list(DEFAULT_STORAGE_DIR.glob("**/support_analysis.json"))
-        if not candidates:
+        path = max(
+            DEFAULT_STORAGE_DIR.glob("**/support_analysis.json"),
+            key=lambda f: f.stat().st_mtime,
+            default=None,
+        )
+        if path is None:
             output_error(
                 "No analysis file found. Run the analysis first or provide a file path.\n"
                 "Example: uv run python src/zendesk_skill/scripts/analyze_support_metrics.py"
             )
-        path = max(candidates, key=lambda f: f.stat().st_mtime)
 
     if not path.exists():
         output_error(f"File not found: {path}")
 
     # Load analysis data
-    with open(path) as f:
-        report_data = json.load(f)
+    report_data = jsonio.load_file(path)
 
     # Generate markdown report
     markdown = operations.generate_markdown_report(report_data)
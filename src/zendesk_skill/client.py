@@ -1,13 +1,22 @@
 """Zendesk API client with authentication and request handling."""
 
+import asyncio
 import base64
+import hashlib
+import importlib.util
 import json
 import os
+import shutil
+import time
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlencode
 
 import httpx
 
+from zendesk_skill.storage import DEFAULT_STORAGE_DIR
+from zendesk_skill.utils import jsonio
+
 # Config directory and file locations
 CONFIG_DIR = Path.home() / ".config" / "zd-cli"
 CONFIG_PATH = CONFIG_DIR / "config.json"
@@ -38,9 +47,40 @@ _migration_done = False
 # Default timeout for API requests
 DEFAULT_TIMEOUT = 30.0
 
+# Default cap on concurrent API requests per client
+DEFAULT_MAX_CONCURRENCY = 10
+
 # Maximum redirects for attachment downloads
 MAX_REDIRECTS = 5
 
+# Bytes read per chunk when streaming attachment downloads to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Connection pool for the Zendesk API client (sized for gathered fan-out)
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=40)
+
+# HTTP/2 needs the optional h2 package (pip install zd-cli[fast])
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Opt-in on-disk cache for GET responses (ZENDESK_HTTP_CACHE=1), one
+# subdirectory per credential and per resource; private to the user. It holds
+# ticket and user data, so it lives with the other temporary responses.
+HTTP_CACHE_DIR = DEFAULT_STORAGE_DIR / "http_cache"
+HTTP_CACHE_TTL = 300.0  # Seconds a cached response is served without revalidation
+HTTP_CACHE_MAX_AGE = 24 * 3600.0  # Entries not refreshed for this long are deleted
+HTTP_CACHE_PRUNE_INTERVAL = 600.0  # Minimum seconds between prune passes
+
+# When this process last pruned the HTTP cache (0 = not yet)
+_http_cache_pruned_at = 0.0
+
+
+def _max_concurrency() -> int:
+    """Maximum concurrent API requests per client (ZENDESK_MAX_CONCURRENCY, default 10)."""
+    try:
+        return max(1, int(os.environ.get("ZENDESK_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)))
+    except ValueError:
+        return DEFAULT_MAX_CONCURRENCY
+
 
 class ZendeskClientError(Exception):
     """Base exception for Zendesk client errors."""
@@ -563,6 +603,29 @@ def clear_server_mode() -> dict:
     return config
 
 
+def _prune_http_cache(now: float) -> None:
+    """Delete HTTP cache entries older than HTTP_CACHE_MAX_AGE, and emptied directories.
+
+    Covers every credential, so entries left behind by an old token go too.
+    """
+    try:
+        identity_dirs = list(HTTP_CACHE_DIR.iterdir())
+    except OSError:
+        return
+    for identity_dir in identity_dirs:
+        try:
+            for resource_dir in identity_dir.iterdir():
+                for entry in resource_dir.iterdir():
+                    if now - entry.stat().st_mtime > HTTP_CACHE_MAX_AGE:
+                        entry.unlink(missing_ok=True)
+                if not any(resource_dir.iterdir()):
+                    resource_dir.rmdir()
+            if not any(identity_dir.iterdir()):
+                identity_dir.rmdir()
+        except OSError:
+            continue  # Concurrent writer or removal; try again next pass
+
+
 class ZendeskClient:
     """Async HTTP client for Zendesk API."""
 
@@ -602,11 +665,17 @@ class ZendeskClient:
         self.timeout = timeout
         self.base_url = f"https://{self._auth_provider.subdomain}.zendesk.com/api/v2"
         self._http_client: httpx.AsyncClient | None = None
+        # Caps requests in flight so gathered fan-out stays under Zendesk's rate limit
+        self._request_slots = asyncio.Semaphore(_max_concurrency())
 
     def _get_http_client(self) -> httpx.AsyncClient:
-        """Get or create the persistent HTTP client."""
+        """Get or create the persistent HTTP client.
+
+        Uses HTTP/2 when the h2 package is installed, so concurrent requests
+        share one connection to the Zendesk host.
+        """
         if self._http_client is None or self._http_client.is_closed:
-            self._http_client = httpx.AsyncClient()
+            self._http_client = httpx.AsyncClient(http2=_HTTP2_AVAILABLE, limits=HTTP_LIMITS)
         return self._http_client
 
     async def close(self) -> None:
@@ -649,18 +718,45 @@ class ZendeskClient:
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         client = self._get_http_client()
+        headers = self._get_headers()
+
+        cache_dirs = self._http_cache_dirs(endpoint, headers)
+        cache_path = None
+        if cache_dirs and method == "GET":
+            query = urlencode(sorted((params or {}).items()))
+            key = hashlib.blake2b(f"{url}?{query}".encode(), digest_size=16).hexdigest()
+            cache_path = cache_dirs[0] / f"{key}.json"
+        cached = await asyncio.to_thread(self._read_http_cache, cache_path) if cache_path else None
+        if cached is not None:
+            if time.time() - cached.get("stored_at", 0) < HTTP_CACHE_TTL:
+                return cached["data"]
+            # Stale: revalidate so an unchanged resource costs a 304 only
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
 
         try:
-            response = await client.request(
-                method=method,
-                url=url,
-                headers=self._get_headers(),
-                params=params,
-                json=json_data,
-                timeout=timeout or self.timeout,
-            )
+            async with self._request_slots:
+                response = await client.request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    json=json_data,
+                    timeout=timeout or self.timeout,
+                )
+            if cache_dirs and method != "GET":
+                # A write may have changed the resource and its collection
+                await asyncio.to_thread(self._invalidate_http_cache, cache_dirs)
+            if response.status_code == 304 and cached is not None and cache_path is not None:
+                await asyncio.to_thread(self._write_http_cache, cache_path, response, cached["data"], cached)
+                return cached["data"]
             response.raise_for_status()
-            return response.json()
+            data = jsonio.loads(response.content)
+            if cache_path is not None:
+                await asyncio.to_thread(self._write_http_cache, cache_path, response, data)
+            return data
 
         except httpx.HTTPStatusError as e:
             error_msg = self._format_http_error(e)
@@ -672,6 +768,86 @@ class ZendeskClient:
         except httpx.RequestError as e:
             raise ZendeskAPIError(f"Request failed: {e}") from e
 
+    def _http_cache_dirs(self, endpoint: str, headers: dict[str, str]) -> list[Path] | None:
+        """Return the cache directories an endpoint's responses belong to.
+
+        The first is the endpoint's resource (tickets/1.json and
+        tickets/1/comments.json both belong to tickets/1), followed by its
+        collection (tickets) if different. Both live under a directory keyed
+        by the subdomain and credentials, so responses are never served to a
+        different account.
+
+        Args:
+            endpoint: API endpoint (without base URL)
+            headers: Request headers, including the auth headers
+
+        Returns:
+            Resource and collection directories, or None if caching is off
+        """
+        if os.environ.get("ZENDESK_HTTP_CACHE") != "1":
+            return None
+        identity = hashlib.blake2b(
+            jsonio.dumps([self.base_url, sorted(headers.items())]), digest_size=16
+        ).hexdigest()
+        segments = endpoint.strip("/").removesuffix(".json").split("/")
+        resources = ["/".join(segments[:2])]
+        if len(segments) > 1:
+            resources.append(segments[0])
+        return [
+            HTTP_CACHE_DIR / identity / hashlib.blake2b(resource.encode(), digest_size=16).hexdigest()
+            for resource in resources
+        ]
+
+    @staticmethod
+    def _invalidate_http_cache(cache_dirs: list[Path]) -> None:
+        """Drop cached responses for these resources, for every credential."""
+        for cache_dir in cache_dirs:
+            for resource_dir in HTTP_CACHE_DIR.glob(f"*/{cache_dir.name}"):
+                shutil.rmtree(resource_dir, ignore_errors=True)
+
+    @staticmethod
+    def _read_http_cache(cache_path: Path) -> dict[str, Any] | None:
+        """Load a cache entry, treating unreadable or malformed entries as misses."""
+        try:
+            entry = jsonio.loads(cache_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        return entry if isinstance(entry, dict) and "data" in entry else None
+
+    @staticmethod
+    def _write_http_cache(
+        cache_path: Path,
+        response: httpx.Response,
+        data: Any,
+        previous: dict[str, Any] | None = None,
+    ) -> None:
+        """Store a response body with its validators for later revalidation.
+
+        Also prunes expired entries, at most once per HTTP_CACHE_PRUNE_INTERVAL.
+        """
+        global _http_cache_pruned_at
+        now = time.time()
+        if now - _http_cache_pruned_at >= HTTP_CACHE_PRUNE_INTERVAL:
+            _http_cache_pruned_at = now
+            _prune_http_cache(now)
+
+        previous = previous or {}
+        entry = {
+            "stored_at": now,
+            "etag": response.headers.get("ETag") or previous.get("etag"),
+            "last_modified": response.headers.get("Last-Modified") or previous.get("last_modified"),
+            "data": data,
+        }
+        try:
+            HTTP_CACHE_DIR.mkdir(parents=True, exist_ok=True, mode=0o700)
+            cache_path.parent.parent.mkdir(exist_ok=True, mode=0o700)
+            cache_path.parent.mkdir(exist_ok=True, mode=0o700)
+            fd = os.open(cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(jsonio.dumps(entry))
+        except OSError:
+            pass  # Caching is best-effort
+
     def _format_http_error(self, error: httpx.HTTPStatusError) -> str:
         """Format HTTP error into user-friendly message."""
         status = error.response.status_code
@@ -763,19 +939,28 @@ class ZendeskClient:
             max_redirects=MAX_REDIRECTS,
         ) as download_client:
             try:
-                response = await download_client.get(
+                async with download_client.stream(
+                    "GET",
                     url,
                     headers=self._auth_provider.get_auth_headers(),
                     timeout=timeout or self.timeout,
-                )
-                response.raise_for_status()
-
-                # Ensure parent directory exists
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-
-                # Write file
-                with open(output_path, "wb") as f:
-                    f.write(response.content)
+                ) as response:
+                    if response.is_error:
+                        # Error bodies are small; read them for the error message
+                        await response.aread()
+                    response.raise_for_status()
+
+                    # Ensure parent directory exists
+                    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+                    # Write file chunk by chunk so large attachments aren't held in memory
+                    try:
+                        with open(output_path, "wb") as f:
+                            async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                                f.write(chunk)
+                    except BaseException:
+                        output_path.unlink(missing_ok=True)
+                        raise
 
                 return output_path
 
@@ -804,3 +989,33 @@ def reset_client() -> None:
     """Reset the client singleton (useful for testing)."""
     global _client
     _client = None
+
+
+# Pooled client for Slack webhook posts, shared so repeated reports reuse the connection
+_slack_http: httpx.AsyncClient | None = None
+
+
+def get_slack_http() -> httpx.AsyncClient:
+    """Get or create the shared HTTP client for Slack webhooks."""
+    global _slack_http
+    if _slack_http is None or _slack_http.is_closed:
+        _slack_http = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60),
+        )
+    return _slack_http
+
+
+async def close_client() -> None:
+    """Close the pooled HTTP connections (Zendesk singleton and Slack), if any are open.
+
+    Must run on the event loop that used the pools: once that loop is closed,
+    its keep-alive sockets can no longer be closed cleanly.
+    """
+    global _slack_http
+    if _client is not None:
+        await _client.close()
+    if _slack_http is not None:
+        if not _slack_http.is_closed:
+            await _slack_http.aclose()
+        _slack_http = None
@@ -29,19 +29,21 @@ _HTML_START_PATTERN = re.compile(
 # section headers look proportionate. Zendesk supports H1–H4 only.
 _HEADING_SHIFT = 1
 _MAX_HEADING = 4
+_HEADING_TAG_PATTERN = re.compile(r"<(/?)h([1-6])>")
 
 
-def _downgrade_headings(html_content: str) -> str:
-    """Shift heading levels down and add spacing for Zendesk rendering."""
+def _shift_heading_tag(match: re.Match) -> str:
+    """Replacement for one opening or closing heading tag."""
+    slash = match.group(1)
+    level = min(int(match.group(2)) + _HEADING_SHIFT, _MAX_HEADING)
+    if slash:
+        return f"</h{level}>"
+    return f'<h{level} style="margin-bottom:0.4em;">'
 
-    def _replace(match: re.Match) -> str:
-        slash = match.group(1)
-        level = min(int(match.group(2)) + _HEADING_SHIFT, _MAX_HEADING)
-        if slash:
-            return f"</h{level}>"
-        return f'<h{level} style="margin-bottom:0.4em;">'
 
-    return re.sub(r"<(/?)h([1-6])>", _replace, html_content)
+def _downgrade_headings(html_content: str) -> str:
+    """Shift heading levels down and add spacing for Zendesk rendering."""
+    return _HEADING_TAG_PATTERN.sub(_shift_heading_tag, html_content)
 
 
 def markdown_to_html(content: str) -> str:
@@ -4,8 +4,14 @@ This module contains all Zendesk API interaction logic used by both
 the CLI and MCP server. All functions are async and return dicts.
 """
 
-import tempfile
+import asyncio
+import os
+import re
+from collections.abc import AsyncIterator, Sequence
+from itertools import islice
 from pathlib import Path
+from typing import Any
+from urllib.parse import unquote_plus
 
 from zendesk_skill.client import (
     CONFIG_PATH,
@@ -16,14 +22,15 @@ from zendesk_skill.client import (
     delete_slack_config,
     get_auth_status,
     get_client,
-    get_slack_config,
+    get_slack_http,
     get_slack_status,
     save_credentials,
     save_slack_config,
 )
 from zendesk_skill.formatting import format_for_zendesk
 from zendesk_skill.queries import get_queries_for_tool
-from zendesk_skill.storage import save_response
+from zendesk_skill.storage import DEFAULT_STORAGE_DIR, save_response
+from zendesk_skill.utils import jsonio
 from zendesk_skill.utils.security import (
     generate_markers,
     is_security_enabled,
@@ -63,6 +70,12 @@ TEXT_EXTENSIONS = {
 
 MAX_SCAN_SIZE = 1_000_000  # 1 MB — files above this get CLI hint instead of inline scan
 
+# "name" query parameter of an attachment content URL
+_NAME_PARAM_RE = re.compile(r"[?&]name=([^&#]+)")
+
+# Attachment directories already created by this process (skips repeat mkdir)
+_attachment_dirs: set[Path] = set()
+
 
 def _attachment_security_hint(path: Path) -> str:
     """Security warning for unscanned attachments."""
@@ -79,6 +92,20 @@ def _get_client() -> ZendeskClient:
     return get_client()
 
 
+async def _save_response_async(
+    tool_name: str,
+    params: dict,
+    data: Any,
+    suggested_queries: Sequence[dict[str, str]] | None = None,
+    output_path: str | None = None,
+    ticket_id: str | None = None,
+) -> tuple[str, dict]:
+    """Run save_response in a worker thread so the file write doesn't block the event loop."""
+    return await asyncio.to_thread(
+        save_response, tool_name, params, data, suggested_queries, output_path, ticket_id=ticket_id,
+    )
+
+
 def _validate_id(value: str, name: str = "ID") -> None:
     """Validate that an ID is a positive integer string."""
     try:
@@ -127,7 +154,7 @@ async def search_tickets(
 
     result = await client.get("search.json", params=params)
     suggested = get_queries_for_tool("search")
-    file_path, stored = save_response(
+    file_path, stored = await _save_response_async(
         "search", {"query": query}, result, suggested, output_path
     )
 
@@ -139,6 +166,55 @@ async def search_tickets(
     }
 
 
+async def iter_search_tickets(
+    query: str,
+    per_page: int = 100,
+    sort_by: str | None = None,
+    sort_order: str = "desc",
+) -> AsyncIterator[dict]:
+    """Iterate over every page of a ticket search.
+
+    The next page is requested while the caller processes the current one,
+    so paging costs roughly one round trip plus per-page processing time.
+
+    Args:
+        query: Search query using Zendesk syntax
+        per_page: Results per page (default: 100, the API maximum)
+        sort_by: Field to sort by
+        sort_order: Sort order (asc/desc)
+
+    Yields:
+        Raw search API response for each page
+    """
+    client = _get_client()
+
+    params = {
+        "query": f"type:ticket {query}",
+        "page": 1,
+        "per_page": min(per_page, 100),
+        "sort_order": sort_order,
+    }
+    if sort_by:
+        params["sort_by"] = sort_by
+
+    result = await client.get("search.json", params=params)
+    next_task: asyncio.Task | None = None
+    try:
+        while True:
+            if result.get("next_page"):
+                params = {**params, "page": params["page"] + 1}
+                next_task = asyncio.create_task(client.get("search.json", params=params))
+            yield result
+            if next_task is None:
+                return
+            result = await next_task
+            next_task = None
+    finally:
+        # Caller stopped early: don't leave the prefetch running
+        if next_task is not None:
+            next_task.cancel()
+
+
 async def get_ticket(
     ticket_id: str,
     output_path: str | None = None,
@@ -157,7 +233,7 @@ async def get_ticket(
 
     result = await client.get(f"tickets/{ticket_id}.json")
     suggested = get_queries_for_tool("ticket")
-    file_path, _ = save_response(
+    file_path, _ = await _save_response_async(
         "ticket", {"ticket_id": ticket_id}, result, suggested, output_path,
         ticket_id=ticket_id,
     )
@@ -189,15 +265,15 @@ async def get_ticket_details(
     _validate_id(ticket_id, "ticket_id")
     client = _get_client()
 
-    # Get ticket with sideloaded data
-    result = await client.get(
-        f"tickets/{ticket_id}.json",
-        params={"include": "comment_count"}
+    # Get ticket with sideloaded data and its comments concurrently
+    result, comments_result = await asyncio.gather(
+        client.get(
+            f"tickets/{ticket_id}.json",
+            params={"include": "comment_count"}
+        ),
+        client.get(f"tickets/{ticket_id}/comments.json"),
     )
 
-    # Get comments
-    comments_result = await client.get(f"tickets/{ticket_id}/comments.json")
-
     # Combine
     combined = {
         "ticket": result.get("ticket", {}),
@@ -205,7 +281,7 @@ async def get_ticket_details(
     }
 
     suggested = get_queries_for_tool("ticket_details")
-    file_path, _ = save_response(
+    file_path, _ = await _save_response_async(
         "ticket_details", {"ticket_id": ticket_id}, combined, suggested, output_path,
         ticket_id=ticket_id,
     )
@@ -222,6 +298,66 @@ async def get_ticket_details(
     }
 
 
+async def get_tickets_bulk(
+    ticket_ids: list[str],
+    concurrency: int = 10,
+    output_path: str | None = None,
+) -> dict:
+    """Get several tickets by ID, fetching them concurrently.
+
+    Args:
+        ticket_ids: The ticket IDs
+        concurrency: Maximum number of requests in flight at once
+        output_path: Custom output file path
+
+    Returns:
+        Dict with ticket summaries, failed IDs, and file_path
+    """
+    for ticket_id in ticket_ids:
+        _validate_id(ticket_id, "ticket_id")
+    client = _get_client()
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch_one(ticket_id: str) -> dict:
+        async with sem:
+            return await client.get(f"tickets/{ticket_id}.json")
+
+    results = await asyncio.gather(
+        *(fetch_one(ticket_id) for ticket_id in ticket_ids), return_exceptions=True
+    )
+
+    tickets: list[dict] = []
+    errors: dict[str, str] = {}
+    for ticket_id, result in zip(ticket_ids, results):
+        if isinstance(result, BaseException):
+            errors[ticket_id] = str(result)
+        else:
+            tickets.append(result.get("ticket", {}))
+
+    # One combined file instead of one per ticket
+    combined = {"tickets": tickets, "errors": errors}
+    suggested = get_queries_for_tool("tickets_bulk")
+    file_path, _ = await _save_response_async(
+        "tickets_bulk", {"ids": ",".join(ticket_ids)}, combined, suggested, output_path
+    )
+
+    markers = get_session_markers()
+    return {
+        "count": len(tickets),
+        "tickets": [
+            {
+                "id": ticket.get("id"),
+                "subject": wrap_field_simple(ticket.get("subject"), "ticket", str(ticket.get("id")), *markers),
+                "status": ticket.get("status"),
+                "priority": ticket.get("priority"),
+            }
+            for ticket in tickets
+        ],
+        "failed": errors,
+        "file_path": str(file_path),
+    }
+
+
 async def get_linked_incidents(
     ticket_id: str,
     output_path: str | None = None,
@@ -239,7 +375,7 @@ async def get_linked_incidents(
 
     result = await client.get(f"tickets/{ticket_id}/incidents.json")
     suggested = get_queries_for_tool("linked_incidents")
-    file_path, _ = save_response(
+    file_path, _ = await _save_response_async(
         "linked_incidents", {"ticket_id": ticket_id}, result, suggested, output_path,
         ticket_id=ticket_id,
     )
@@ -266,8 +402,6 @@ async def download_attachment(
     Returns:
         Dict with downloaded status, file_path, and size_bytes
     """
-    from urllib.parse import urlparse, parse_qs, unquote
-
     client = _get_client()
 
     # Determine output path
@@ -275,34 +409,35 @@ async def download_attachment(
         out_path = Path(output_path)
     else:
         # Extract filename from URL query parameter (?name=filename.txt)
-        parsed = urlparse(content_url)
-        query_params = parse_qs(parsed.query)
-
-        if "name" in query_params:
-            filename = unquote(query_params["name"][0])
+        match = _NAME_PARAM_RE.search(content_url)
+        if match:
+            filename = unquote_plus(match.group(1))
         else:
             # Fallback: try to get from path
-            filename = parsed.path.split("/")[-1]
+            filename = content_url.split("?", 1)[0].split("#", 1)[0].rsplit("/", 1)[-1]
             if not filename:
                 filename = "attachment"
 
         # Determine directory based on ticket_id (cross-platform, per-user)
-        from zendesk_skill.storage import DEFAULT_STORAGE_DIR
-        base_dir = DEFAULT_STORAGE_DIR
         if ticket_id:
-            attachments_dir = base_dir / ticket_id / "attachments"
+            attachments_dir = DEFAULT_STORAGE_DIR / ticket_id / "attachments"
         else:
-            attachments_dir = base_dir / "attachments"
+            attachments_dir = DEFAULT_STORAGE_DIR / "attachments"
 
-        attachments_dir.mkdir(parents=True, exist_ok=True)
+        if attachments_dir not in _attachment_dirs:
+            attachments_dir.mkdir(parents=True, exist_ok=True)
+            _attachment_dirs.add(attachments_dir)
 
         # Handle duplicate filenames by adding suffix
         out_path = attachments_dir / filename
         if out_path.exists():
+            # List the directory once rather than stat-ing each candidate name
+            with os.scandir(attachments_dir) as entries:
+                existing = {entry.name for entry in entries}
             stem = out_path.stem
             suffix = out_path.suffix
             counter = 1
-            while out_path.exists():
+            while out_path.name in existing:
                 out_path = attachments_dir / f"{stem}_{counter}{suffix}"
                 counter += 1
 
@@ -386,20 +521,19 @@ async def update_ticket(
     _validate_id(ticket_id, "ticket_id")
     client = _get_client()
 
-    # Build update payload
-    ticket_data: dict = {}
-    if status:
-        ticket_data["status"] = status
-    if priority:
-        ticket_data["priority"] = priority
-    if assignee_id:
-        ticket_data["assignee_id"] = int(assignee_id)
-    if subject:
-        ticket_data["subject"] = subject
-    if tags is not None:
-        ticket_data["tags"] = tags
-    if ticket_type:
-        ticket_data["type"] = ticket_type
+    # Build update payload (an empty tags list clears the ticket's tags)
+    ticket_data = {
+        key: value
+        for key, value in (
+            ("status", status),
+            ("priority", priority),
+            ("assignee_id", int(assignee_id) if assignee_id else None),
+            ("subject", subject),
+            ("tags", tags),
+            ("type", ticket_type),
+        )
+        if value not in (None, "")
+    }
 
     if not ticket_data:
         raise ValueError("No update fields provided")
@@ -408,7 +542,7 @@ async def update_ticket(
         f"tickets/{ticket_id}.json",
         json_data={"ticket": ticket_data}
     )
-    file_path, _ = save_response(
+    file_path, _ = await _save_response_async(
         "update_ticket", {"ticket_id": ticket_id}, result, [], output_path,
         ticket_id=ticket_id,
     )
@@ -453,19 +587,21 @@ async def create_ticket(
         "subject": subject,
         "comment": format_for_zendesk(description, plain_text=plain_text),
     }
-    if priority:
-        ticket_data["priority"] = priority
-    if status:
-        ticket_data["status"] = status
-    if tags:
-        ticket_data["tags"] = tags
-    if ticket_type:
-        ticket_data["type"] = ticket_type
+    ticket_data.update(
+        (key, value)
+        for key, value in (
+            ("priority", priority),
+            ("status", status),
+            ("tags", tags),
+            ("type", ticket_type),
+        )
+        if value
+    )
 
     result = await client.post("tickets.json", json_data={"ticket": ticket_data})
     ticket = result.get("ticket", {})
     new_ticket_id = str(ticket.get("id")) if ticket.get("id") else None
-    file_path, _ = save_response(
+    file_path, _ = await _save_response_async(
         "create_ticket", {"subject": subject}, result, [], output_path,
         ticket_id=new_ticket_id,
     )
@@ -477,21 +613,28 @@ async def create_ticket(
     }
 
 
-async def _add_ticket_comment(
+def _comment_update(body: str, public: bool, plain_text: bool) -> dict:
+    """Build the ticket update payload that adds a comment."""
+    comment_data = {
+        **format_for_zendesk(body, plain_text=plain_text),
+        "public": public,
+    }
+    return {"ticket": {"comment": comment_data}}
+
+
+async def add_private_note(
     ticket_id: str,
-    body: str,
-    public: bool,
+    note: str,
     output_path: str | None = None,
     plain_text: bool = False,
 ) -> dict:
-    """Add a comment to a ticket (internal helper).
+    """Add a private internal note to a ticket.
 
     Args:
         ticket_id: The ticket ID
-        body: Comment content (Markdown by default)
-        public: Whether the comment is public
+        note: Note content (Markdown by default)
         output_path: Custom output file path
-        plain_text: If True, treat body as plain text instead of Markdown
+        plain_text: If True, treat note as plain text instead of Markdown
 
     Returns:
         Dict with added status, ticket_id, public flag, and file_path
@@ -499,55 +642,23 @@ async def _add_ticket_comment(
     _validate_id(ticket_id, "ticket_id")
     client = _get_client()
 
-    comment_data = {
-        **format_for_zendesk(body, plain_text=plain_text),
-        "public": public,
-    }
-
     result = await client.put(
         f"tickets/{ticket_id}.json",
-        json_data={
-            "ticket": {
-                "comment": comment_data,
-            }
-        }
+        json_data=_comment_update(note, public=False, plain_text=plain_text),
     )
-    tool_name = "add_comment" if public else "add_note"
-    file_path, _ = save_response(
-        tool_name, {"ticket_id": ticket_id}, result, [], output_path,
+    file_path, _ = await _save_response_async(
+        "add_note", {"ticket_id": ticket_id}, result, [], output_path,
         ticket_id=ticket_id,
     )
 
     return {
         "added": True,
         "ticket_id": ticket_id,
-        "public": public,
+        "public": False,
         "file_path": str(file_path),
     }
 
 
-async def add_private_note(
-    ticket_id: str,
-    note: str,
-    output_path: str | None = None,
-    plain_text: bool = False,
-) -> dict:
-    """Add a private internal note to a ticket.
-
-    Args:
-        ticket_id: The ticket ID
-        note: Note content (Markdown by default)
-        output_path: Custom output file path
-        plain_text: If True, treat note as plain text instead of Markdown
-
-    Returns:
-        Dict with added status, ticket_id, public flag, and file_path
-    """
-    return await _add_ticket_comment(
-        ticket_id, note, public=False, output_path=output_path, plain_text=plain_text,
-    )
-
-
 async def add_public_comment(
     ticket_id: str,
     comment: str,
@@ -565,16 +676,42 @@ async def add_public_comment(
     Returns:
         Dict with added status, ticket_id, public flag, and file_path
     """
-    return await _add_ticket_comment(
-        ticket_id, comment, public=True, output_path=output_path, plain_text=plain_text,
+    _validate_id(ticket_id, "ticket_id")
+    client = _get_client()
+
+    result = await client.put(
+        f"tickets/{ticket_id}.json",
+        json_data=_comment_update(comment, public=True, plain_text=plain_text),
+    )
+    file_path, _ = await _save_response_async(
+        "add_comment", {"ticket_id": ticket_id}, result, [], output_path,
+        ticket_id=ticket_id,
     )
 
+    return {
+        "added": True,
+        "ticket_id": ticket_id,
+        "public": True,
+        "file_path": str(file_path),
+    }
+
 
 # =============================================================================
 # Metrics & Analytics
 # =============================================================================
 
 
+# (summary key, Zendesk ticket_metric field) for the time-based metrics
+_METRIC_FIELDS = (
+    ("first_reply_time", "reply_time_in_minutes"),
+    ("first_resolution_time", "first_resolution_time_in_minutes"),
+    ("full_resolution_time", "full_resolution_time_in_minutes"),
+    ("requester_wait_time", "requester_wait_time_in_minutes"),
+    ("agent_wait_time", "agent_wait_time_in_minutes"),
+    ("on_hold_time", "on_hold_time_in_minutes"),
+)
+
+
 async def get_ticket_metrics(
     ticket_id: str,
     output_path: str | None = None,
@@ -593,31 +730,24 @@ async def get_ticket_metrics(
 
     result = await client.get(f"tickets/{ticket_id}/metrics.json")
     suggested = get_queries_for_tool("ticket_metrics")
-    file_path, _ = save_response(
+    file_path, _ = await _save_response_async(
         "ticket_metrics", {"ticket_id": ticket_id}, result, suggested, output_path,
         ticket_id=ticket_id,
     )
 
-    metrics = result.get("ticket_metric", {})
-
-    # Extract time-based metrics (calendar time in minutes)
-    def get_time(field: str) -> int | None:
-        val = metrics.get(field, {})
-        return val.get("calendar") if isinstance(val, dict) else None
+    metrics = result.get("ticket_metric") or {}
 
-    return {
+    summary = {
         "ticket_id": ticket_id,
         "replies": metrics.get("replies"),
         "reopens": metrics.get("reopens"),
-        # Key time metrics (in minutes, calendar time)
-        "first_reply_time": get_time("reply_time_in_minutes"),
-        "first_resolution_time": get_time("first_resolution_time_in_minutes"),
-        "full_resolution_time": get_time("full_resolution_time_in_minutes"),
-        "requester_wait_time": get_time("requester_wait_time_in_minutes"),
-        "agent_wait_time": get_time("agent_wait_time_in_minutes"),
-        "on_hold_time": get_time("on_hold_time_in_minutes"),
-        "file_path": str(file_path),
     }
+    # Key time metrics (in minutes, calendar time). Zendesk returns each as
+    # a {"calendar": ..., "business": ...} object or null.
+    for key, field in _METRIC_FIELDS:
+        summary[key] = (metrics.get(field) or {}).get("calendar")
+    summary["file_path"] = str(file_path)
+    return summary
 
 
 async def list_ticket_metrics(
@@ -642,7 +772,9 @@ async def list_ticket_metrics(
         params={"page": page, "per_page": per_page}
     )
     suggested = get_queries_for_tool("list_metrics")
-    file_path, _ = save_response("list_metrics", {}, result, suggested, output_path)
+    file_path, _ = await _save_response_async(
+        "list_metrics", {}, result, suggested, output_path
+    )
 
     return {
         "count": len(result.get("ticket_metrics", [])),
@@ -674,16 +806,15 @@ async def get_satisfaction_ratings(
     client = _get_client()
 
     params: dict = {"page": page, "per_page": per_page}
-    if score:
-        params["score"] = score
-    if start_time:
-        params["start_time"] = start_time
-    if end_time:
-        params["end_time"] = end_time
+    params.update(
+        (key, value)
+        for key, value in (("score", score), ("start_time", start_time), ("end_time", end_time))
+        if value
+    )
 
     result = await client.get("satisfaction_ratings.json", params=params)
     suggested = get_queries_for_tool("satisfaction_ratings")
-    file_path, _ = save_response(
+    file_path, _ = await _save_response_async(
         "satisfaction_ratings", params, result, suggested, output_path
     )
 
@@ -710,7 +841,7 @@ async def get_satisfaction_rating(
     client = _get_client()
 
     result = await client.get(f"satisfaction_ratings/{rating_id}.json")
-    file_path, _ = save_response(
+    file_path, _ = await _save_response_async(
         "satisfaction_rating", {"rating_id": rating_id}, result, [], output_path
     )
 
@@ -749,7 +880,9 @@ async def list_views(
 
     result = await client.get("views.json", params=params if params else None)
     suggested = get_queries_for_tool("views")
-    file_path, _ = save_response("views", params, result, suggested, output_path)
+    file_path, _ = await _save_response_async(
+        "views", params, result, suggested, output_path
+    )
 
     views = result.get("views", [])
     return {
@@ -759,7 +892,7 @@ async def list_views(
                 "id": v.get("id"),
                 "title": wrap_field_simple(v.get("title"), "view", str(v.get("id", "")), *get_session_markers()),
             }
-            for v in views[:10]
+            for v in islice(views, 10)
         ],
         "file_path": str(file_path),
     }
@@ -781,7 +914,7 @@ async def get_view_count(
     client = _get_client()
 
     result = await client.get(f"views/{view_id}/count.json")
-    file_path, _ = save_response(
+    file_path, _ = await _save_response_async(
         "view_count", {"view_id": view_id}, result, [], output_path
     )
 
@@ -819,7 +952,7 @@ async def get_view_tickets(
         params={"page": page, "per_page": per_page}
     )
     suggested = get_queries_for_tool("view_tickets")
-    file_path, _ = save_response(
+    file_path, _ = await _save_response_async(
         "view_tickets", {"view_id": view_id}, result, suggested, output_path
     )
 
@@ -835,6 +968,36 @@ async def get_view_tickets(
 # =============================================================================
 
 
+def _user_summary(
+    user: dict,
+    fallback_id: str,
+    markers: tuple[str, str],
+    with_role: bool = True,
+) -> dict:
+    """Project a Zendesk user object to the fields tools return.
+
+    Name and email are wrapped as untrusted content; fallback_id labels the
+    wrapped fields when the object has no id.
+    """
+    user_id_str = str(user.get("id", fallback_id))
+    summary = {
+        "id": user.get("id"),
+        "name": wrap_field_simple(user.get("name"), "user", user_id_str, *markers),
+        "email": wrap_field_simple(user.get("email"), "user", user_id_str, *markers),
+    }
+    if with_role:
+        summary["role"] = user.get("role")
+    return summary
+
+
+def _org_summary(org: dict, fallback_id: str, markers: tuple[str, str]) -> dict:
+    """Project a Zendesk organization object to its id and wrapped name."""
+    return {
+        "id": org.get("id"),
+        "name": wrap_field_simple(org.get("name"), "organization", str(org.get("id", fallback_id)), *markers),
+    }
+
+
 async def get_user(
     user_id: str,
     output_path: str | None = None,
@@ -853,19 +1016,13 @@ async def get_user(
 
     result = await client.get(f"users/{user_id}.json")
     suggested = get_queries_for_tool("user")
-    file_path, _ = save_response(
+    file_path, _ = await _save_response_async(
         "user", {"user_id": user_id}, result, suggested, output_path
     )
 
-    user = result.get("user", {})
-    user_id_str = str(user.get("id", user_id))
-    return {
-        "id": user.get("id"),
-        "name": wrap_field_simple(user.get("name"), "user", user_id_str, *get_session_markers()),
-        "email": wrap_field_simple(user.get("email"), "user", user_id_str, *get_session_markers()),
-        "role": user.get("role"),
-        "file_path": str(file_path),
-    }
+    summary = _user_summary(result.get("user", {}), user_id, get_session_markers())
+    summary["file_path"] = str(file_path)
+    return summary
 
 
 async def search_users(
@@ -885,21 +1042,15 @@ async def search_users(
 
     result = await client.get("users/search.json", params={"query": query})
     suggested = get_queries_for_tool("search_users")
-    file_path, _ = save_response(
+    file_path, _ = await _save_response_async(
         "search_users", {"query": query}, result, suggested, output_path
     )
 
     users = result.get("users", [])
+    markers = get_session_markers()
     return {
         "count": len(users),
-        "users": [
-            {
-                "id": u.get("id"),
-                "name": wrap_field_simple(u.get("name"), "user", str(u.get("id", "")), *get_session_markers()),
-                "email": wrap_field_simple(u.get("email"), "user", str(u.get("id", "")), *get_session_markers()),
-            }
-            for u in users[:10]
-        ],
+        "users": [_user_summary(u, "", markers, with_role=False) for u in islice(users, 10)],
         "file_path": str(file_path),
     }
 
@@ -922,18 +1073,15 @@ async def get_organization(
 
     result = await client.get(f"organizations/{org_id}.json")
     suggested = get_queries_for_tool("organization")
-    file_path, _ = save_response(
+    file_path, _ = await _save_response_async(
         "organization", {"org_id": org_id}, result, suggested, output_path
     )
 
     org = result.get("organization", {})
-    org_id_str = str(org.get("id", org_id))
-    return {
-        "id": org.get("id"),
-        "name": wrap_field_simple(org.get("name"), "organization", org_id_str, *get_session_markers()),
-        "domain_names": org.get("domain_names"),
-        "file_path": str(file_path),
-    }
+    summary = _org_summary(org, org_id, get_session_markers())
+    summary["domain_names"] = org.get("domain_names")
+    summary["file_path"] = str(file_path)
+    return summary
 
 
 async def search_organizations(
@@ -953,20 +1101,15 @@ async def search_organizations(
 
     result = await client.get("organizations/search.json", params={"query": query})
     suggested = get_queries_for_tool("search_organizations")
-    file_path, _ = save_response(
+    file_path, _ = await _save_response_async(
         "search_organizations", {"query": query}, result, suggested, output_path
     )
 
     orgs = result.get("organizations", [])
+    markers = get_session_markers()
     return {
         "count": len(orgs),
-        "organizations": [
-            {
-                "id": o.get("id"),
-                "name": wrap_field_simple(o.get("name"), "organization", str(o.get("id", "")), *get_session_markers()),
-            }
-            for o in orgs[:10]
-        ],
+        "organizations": [_org_summary(o, "", markers) for o in islice(orgs, 10)],
         "file_path": str(file_path),
     }
 
@@ -991,7 +1134,9 @@ async def list_groups(
 
     result = await client.get("groups.json")
     suggested = get_queries_for_tool("groups")
-    file_path, _ = save_response("groups", {}, result, suggested, output_path)
+    file_path, _ = await _save_response_async(
+        "groups", {}, result, suggested, output_path
+    )
 
     groups = result.get("groups", [])
     return {
@@ -1016,16 +1161,22 @@ async def list_tags(
 
     result = await client.get("tags.json")
     suggested = get_queries_for_tool("tags")
-    file_path, _ = save_response("tags", {}, result, suggested, output_path)
+    file_path, _ = await _save_response_async(
+        "tags", {}, result, suggested, output_path
+    )
 
     tags = result.get("tags", [])
     return {
         "count": len(tags),
-        "tags": [t.get("name") for t in tags[:20]],
+        "tags": [t.get("name") for t in islice(tags, 20)],
         "file_path": str(file_path),
     }
 
 
+# SLA policy metric holding first reply time targets
+_FRT = "first_reply_time"
+
+
 async def list_sla_policies(
     output_path: str | None = None,
 ) -> dict:
@@ -1041,7 +1192,9 @@ async def list_sla_policies(
 
     result = await client.get("slas/policies.json")
     suggested = get_queries_for_tool("sla_policies")
-    file_path, _ = save_response("sla_policies", {}, result, suggested, output_path)
+    file_path, _ = await _save_response_async(
+        "sla_policies", {}, result, suggested, output_path
+    )
 
     policies = result.get("sla_policies", [])
 
@@ -1049,13 +1202,11 @@ async def list_sla_policies(
     def summarize_policy(p: dict) -> dict:
         summary = {"id": p.get("id"), "title": p.get("title")}
         # Extract first reply time targets per priority
-        metrics = p.get("policy_metrics", [])
-        targets = {}
-        for m in metrics:
-            if m.get("metric") == "first_reply_time":
-                priority = m.get("priority", "unknown")
-                target_mins = m.get("target")
-                targets[priority] = target_mins
+        targets = {
+            m.get("priority", "unknown"): m.get("target")
+            for m in p.get("policy_metrics", ())
+            if m.get("metric") == _FRT
+        }
         if targets:
             summary["first_reply_targets_mins"] = targets
         return summary
@@ -1081,25 +1232,52 @@ async def get_current_user(
     client = _get_client()
 
     result = await client.get("users/me.json")
-    file_path, _ = save_response("me", {}, result, [], output_path)
+    file_path, _ = await _save_response_async(
+        "me", {}, result, [], output_path
+    )
 
-    user = result.get("user", {})
-    user_id_str = str(user.get("id", "me"))
     return {
         "authenticated": True,
-        "id": user.get("id"),
-        "name": wrap_field_simple(user.get("name"), "user", user_id_str, *get_session_markers()),
-        "email": wrap_field_simple(user.get("email"), "user", user_id_str, *get_session_markers()),
-        "role": user.get("role"),
+        **_user_summary(result.get("user", {}), "me", get_session_markers()),
         "file_path": str(file_path),
     }
 
 
+async def bulk_config_snapshot() -> dict:
+    """Fetch groups, tags, SLA policies, and the current user concurrently.
+
+    These endpoints are independent reads, so they are requested together
+    over the shared client's connection pool. A failure in one does not
+    abort the others; it is reported as {"error": ...} in its slot.
+
+    Returns:
+        Dict with groups, tags, sla_policies, and current_user results
+    """
+    keys = ("groups", "tags", "sla_policies", "current_user")
+    results = await asyncio.gather(
+        list_groups(), list_tags(), list_sla_policies(), get_current_user(),
+        return_exceptions=True,
+    )
+    return {
+        key: {"error": str(result)} if isinstance(result, BaseException) else result
+        for key, result in zip(keys, results)
+    }
+
+
 # =============================================================================
 # Authentication Operations
 # =============================================================================
 
 
+_USER_BRIEF_FIELDS = ("id", "name", "email", "role")
+
+
+def _user_brief(me_response: dict) -> dict:
+    """Pick the identifying fields out of a users/me.json response."""
+    user = me_response.get("user", {})
+    return {field: user.get(field) for field in _USER_BRIEF_FIELDS}
+
+
 async def check_auth_status(validate: bool = True) -> dict:
     """Check authentication configuration status.
 
@@ -1139,19 +1317,10 @@ async def check_auth_status(validate: bool = True) -> dict:
         try:
             client = _get_client()
             api_result = await client.get("users/me.json")
-            user = api_result.get("user", {})
-            result["user"] = {
-                "id": user.get("id"),
-                "name": user.get("name"),
-                "email": user.get("email"),
-                "role": user.get("role"),
-            }
-        except ZendeskAuthError as e:
-            result["error"] = str(e)
-        except ZendeskAPIError as e:
-            result["error"] = str(e)
+            result["user"] = _user_brief(api_result)
         except Exception as e:
-            result["error"] = f"Unexpected error: {e}"
+            known = isinstance(e, (ZendeskAuthError, ZendeskAPIError))
+            result["error"] = str(e) if known else f"Unexpected error: {e}"
 
     return result
 
@@ -1172,10 +1341,10 @@ async def auth_login(
         Dict with success status, user info, and config path
     """
     # Validate credentials by creating a client and making an API call
+    client = None
     try:
         client = ZendeskClient(email=email, token=token, subdomain=subdomain)
         result = await client.get("users/me.json")
-        user = result.get("user", {})
     except (ZendeskAuthError, ZendeskAPIError) as e:
         return {
             "success": False,
@@ -1183,6 +1352,10 @@ async def auth_login(
             "user": None,
             "config_path": None,
         }
+    finally:
+        # One-off client; don't leave its connection pool open
+        if client is not None:
+            await client.close()
 
     # Credentials are valid, save them
     config_path = save_credentials(email, token, subdomain)
@@ -1190,12 +1363,7 @@ async def auth_login(
     return {
         "success": True,
         "error": None,
-        "user": {
-            "id": user.get("id"),
-            "name": user.get("name"),
-            "email": user.get("email"),
-            "role": user.get("role"),
-        },
+        "user": _user_brief(result),
         "config_path": str(config_path),
     }
 
@@ -1251,19 +1419,18 @@ async def slack_login(webhook_url: str, channel: str) -> dict:
     }
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                webhook_url,
-                json=test_payload,
-                headers={"Content-Type": "application/json"},
-                timeout=30.0,
-            )
-            if response.text != "ok":
-                return {
-                    "success": False,
-                    "error": f"Slack API error: {response.text}",
-                    "config_path": None,
-                }
+        response = await get_slack_http().post(
+            webhook_url,
+            content=jsonio.dumps(test_payload),
+            headers={"Content-Type": "application/json"},
+            timeout=30.0,
+        )
+        if response.content != b"ok":
+            return {
+                "success": False,
+                "error": f"Slack API error: {response.text}",
+                "config_path": None,
+            }
     except httpx.RequestError as e:
         return {
             "success": False,
@@ -1324,4 +1491,4 @@ def slack_logout() -> dict:
 
 
 # Backward-compatible re-exports from reporting module
-from zendesk_skill.reporting import send_slack_report, generate_markdown_report  # noqa: E402, F401
+from zendesk_skill.reporting import send_slack_report, send_slack_report_multi, generate_markdown_report  # noqa: E402, F401
@@ -3,9 +3,23 @@
 Each tool has predefined useful queries that can be executed via zendesk_query_stored.
 """
 
+import functools
 import json
+import os
 import subprocess
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
+
+from zendesk_skill.utils import jsonio
+
+try:
+    import jq
+except ImportError:  # Optional speedup (pip install zd-cli[fast]); jq CLI otherwise
+    jq = None
 
 # Named queries organized by tool/response type
 QUERIES: dict[str, dict[str, dict[str, str]]] = {
@@ -47,7 +61,7 @@ QUERIES: dict[str, dict[str, dict[str, str]]] = {
         },
         "comment_count": {
             "description": "Count comments by type",
-            "query": "{total: (.data.comments | length), public: ([.data.comments[] | select(.public == true)] | length), private: ([.data.comments[] | select(.public == false)] | length)}",
+            "query": ".data.comments as $c | {total: ($c | length), public: ([$c[] | select(.public == true)] | length), private: ([$c[] | select(.public == false)] | length)}",
         },
         "latest_comment": {
             "description": "Get the most recent comment",
@@ -59,15 +73,15 @@ QUERIES: dict[str, dict[str, dict[str, str]]] = {
         },
         "conversation_stats": {
             "description": "Get conversation statistics",
-            "query": "{total_messages: (.data.comments | length), public_messages: ([.data.comments[] | select(.public == true)] | length), private_notes: ([.data.comments[] | select(.public == false)] | length), unique_authors: ([.data.comments[].author_id] | unique | length), requester_id: .data.ticket.requester_id}",
+            "query": ".data.comments as $c | {total_messages: ($c | length), public_messages: ([$c[] | select(.public == true)] | length), private_notes: ([$c[] | select(.public == false)] | length), unique_authors: ([$c[].author_id] | unique | length), requester_id: .data.ticket.requester_id}",
         },
         "call_mentions": {
             "description": "Find comments mentioning calls/phone",
-            "query": "[.data.comments[] | select((.plain_body // .body | ascii_downcase) | test(\"call|called|phone|spoke|speaking|conversation|rang|ring\")) | {id, author_id, created_at, snippet: (.plain_body // .body | .[0:200]), public}]",
+            "query": ".data.comments | map((.plain_body // .body) as $b | select($b | test(\"call|phone|sp(?:oke|eaking)|conversation|r(?:ang|ing)\"; \"i\")) | {id, author_id, created_at, snippet: $b[0:200], public})",
         },
         "channel_analysis": {
             "description": "Analyze communication channels from comment metadata",
-            "query": "[.data.comments[] | {channel: .via.channel, source: .via.source.from}] | group_by(.channel) | map({channel: .[0].channel, count: length})",
+            "query": ".data.comments | group_by(.via.channel) | map({channel: .[0].via.channel, count: length})",
         },
     },
     "search": {
@@ -97,11 +111,11 @@ QUERIES: dict[str, dict[str, dict[str, str]]] = {
         },
         "top_requesters": {
             "description": "Top 10 requesters by ticket count",
-            "query": ".data.results | group_by(.requester_id) | map({requester_id: .[0].requester_id, ticket_count: length}) | sort_by(.ticket_count) | reverse | .[0:10]",
+            "query": ".data.results | group_by(.requester_id) | map({requester_id: .[0].requester_id, ticket_count: length}) | sort_by(.ticket_count) | .[-10:] | reverse",
         },
         "top_organizations": {
             "description": "Top 10 organizations by ticket count",
-            "query": ".data.results | group_by(.organization_id) | map({organization_id: .[0].organization_id, ticket_count: length}) | sort_by(.ticket_count) | reverse | .[0:10]",
+            "query": ".data.results | group_by(.organization_id) | map({organization_id: .[0].organization_id, ticket_count: length}) | sort_by(.ticket_count) | .[-10:] | reverse",
         },
         "pagination": {
             "description": "Get pagination info",
@@ -257,61 +271,79 @@ QUERIES: dict[str, dict[str, dict[str, str]]] = {
 }
 
 
-def get_queries_for_tool(tool_name: str) -> list[dict[str, str]]:
-    """Get the list of predefined queries for a tool.
+# Map tool names to query categories (supports both MCP and CLI naming)
+_TOOL_ALIASES: dict[str, str] = {
+    # MCP-style names
+    "zendesk_get_ticket": "ticket",
+    "zendesk_get_ticket_details": "ticket_details",
+    "zendesk_search": "search",
+    "zendesk_get_linked_incidents": "linked_incidents",
+    "zendesk_get_user": "user",
+    "zendesk_search_users": "users_search",
+    "zendesk_get_organization": "organization",
+    "zendesk_search_organizations": "organizations_search",
+    "zendesk_list_views": "views",
+    "zendesk_get_view_tickets": "view_tickets",
+    "zendesk_get_ticket_metrics": "ticket_metrics",
+    "zendesk_list_ticket_metrics": "ticket_metrics",
+    "zendesk_get_satisfaction_ratings": "satisfaction_ratings",
+    "zendesk_list_groups": "groups",
+    "zendesk_list_tags": "tags",
+    # CLI-style names (short names from filenames)
+    "ticket": "ticket",
+    "ticket_details": "ticket_details",
+    "search": "search",
+    "linked_incidents": "linked_incidents",
+    "user": "user",
+    "search_users": "users_search",
+    "organization": "organization",
+    "search_organizations": "organizations_search",
+    "views": "views",
+    "view_tickets": "view_tickets",
+    "tickets_bulk": "view_tickets",
+    "ticket_metrics": "ticket_metrics",
+    "list_metrics": "list_metrics",
+    "sla_policies": "sla_policies",
+    "satisfaction_ratings": "satisfaction_ratings",
+    "satisfaction_rating": "satisfaction_ratings",
+    "groups": "groups",
+    "tags": "tags",
+}
+
+# Built once at import: a (category, name) index and per-category query lists.
+# Query strings are interned so the queries repeated across categories (e.g.
+# ids_only) are one object, and lookups in the _compile cache match by identity.
+_QUERY_INDEX: dict[tuple[str, str], str] = {
+    (category, name): sys.intern(q["query"])
+    for category, queries in QUERIES.items()
+    for name, q in queries.items()
+}
+_BY_TOOL: dict[str, tuple[dict[str, str], ...]] = {
+    category: tuple(
+        {"name": name, "description": q["description"], "query": _QUERY_INDEX[category, name]}
+        for name, q in queries.items()
+    )
+    for category, queries in QUERIES.items()
+}
+
+# Only these run in-process. libjq holds the GIL and can't be interrupted, so a
+# runaway custom query (repeat(.), deep recurse) would have no enforceable
+# deadline; custom queries go to the jq CLI, which is killed on timeout.
+_STORED_QUERIES = frozenset(_QUERY_INDEX.values())
+
+
+def get_queries_for_tool(tool_name: str) -> tuple[dict[str, str], ...]:
+    """Get the predefined queries for a tool.
+
+    The tuples are built once at import and shared; callers must not modify the entries.
 
     Args:
         tool_name: Tool name (e.g., 'zendesk_get_ticket_details')
 
     Returns:
-        List of query definitions with name, description, query
+        Tuple of query definitions with name, description, query
     """
-    # Map tool names to query categories (supports both MCP and CLI naming)
-    tool_to_category = {
-        # MCP-style names
-        "zendesk_get_ticket": "ticket",
-        "zendesk_get_ticket_details": "ticket_details",
-        "zendesk_search": "search",
-        "zendesk_get_linked_incidents": "linked_incidents",
-        "zendesk_get_user": "user",
-        "zendesk_search_users": "users_search",
-        "zendesk_get_organization": "organization",
-        "zendesk_search_organizations": "organizations_search",
-        "zendesk_list_views": "views",
-        "zendesk_get_view_tickets": "view_tickets",
-        "zendesk_get_ticket_metrics": "ticket_metrics",
-        "zendesk_list_ticket_metrics": "ticket_metrics",
-        "zendesk_get_satisfaction_ratings": "satisfaction_ratings",
-        "zendesk_list_groups": "groups",
-        "zendesk_list_tags": "tags",
-        # CLI-style names (short names from filenames)
-        "ticket": "ticket",
-        "ticket_details": "ticket_details",
-        "search": "search",
-        "linked_incidents": "linked_incidents",
-        "user": "user",
-        "search_users": "users_search",
-        "organization": "organization",
-        "search_organizations": "organizations_search",
-        "views": "views",
-        "view_tickets": "view_tickets",
-        "ticket_metrics": "ticket_metrics",
-        "list_metrics": "list_metrics",
-        "sla_policies": "sla_policies",
-        "satisfaction_ratings": "satisfaction_ratings",
-        "satisfaction_rating": "satisfaction_ratings",
-        "groups": "groups",
-        "tags": "tags",
-    }
-
-    category = tool_to_category.get(tool_name)
-    if not category or category not in QUERIES:
-        return []
-
-    return [
-        {"name": name, "description": q["description"], "query": q["query"]}
-        for name, q in QUERIES[category].items()
-    ]
+    return _BY_TOOL.get(_TOOL_ALIASES.get(tool_name, ""), ())
 
 
 def get_query(tool_name: str, query_name: str) -> str | None:
@@ -324,32 +356,134 @@ def get_query(tool_name: str, query_name: str) -> str | None:
     Returns:
         jq query string or None if not found
     """
-    queries = get_queries_for_tool(tool_name)
-    for q in queries:
-        if q["name"] == query_name:
-            return q["query"]
-    return None
+    return _QUERY_INDEX.get((_TOOL_ALIASES.get(tool_name, ""), query_name))
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(jq_query: str, args_json: str | None = None) -> Any:
+    """Compile a jq program with the in-process libjq binding (cached per query).
+
+    libjq binds $variables at compile time, so they are part of the cache key,
+    passed as a JSON object string to keep the key hashable.
+    """
+    return jq.compile(jq_query, args=jsonio.loads(args_json) if args_json else None)
+
+
+def precompile_all() -> None:
+    """Compile every predefined query ahead of time.
+
+    No-op when the jq Python binding is not installed.
+    """
+    if jq is None:
+        return
+    for query in _STORED_QUERIES:
+        _compile(query)
+
+
+# Response files keyed by (path, mtime_ns, size), so a rewritten file is a cache miss.
+# Bounded by entry count and by total file size, since the MCP server never clears it.
+_DOC_CACHE: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+_DOC_CACHE_SIZE = 32
+_DOC_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_doc_cache_bytes = 0
+_doc_cache_lock = threading.Lock()
+
+
+def _load(file_path: str) -> str:
+    """Read a response file, reusing the cached text while the file is unchanged.
+
+    The text is kept rather than a parsed dict because the jq binding
+    re-serializes Python values before handing them to libjq. Files larger
+    than _DOC_CACHE_MAX_BYTES are read each time rather than cached.
+    """
+    global _doc_cache_bytes
+
+    st = os.stat(file_path)
+    key = (file_path, st.st_mtime_ns, st.st_size)
+    with _doc_cache_lock:
+        text = _DOC_CACHE.get(key)
+        if text is not None:
+            _DOC_CACHE.move_to_end(key)
+            return text
+    text = Path(file_path).read_text(encoding="utf-8")
+    if st.st_size > _DOC_CACHE_MAX_BYTES:
+        return text
+    with _doc_cache_lock:
+        if key not in _DOC_CACHE:
+            _DOC_CACHE[key] = text
+            _doc_cache_bytes += st.st_size
+        # Evict least recently used entries until both limits hold
+        while len(_DOC_CACHE) > _DOC_CACHE_SIZE or _doc_cache_bytes > _DOC_CACHE_MAX_BYTES:
+            (_, _, size), _ = _DOC_CACHE.popitem(last=False)
+            _doc_cache_bytes -= size
+    return text
+
+
+def _format_outputs(outputs: list[Any]) -> str:
+    """Render jq outputs like the jq CLI: one pretty-printed value per line."""
+    return "\n".join(jsonio.dumps(out, indent=True).decode() for out in outputs)
+
+
+# Subprocess timeout scales with file size: a floor plus allowance per MB
+JQ_MIN_TIMEOUT = 5.0
+JQ_TIMEOUT_PER_MB = 0.5
 
 
-def execute_jq(file_path: str, jq_query: str) -> tuple[bool, str]:
+def execute_jq(
+    file_path: str,
+    jq_query: str,
+    *,
+    variables: dict[str, Any] | None = None,
+    timeout: float | None = None,
+) -> tuple[bool, str]:
     """Execute a jq query on a file.
 
+    Stored queries run in-process through the jq Python binding when it is
+    installed. Custom queries, and everything when the binding is missing,
+    go through the jq CLI so the timeout can be enforced.
+
     Args:
         file_path: Path to the JSON file
         jq_query: jq query to execute
+        variables: Values bound as $name in the query (like jq --argjson)
+        timeout: jq CLI timeout in seconds (default scales with file size);
+            stored queries run in-process are not subject to it
 
     Returns:
         Tuple of (success, result_or_error)
     """
-    if not Path(file_path).exists():
+    args_json = jsonio.dumps(variables).decode() if variables else None
+
+    if jq is not None and jq_query in _STORED_QUERIES:
+        try:
+            outputs = _compile(jq_query, args_json).input_text(_load(file_path)).all()
+        except FileNotFoundError:
+            return False, f"File not found: {file_path}"
+        except ValueError as e:
+            return False, f"jq error: {e}"
+        except Exception as e:
+            return False, f"Query execution failed: {e}"
+        return True, _format_outputs(outputs)
+
+    # jq's own missing-file error is less clear; the stat is noise next to the fork
+    try:
+        size = os.stat(file_path).st_size
+    except FileNotFoundError:
         return False, f"File not found: {file_path}"
+    if timeout is None:
+        timeout = _cli_timeout(size)
+
+    cmd = ["jq"]
+    for name, value in (variables or {}).items():
+        cmd += ["--argjson", name, jsonio.dumps(value).decode()]
+    cmd += [jq_query, file_path]
 
     try:
         result = subprocess.run(
-            ["jq", jq_query, file_path],
+            cmd,
             capture_output=True,
             text=True,
-            timeout=30,
+            timeout=timeout,
         )
         if result.returncode == 0:
             return True, result.stdout.strip()
@@ -357,11 +491,135 @@ def execute_jq(file_path: str, jq_query: str) -> tuple[bool, str]:
     except FileNotFoundError:
         return False, "jq is not installed. Please install jq to use query functionality."
     except subprocess.TimeoutExpired:
-        return False, "jq query timed out after 30 seconds."
+        return False, f"jq query timed out after {timeout:g} seconds."
     except Exception as e:
         return False, f"Query execution failed: {e}"
 
 
+def _cli_timeout(size: int) -> float:
+    """Default jq CLI timeout for a file of the given size in bytes."""
+    return max(JQ_MIN_TIMEOUT, size / (1024 * 1024) * JQ_TIMEOUT_PER_MB)
+
+
+def _run_combined(file_path: str, program: str) -> Any | None:
+    """Run a combined batch program once; None if it fails for any reason.
+
+    Raises subprocess.TimeoutExpired if the jq CLI runs out of time, so the
+    caller can report it rather than rerunning every query.
+    """
+    try:
+        if jq is not None:
+            return _compile(program).input_text(_load(file_path)).first()
+        # Feed the cached text on stdin rather than having jq reopen the file
+        result = subprocess.run(
+            ["jq", "-c", program],
+            input=_load(file_path),
+            capture_output=True,
+            text=True,
+            timeout=_cli_timeout(os.stat(file_path).st_size),
+        )
+        if result.returncode != 0:
+            return None
+        return jsonio.loads(result.stdout)
+    except subprocess.TimeoutExpired:
+        raise
+    except Exception:
+        return None
+
+
+def execute_jq_batch(
+    file_path: str, tool_name: str, query_names: list[str] | None = None
+) -> dict[str, tuple[bool, str]]:
+    """Execute several stored queries for a tool against one file.
+
+    The queries are combined into a single program so the file is parsed
+    once (in-process, or by one jq subprocess when the binding isn't
+    installed). If the combined run fails, each query is retried on its
+    own so one bad query doesn't hide the rest; a timeout is reported for
+    every query instead, since the retries would only time out again.
+
+    Args:
+        file_path: Path to the JSON file
+        tool_name: Tool name used to look up the stored queries
+        query_names: Queries to run (defaults to all queries for the tool)
+
+    Returns:
+        Dict of query name to (success, result_or_error), as from execute_jq
+    """
+    if query_names is None:
+        query_names = [q["name"] for q in get_queries_for_tool(tool_name)]
+
+    results: dict[str, tuple[bool, str]] = {}
+    programs: dict[str, str] = {}
+    for name in query_names:
+        query = get_query(tool_name, name)
+        if query is None:
+            results[name] = (False, f"Unknown query '{name}' for {tool_name}")
+        else:
+            programs[name] = query
+
+    if programs:
+        combined = "{" + ", ".join(
+            f"{jsonio.dumps(name).decode()}: [{query}]" for name, query in programs.items()
+        ) + "}"
+        try:
+            batch = _run_combined(file_path, combined)
+        except subprocess.TimeoutExpired as e:
+            for name in programs:
+                results[name] = (False, f"jq query timed out after {e.timeout:g} seconds.")
+            return {name: results[name] for name in query_names}
+        if batch is not None:
+            for name in programs:
+                results[name] = (True, _format_outputs(batch[name]))
+            return {name: results[name] for name in query_names}
+
+    for name, query in programs.items():
+        results[name] = execute_jq(file_path, query)
+    return {name: results[name] for name in query_names}
+
+
+_jq_executor: ThreadPoolExecutor | None = None
+
+
+def execute_jq_many(items: list[tuple[str, str]]) -> list[tuple[bool, str]]:
+    """Execute independent jq queries, possibly against different files.
+
+    Stored queries with the jq binding run in turn: the binding holds the
+    GIL while libjq evaluates, and each file is loaded once through the
+    document cache. Otherwise the jq subprocesses run in parallel on a
+    shared thread pool.
+
+    Args:
+        items: (file_path, jq_query) pairs
+
+    Returns:
+        (success, result_or_error) per item, in input order
+    """
+    global _jq_executor
+
+    if len(items) < 2 or (jq is not None and all(query in _STORED_QUERIES for _, query in items)):
+        return [execute_jq(path, query) for path, query in items]
+
+    if _jq_executor is None:
+        _jq_executor = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="jq")
+    return list(_jq_executor.map(lambda item: execute_jq(*item), items))
+
+
+_PRETTY_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False, default=str)
+
+
+def _encode_prefix(data: Any, limit: int) -> str:
+    """Pretty-print data, stopping once at least limit characters are produced."""
+    parts: list[str] = []
+    size = 0
+    for chunk in _PRETTY_ENCODER.iterencode(data):
+        parts.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    return "".join(parts)
+
+
 def format_query_result(success: bool, result: str, max_length: int = 50000) -> str:
     """Format a query result for display.
 
@@ -378,12 +636,17 @@ def format_query_result(success: bool, result: str, max_length: int = 50000) ->
 
     # Try to pretty-print if it's JSON
     try:
-        data = json.loads(result)
-        formatted = json.dumps(data, indent=2)
-    except json.JSONDecodeError:
+        data = jsonio.loads(result)
+    except ValueError:
         formatted = result
+    else:
+        if len(result) <= max_length:
+            formatted = jsonio.dumps(data, indent=True).decode()
+        else:
+            # Likely to be cut: stop encoding just past the limit
+            formatted = _encode_prefix(data, max_length + 1)
 
     if len(formatted) > max_length:
-        formatted = formatted[:max_length] + f"\n\n... (truncated, {len(result) - max_length} more characters)"
+        formatted = formatted[:max_length] + f"\n\n... (truncated at {max_length} characters)"
 
     return f"```json\n{formatted}\n```"
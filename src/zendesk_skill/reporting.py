@@ -4,19 +4,242 @@ Generates Slack reports and Markdown reports from analyzed ticket data.
 Extracted from operations.py for maintainability.
 """
 
-from datetime import datetime
+import asyncio
+import functools
+import heapq
+from dataclasses import dataclass
+from datetime import date
+from operator import itemgetter
+from typing import Any
 
 import httpx
 
-from zendesk_skill.client import get_slack_config
+from zendesk_skill.client import get_slack_config, get_slack_http
+from zendesk_skill.utils import jsonio
 from zendesk_skill.utils.time import mins_to_human
 
 
+def _pct(n: int, d: int) -> int:
+    """Integer percentage of n over d, 0 when d is 0."""
+    return (100 * n // d) if d else 0
+
+
+_PRIORITY_ORDER = {"urgent": 0, "high": 1, "normal": 2, "low": 3}
+
+
+def _priority_key(item: tuple[str, int]) -> int:
+    """Sort key placing (priority, count) pairs in urgent → low order."""
+    return _PRIORITY_ORDER.get(item[0], 99)
+
+
+# Slack status/priority markers (unknown values get ⚪)
+_STATUS_ICONS = {"pending": "🟡", "open": "🔴", "closed": "⚫", "solved": "🟢", "hold": "🟠"}
+_PRIORITY_ICONS = {"urgent": "🔴", "high": "🟠", "normal": "🟡", "low": "🟢"}
+
+
+def _s(n: int) -> str:
+    """Plural suffix for a count."""
+    return "" if n == 1 else "s"
+
+
+_CUST_TPL = "*{customer}*\n{tickets} ticket{tickets_s} · {messages} msgs{call_str}".format
+
+
+def _fmt_customer(customer: str, stats: dict[str, Any]) -> str:
+    """Format one Slack customer field: tickets, messages, and calls if any."""
+    tickets = stats.get("tickets", 0)
+    calls = stats.get("calls", 0)
+    return _CUST_TPL(
+        customer=customer,
+        tickets=tickets,
+        tickets_s=_s(tickets),
+        messages=stats.get("messages", 0),
+        call_str=f" · {calls} call{_s(calls)}" if calls else "",
+    )
+
+
+def _fmt_ticket(ticket: dict[str, Any], subject_len: int = 35) -> str:
+    """Format one Slack top-tickets line (📞 marks tickets with detected calls)."""
+    get = ticket.get
+    call_emoji = " 📞" if get("call_info", {}).get("total_estimated", 0) > 0 else ""
+    subject = (get("subject") or "")[:subject_len]
+    return f"• *#{get('ticket_id')}* – {get('messages', 0)} msgs{call_emoji} – {get('customer', '')} – _{subject}_"
+
+
+# FRT categories in display order, with the report keys each may appear under
+# (analyze_support_metrics.py output and alternative names).
+_FRT_CATEGORIES = (
+    ("oncall", ("oncall", "oncall_urgent")),
+    ("urgent", ("urgent", "other_urgent")),
+    ("high", ("high",)),
+    ("normal", ("normal",)),
+    ("low", ("low",)),
+)
+
+
+# Slack blocks with no per-report content. They are only ever serialized,
+# never mutated, so every report shares the same objects.
+_HEADER_BLOCK = {
+    "type": "header",
+    "text": {
+        "type": "plain_text",
+        "text": "📊 Support Metrics Report",
+        "emoji": True,
+    },
+}
+_DIVIDER = {"type": "divider"}
+_FOOTER_CONTEXT = {
+    "type": "context",
+    "elements": [
+        {
+            "type": "mrkdwn",
+            "text": "📞 = Call detected (best-effort from keywords) | Generated by Zendesk CLI Skill",
+        },
+    ],
+}
+_OVERVIEW_TITLE = {"type": "section", "text": {"type": "mrkdwn", "text": "*📈 Overview*"}}
+_FRT_PRIORITY_TITLE = {"type": "section", "text": {"type": "mrkdwn", "text": "*⏱️ First Response Time by Priority*"}}
+_METRICS_TITLE = {"type": "section", "text": {"type": "mrkdwn", "text": "*⏱️ Response & Resolution Metrics*"}}
+_STATUS_TITLE = {"type": "section", "text": {"type": "mrkdwn", "text": "*📋 Status Breakdown*"}}
+_PRIORITY_TITLE = {"type": "section", "text": {"type": "mrkdwn", "text": "*🚨 Priority Breakdown*"}}
+_CUSTOMERS_TITLE = {"type": "section", "text": {"type": "mrkdwn", "text": "*🏢 Tickets & Messages per Customer*"}}
+_TOP_TICKETS_TITLE = {"type": "section", "text": {"type": "mrkdwn", "text": "*🎫 Top Tickets by Activity*"}}
+
+
+@functools.lru_cache(maxsize=1)
+def _date_label(day: date) -> str:
+    """Format a report date; strftime only runs again once the day changes."""
+    return day.strftime("%B %d, %Y")
+
+
+# Markdown footer lines following the "Report generated" date
+_FOOTER_STATIC = (
+    "*Data source: Zendesk API via zendesk-skill*",
+    "*Methodology:*",
+    "- *Tickets with ≥1 agent reply*",
+    "- *FRT from Zendesk Ticket Metrics API: calendar time for on-call urgent (24/7 coverage), business hours for all others*",
+    "- *Call detection: Searches comments for meeting links (Zoom, Teams, Meet) and call-related patterns. \"Confirmed\" calls have evidence (e.g., \"following our call\", \"meeting notes\"). \"Likely\" calls have meeting links + setup discussion.*",
+    "",
+)
+
+
+@dataclass
+class PreparedReport:
+    """Values derived from report_data that both renderers need.
+
+    Attributes:
+        source: The report_data dict this view was built from
+        top_tickets: Top 10 tickets by message count
+        confirmed_calls: Confirmed call count
+        likely_calls: Likely call count
+        total_calls: confirmed_calls + likely_calls
+        reopen_pct: Reopened tickets as integer percentage of total tickets
+        res_pct: Resolved tickets as integer percentage of total tickets
+        frt_lines_data: (category, count, median_str, stats) for each FRT
+                        category with at least one ticket, in display order
+    """
+
+    source: dict[str, Any]
+    top_tickets: list[dict[str, Any]]
+    confirmed_calls: int
+    likely_calls: int
+    total_calls: int
+    reopen_pct: int
+    res_pct: int
+    frt_lines_data: list[tuple[str, int, str, dict[str, Any]]]
+
+    @functools.cached_property
+    def top_customers(self) -> list[tuple[str, dict[str, Any]]]:
+        """(customer, stats) pairs sorted by ticket count, descending.
+
+        Only the Markdown report needs the full ranking, so it is sorted on first use.
+        """
+        # Extract sort keys once so comparisons don't go through dict.get()
+        customers = [
+            (name, stats, stats.get("tickets", 0))
+            for name, stats in self.source.get("customer_stats", {}).items()
+        ]
+        customers.sort(key=itemgetter(2), reverse=True)
+        return [(name, stats) for name, stats, _ in customers]
+
+    def leading_customers(self, n: int) -> list[tuple[str, dict[str, Any]]]:
+        """Return the n customers with the most tickets, without a full sort."""
+        if "top_customers" in self.__dict__:
+            return self.top_customers[:n]
+        return [
+            (name, stats) for name, stats, _ in heapq.nlargest(
+                n,
+                ((name, stats, stats.get("tickets", 0))
+                 for name, stats in self.source.get("customer_stats", {}).items()),
+                key=itemgetter(2),
+            )
+        ]
+
+
+def prepare_report_view(report_data: dict[str, Any]) -> PreparedReport:
+    """Derive the sorted/aggregated values shared by the Slack and Markdown reports.
+
+    A caller rendering both reports can build the view once and pass it to
+    send_slack_report and generate_markdown_report.
+
+    Args:
+        report_data: Dict as produced by analyze_support_metrics.py
+
+    Returns:
+        PreparedReport for report_data
+    """
+    summary = report_data.get("summary", {})
+    call_analysis = report_data.get("call_analysis", {})
+    resolution_stats = report_data.get("resolution_stats", {})
+    frt_by_priority = report_data.get("frt_by_priority", {})
+    total_tickets = summary.get("total_tickets", 0)
+
+    top_tickets = [
+        t for t, _ in heapq.nlargest(
+            10,
+            ((t, t.get("messages", 0)) for t in report_data.get("ticket_analysis", [])),
+            key=itemgetter(1),
+        )
+    ]
+
+    # Get call counts from call_analysis if available, otherwise from summary
+    if call_analysis:
+        confirmed_calls = call_analysis.get("confirmed_calls", 0)
+        likely_calls = call_analysis.get("likely_calls", 0)
+    else:
+        confirmed_calls = summary.get("total_calls_confirmed", 0)
+        likely_calls = summary.get("total_calls_likely", 0)
+
+    resolved = resolution_stats.get("count", 0) if resolution_stats else 0
+    reopen_count = report_data.get("reopen_count", 0)
+
+    frt_lines_data: list[tuple[str, int, str, dict[str, Any]]] = []
+    if frt_by_priority:
+        for category, keys in _FRT_CATEGORIES:
+            stats = next((frt_by_priority[k] for k in keys if k in frt_by_priority), None)
+            if stats and stats.get("count", 0) > 0:
+                frt_lines_data.append(
+                    (category, stats["count"], mins_to_human(stats.get("median_mins")), stats)
+                )
+
+    return PreparedReport(
+        source=report_data,
+        top_tickets=top_tickets,
+        confirmed_calls=confirmed_calls,
+        likely_calls=likely_calls,
+        total_calls=confirmed_calls + likely_calls,
+        reopen_pct=_pct(reopen_count, total_tickets),
+        res_pct=_pct(resolved, total_tickets),
+        frt_lines_data=frt_lines_data,
+    )
+
+
 async def send_slack_report(
-    report_data: dict,
+    report_data: dict[str, Any],
     channel: str | None = None,
     webhook_url: str | None = None,
-) -> dict:
+    prepared: PreparedReport | None = None,
+) -> dict[str, Any]:
     """Send a support metrics report to Slack.
 
     Args:
@@ -24,6 +247,7 @@ async def send_slack_report(
                      status_breakdown, priority_breakdown, frt_stats, resolution_stats
         channel: Override channel (uses config if not provided)
         webhook_url: Override webhook URL (uses config if not provided)
+        prepared: prepare_report_view(report_data), if already built
 
     Returns:
         Dict with success status
@@ -39,13 +263,41 @@ async def send_slack_report(
         webhook_url = webhook_url or config[0]
         channel = channel or config[1]
 
-    if not channel.startswith("#"):
-        channel = f"#{channel}"
+    blocks = _build_report_blocks(report_data, prepared or prepare_report_view(report_data))
+    return await _post_blocks(webhook_url, channel, jsonio.dumps(blocks))
+
+
+async def send_slack_report_multi(
+    report_data: dict[str, Any],
+    targets: list[tuple[str, str]],
+) -> list[dict[str, Any]]:
+    """Send one support metrics report to several Slack webhooks/channels.
 
+    The blocks are built and serialized once, and the posts are sent concurrently.
+
+    Args:
+        report_data: Same as for send_slack_report
+        targets: (webhook_url, channel) pairs
+
+    Returns:
+        One result dict per target, in the same order
+    """
+    blocks_json = jsonio.dumps(_build_report_blocks(report_data, prepare_report_view(report_data)))
+    results = await asyncio.gather(
+        *(_post_blocks(url, channel, blocks_json) for url, channel in targets),
+        return_exceptions=True,
+    )
+    return [
+        {"success": False, "error": f"Failed to send to Slack: {result}"}
+        if isinstance(result, BaseException) else result
+        for result in results
+    ]
+
+
+def _build_report_blocks(report_data: dict[str, Any], prepared: PreparedReport) -> list[dict[str, Any]]:
+    """Build the Slack Block Kit blocks for a support metrics report."""
     # Extract report data
     summary = report_data.get("summary", {})
-    customer_stats = report_data.get("customer_stats", {})
-    ticket_analysis = report_data.get("ticket_analysis", [])
     status_breakdown = report_data.get("status_breakdown", {})
     priority_breakdown = report_data.get("priority_breakdown", {})
     frt_stats = report_data.get("frt_stats", {})
@@ -62,38 +314,13 @@ async def send_slack_report(
     total_tickets = summary.get("total_tickets", 0)
 
     # Build customer fields (max 10 per section)
-    customer_fields = []
-    sorted_customers = sorted(
-        customer_stats.items(),
-        key=lambda x: x[1].get("tickets", 0),
-        reverse=True,
-    )[:6]  # Top 6 customers
-
-    for customer, stats in sorted_customers:
-        tickets = stats.get("tickets", 0)
-        messages = stats.get("messages", 0)
-        calls = stats.get("calls", 0)
-        call_str = f" · {calls} call{'s' if calls != 1 else ''}" if calls else ""
-        customer_fields.append({
-            "type": "mrkdwn",
-            "text": f"*{customer}*\n{tickets} ticket{'s' if tickets != 1 else ''} · {messages} msgs{call_str}",
-        })
-
-    # Build top tickets list
-    sorted_tickets = sorted(
-        ticket_analysis,
-        key=lambda x: x.get("messages", 0),
-        reverse=True,
-    )[:10]  # Top 10
-
-    ticket_lines = []
-    for t in sorted_tickets:
-        call_emoji = " 📞" if t.get("call_info", {}).get("total_estimated", 0) > 0 else ""
-        subject = (t.get("subject") or "")[:35]
-        customer = t.get("customer", "")
-        ticket_lines.append(
-            f"• *#{t.get('ticket_id')}* – {t.get('messages', 0)} msgs{call_emoji} – {customer} – _{subject}_"
-        )
+    customer_fields = [
+        {"type": "mrkdwn", "text": _fmt_customer(customer, stats)}
+        for customer, stats in prepared.leading_customers(6)
+    ]
+
+    # Build top tickets list straight from the ranked tickets
+    ticket_lines = [_fmt_ticket(t) for t in prepared.top_tickets]
 
     # Build period string
     period_text = ""
@@ -104,30 +331,14 @@ async def send_slack_report(
         if start and end:
             period_text = f"📅 Period: {start} – {end} ({days} days)"
 
-    # Build blocks
-    blocks = [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "📊 Support Metrics Report",
-                "emoji": True,
-            },
-        },
-    ]
-
-    # Add period subtitle if available
-    if period_text:
-        blocks.append({
-            "type": "context",
-            "elements": [{"type": "mrkdwn", "text": period_text}],
-        })
+    # Period subtitle if available
+    period_blocks: list[dict[str, Any]] = [
+        {"type": "context", "elements": [{"type": "mrkdwn", "text": period_text}]},
+    ] if period_text else []
 
     # Get call counts from call_analysis if available, otherwise from summary
     tickets_with_calls = call_analysis.get("tickets_with_calls", 0) if call_analysis else summary.get("tickets_with_calls", 0)
-    confirmed_calls = call_analysis.get("confirmed_calls", 0) if call_analysis else summary.get("total_calls_confirmed", 0)
-    likely_calls = call_analysis.get("likely_calls", 0) if call_analysis else summary.get("total_calls_likely", 0)
-    total_calls = confirmed_calls + likely_calls
+    total_calls = prepared.total_calls
 
     # Use total_replies if available, otherwise total_messages
     total_replies = summary.get("total_replies", 0) or summary.get("total_messages", 0)
@@ -138,11 +349,8 @@ async def send_slack_report(
     else:
         calls_text = str(tickets_with_calls)
 
-    blocks.extend([
-        {
-            "type": "section",
-            "text": {"type": "mrkdwn", "text": "*📈 Overview*"},
-        },
+    overview_blocks: list[dict[str, Any]] = [
+        _OVERVIEW_TITLE,
         {
             "type": "section",
             "fields": [
@@ -153,72 +361,46 @@ async def send_slack_report(
                 {"type": "mrkdwn", "text": f"*Unique Customers:*\n{summary.get('unique_customers', 0)}"},
             ],
         },
-        {"type": "divider"},
-    ])
+        _DIVIDER,
+    ]
 
-    # Add FRT by Priority if available (prefer this over generic frt_stats)
+    metrics_blocks: list[dict[str, Any]] = []
     if frt_by_priority:
-        blocks.append({
-            "type": "section",
-            "text": {"type": "mrkdwn", "text": "*⏱️ First Response Time by Priority*"},
-        })
-
-        frt_lines = []
-        # On-call urgent (24/7)
-        oncall_stats = frt_by_priority.get("oncall") or frt_by_priority.get("oncall_urgent")
-        if oncall_stats and oncall_stats.get("count", 0) > 0:
-            count = oncall_stats["count"]
-            med = mins_to_human(oncall_stats.get("median_mins"))
-            u30 = oncall_stats.get("under_30m", 0)
-            pct = 100 * u30 // count if count else 0
-            frt_lines.append(f"🔴 *On-Call Urgent (24/7):* {count} tickets, median {med}, {pct}% <30m")
-
-        # Other urgent (business hours)
-        urgent_stats = frt_by_priority.get("urgent") or frt_by_priority.get("other_urgent")
-        if urgent_stats and urgent_stats.get("count", 0) > 0:
-            count = urgent_stats["count"]
-            med = mins_to_human(urgent_stats.get("median_mins"))
-            frt_lines.append(f"🟠 *Urgent (biz hrs):* {count} tickets, median {med}")
-
-        # High
-        high_stats = frt_by_priority.get("high", {})
-        if high_stats.get("count", 0) > 0:
-            frt_lines.append(f"🟡 *High:* {high_stats['count']} tickets, median {mins_to_human(high_stats.get('median_mins'))}")
-
-        # Normal
-        normal_stats = frt_by_priority.get("normal", {})
-        if normal_stats.get("count", 0) > 0:
-            frt_lines.append(f"🟢 *Normal:* {normal_stats['count']} tickets, median {mins_to_human(normal_stats.get('median_mins'))}")
-
-        if frt_lines:
-            blocks.append({
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": "\n".join(frt_lines)},
-            })
-
-        # Add resolution metrics alongside FRT by priority
-        resolution_fields = []
+        # FRT by Priority if available (prefer this over generic frt_stats)
+        frt_lines: list[str] = []
+        for category, count, med, stats in prepared.frt_lines_data:
+            if category == "oncall":
+                # On-call urgent (24/7)
+                u30 = stats.get("under_30m", 0)
+                pct = _pct(u30, count)
+                frt_lines.append(f"🔴 *On-Call Urgent (24/7):* {count} tickets, median {med}, {pct}% <30m")
+            elif category == "urgent":
+                # Other urgent (business hours)
+                frt_lines.append(f"🟠 *Urgent (biz hrs):* {count} tickets, median {med}")
+            elif category == "high":
+                frt_lines.append(f"🟡 *High:* {count} tickets, median {med}")
+            elif category == "normal":
+                frt_lines.append(f"🟢 *Normal:* {count} tickets, median {med}")
+
+        # Resolution metrics alongside FRT by priority
+        resolution_fields: list[dict[str, str]] = []
         if resolution_stats:
             resolved = resolution_stats.get("count", 0)
             avg_res = mins_to_human(resolution_stats.get("avg_mins"))
-            res_pct = 100 * resolved // total_tickets if total_tickets else 0
-            resolution_fields.append({"type": "mrkdwn", "text": f"*Resolution Rate:*\n{res_pct}% ({resolved}/{total_tickets})"})
+            resolution_fields.append({"type": "mrkdwn", "text": f"*Resolution Rate:*\n{prepared.res_pct}% ({resolved}/{total_tickets})"})
             resolution_fields.append({"type": "mrkdwn", "text": f"*Avg Resolution:*\n{avg_res}"})
-        reopen_pct = 100 * reopen_count // total_tickets if total_tickets else 0
-        resolution_fields.append({"type": "mrkdwn", "text": f"*Reopen Rate:*\n{reopen_pct}% ({reopen_count}/{total_tickets})"})
+        resolution_fields.append({"type": "mrkdwn", "text": f"*Reopen Rate:*\n{prepared.reopen_pct}% ({reopen_count}/{total_tickets})"})
 
-        if resolution_fields:
-            blocks.append({"type": "section", "fields": resolution_fields})
-        blocks.append({"type": "divider"})
+        metrics_blocks = [
+            _FRT_PRIORITY_TITLE,
+            *([{"type": "section", "text": {"type": "mrkdwn", "text": "\n".join(frt_lines)}}] if frt_lines else []),
+            {"type": "section", "fields": resolution_fields},
+            _DIVIDER,
+        ]
 
     elif frt_stats or resolution_stats:
         # Fallback to generic FRT stats if frt_by_priority not available
-        blocks.append({
-            "type": "section",
-            "text": {"type": "mrkdwn", "text": "*⏱️ Response & Resolution Metrics*"},
-        })
-
-        metrics_fields = []
+        metrics_fields: list[dict[str, str]] = []
         if frt_stats:
             metrics_fields.extend([
                 {"type": "mrkdwn", "text": f"*Avg FRT:*\n{mins_to_human(frt_stats.get('avg_mins'))}"},
@@ -228,24 +410,22 @@ async def send_slack_report(
             resolved = resolution_stats.get("count", 0)
             metrics_fields.extend([
                 {"type": "mrkdwn", "text": f"*Avg Resolution:*\n{mins_to_human(resolution_stats.get('avg_mins'))}"},
-                {"type": "mrkdwn", "text": f"*Resolved:*\n{resolved}/{total_tickets} ({100*resolved//total_tickets if total_tickets else 0}%)"},
+                {"type": "mrkdwn", "text": f"*Resolved:*\n{resolved}/{total_tickets} ({prepared.res_pct}%)"},
             ])
-        reopen_pct = 100 * reopen_count // total_tickets if total_tickets else 0
-        metrics_fields.append({"type": "mrkdwn", "text": f"*Reopen Rate:*\n{reopen_pct}%"})
+        metrics_fields.append({"type": "mrkdwn", "text": f"*Reopen Rate:*\n{prepared.reopen_pct}%"})
 
-        blocks.append({"type": "section", "fields": metrics_fields[:6]})
-        blocks.append({"type": "divider"})
+        metrics_blocks = [_METRICS_TITLE, {"type": "section", "fields": metrics_fields[:6]}, _DIVIDER]
 
-    # Add Call Analysis if available
+    # Call Analysis if available
+    call_blocks: list[dict[str, Any]] = []
     if call_analysis:
-        confirmed = call_analysis.get("confirmed_calls", 0)
-        likely = call_analysis.get("likely_calls", 0)
+        confirmed = prepared.confirmed_calls
+        likely = prepared.likely_calls
         tickets_with = call_analysis.get("tickets_with_calls", 0)
-        total_calls = confirmed + likely
 
         if tickets_with > 0:
-            pct = 100 * tickets_with // total_tickets if total_tickets else 0
-            blocks.append({
+            pct = _pct(tickets_with, total_tickets)
+            call_blocks.append({
                 "type": "section",
                 "text": {"type": "mrkdwn", "text": f"*📞 Call/Meeting Analysis*\n{tickets_with} tickets ({pct}%) with calls · *{total_calls} total* ({confirmed} confirmed, {likely} likely)"},
             })
@@ -253,17 +433,19 @@ async def send_slack_report(
             # Show confirmed call details with dates
             confirmed_detail = call_analysis.get("confirmed_detail", [])
             if confirmed_detail:
-                detail_lines = []
+                detail_lines: list[str] = []
                 for item in confirmed_detail:
-                    dates = ", ".join(item.get("dates", [])) or "—"
-                    duration = f" ({item.get('duration')})" if item.get("duration") else ""
-                    detail_lines.append(f"• #{item['ticket_id']}: {item.get('count', 1)} call(s) on {dates}{duration}")
+                    get = item.get
+                    dates = ", ".join(get("dates", [])) or "—"
+                    duration = f" ({get('duration')})" if get("duration") else ""
+                    detail_lines.append(f"• #{item['ticket_id']}: {get('count', 1)} call(s) on {dates}{duration}")
                 likely_detail = call_analysis.get("likely_detail", [])
                 for item in likely_detail:
-                    date = item.get("date", "—") or "—"
-                    detail_lines.append(f"• #{item['ticket_id']}: likely call on {date} ({item.get('platform', 'N/A')})")
+                    get = item.get
+                    call_date = get("date", "—") or "—"
+                    detail_lines.append(f"• #{item['ticket_id']}: likely call on {call_date} ({get('platform', 'N/A')})")
                 if detail_lines:
-                    blocks.append({
+                    call_blocks.append({
                         "type": "context",
                         "elements": [{"type": "mrkdwn", "text": "\n".join(detail_lines)}],
                     })
@@ -271,51 +453,44 @@ async def send_slack_report(
             # Top customers by call rate
             by_customer = call_analysis.get("by_customer", {})
             if by_customer:
-                top_callers = sorted(by_customer.items(), key=lambda x: x[1].get("calls", 0), reverse=True)[:3]
-                caller_lines = []
-                for cust, cstats in top_callers:
-                    calls = cstats.get("calls", 0)
+                top_callers = heapq.nlargest(
+                    3,
+                    [(cust, cstats, cstats.get("calls", 0)) for cust, cstats in by_customer.items()],
+                    key=itemgetter(2),
+                )
+                caller_lines: list[str] = []
+                for cust, cstats, calls in top_callers:
                     tickets = cstats.get("tickets", 0)
-                    rate = 100 * calls // tickets if tickets else 0
+                    rate = _pct(calls, tickets)
                     caller_lines.append(f"• {cust}: {calls} calls ({rate}% of {tickets} tickets)")
                 if caller_lines:
-                    blocks.append({
+                    call_blocks.append({
                         "type": "context",
                         "elements": [{"type": "mrkdwn", "text": "Top callers: " + " | ".join(caller_lines)}],
                     })
-            blocks.append({"type": "divider"})
+            call_blocks.append(_DIVIDER)
 
-    # Add status breakdown if available
+    # Status breakdown if available
+    status_blocks: list[dict[str, Any]] = []
     if status_breakdown:
-        status_icons = {"pending": "🟡", "open": "🔴", "closed": "⚫", "solved": "🟢", "hold": "🟠"}
-        status_fields = []
-        for status, count in sorted(status_breakdown.items(), key=lambda x: x[1], reverse=True):
-            icon = status_icons.get(status, "⚪")
-            status_fields.append({"type": "mrkdwn", "text": f"{icon} *{status.title()}:* {count}"})
-
-        blocks.append({
-            "type": "section",
-            "text": {"type": "mrkdwn", "text": "*📋 Status Breakdown*"},
-        })
-        blocks.append({"type": "section", "fields": status_fields[:4]})
+        # Only the four largest statuses fit in the section
+        status_fields = [
+            {"type": "mrkdwn", "text": f"{_STATUS_ICONS.get(status, '⚪')} *{status.title()}:* {count}"}
+            for status, count in heapq.nlargest(4, status_breakdown.items(), key=itemgetter(1))
+        ]
+        status_blocks = [_STATUS_TITLE, {"type": "section", "fields": status_fields}]
 
-    # Add priority breakdown if available
+    # Priority breakdown if available
+    priority_blocks: list[dict[str, Any]] = []
     if priority_breakdown:
-        priority_icons = {"urgent": "🔴", "high": "🟠", "normal": "🟡", "low": "🟢"}
-        priority_fields = []
-        for priority, count in sorted(priority_breakdown.items(), key=lambda x: ["urgent", "high", "normal", "low"].index(x[0]) if x[0] in ["urgent", "high", "normal", "low"] else 99):
-            icon = priority_icons.get(priority, "⚪")
-            pct = 100 * count // total_tickets if total_tickets else 0
-            priority_fields.append({"type": "mrkdwn", "text": f"{icon} *{priority.title()}:* {count} ({pct}%)"})
-
-        blocks.append({
-            "type": "section",
-            "text": {"type": "mrkdwn", "text": "*🚨 Priority Breakdown*"},
-        })
-        blocks.append({"type": "section", "fields": priority_fields[:4]})
-        blocks.append({"type": "divider"})
+        priority_fields = [
+            {"type": "mrkdwn", "text": f"{_PRIORITY_ICONS.get(priority, '⚪')} *{priority.title()}:* {count} ({_pct(count, total_tickets)}%)"}
+            for priority, count in sorted(priority_breakdown.items(), key=_priority_key)
+        ]
+        priority_blocks = [_PRIORITY_TITLE, {"type": "section", "fields": priority_fields[:4]}, _DIVIDER]
 
-    # Add business hours section (only if configured)
+    # Business hours section (only if configured)
+    business_hours_blocks: list[dict[str, Any]] = []
     if business_hours:
         bh_cfg = business_hours.get("config", {})
         start_h = bh_cfg.get("start_hour", 9)
@@ -326,84 +501,106 @@ async def send_slack_report(
         cust_msgs_ooh = business_hours.get("customer_msgs_outside_hours", 0)
         support_ooh = business_hours.get("support_replies_outside_hours", 0)
 
-        blocks.append({
-            "type": "section",
-            "text": {"type": "mrkdwn", "text": f"*🕐 Outside Business Hours* ({start_h} AM - {end_h % 12 or 12} PM {tz_name})"},
-        })
-        blocks.append({
-            "type": "section",
-            "fields": [
-                {"type": "mrkdwn", "text": f"*Tickets Created:*\n{tickets_ooh}"},
-                {"type": "mrkdwn", "text": f"*Customer Messages:*\n{cust_msgs_ooh}"},
-                {"type": "mrkdwn", "text": f"*Support Replies:*\n{support_ooh}"},
-            ],
-        })
+        business_hours_blocks = [
+            {
+                "type": "section",
+                "text": {"type": "mrkdwn", "text": f"*🕐 Outside Business Hours* ({start_h} AM - {end_h % 12 or 12} PM {tz_name})"},
+            },
+            {
+                "type": "section",
+                "fields": [
+                    {"type": "mrkdwn", "text": f"*Tickets Created:*\n{tickets_ooh}"},
+                    {"type": "mrkdwn", "text": f"*Customer Messages:*\n{cust_msgs_ooh}"},
+                    {"type": "mrkdwn", "text": f"*Support Replies:*\n{support_ooh}"},
+                ],
+            },
+        ]
 
-    # Add on-call engagements (only if configured and present)
+    # On-call engagements (only if configured and present)
+    oncall_blocks: list[dict[str, Any]] = []
     if oncall_engagements:
         oncall_start = oncall_config.get("start_hour", 19)
         oncall_end = oncall_config.get("end_hour", 9)
         oncall_customers = oncall_config.get("customers", [])
         customer_desc = ", ".join(oncall_customers) if oncall_customers else "all customers"
 
-        oncall_lines = []
-        for eng in oncall_engagements[:5]:  # Max 5
-            oncall_lines.append(f"• *#{eng.get('ticket_id')}* – {eng.get('created_at_local', 'N/A')} – {eng.get('customer', '')} – _{eng.get('subject', '')[:25]}_")
-        blocks.append({
-            "type": "section",
-            "text": {"type": "mrkdwn", "text": f"*🚨 On-Call Engagements* ({oncall_start % 12 or 12} PM - {oncall_end} AM or weekends, {customer_desc}): {len(oncall_engagements)}"},
-        })
-        blocks.append({
-            "type": "section",
-            "text": {"type": "mrkdwn", "text": "\n".join(oncall_lines)},
-        })
-        blocks.append({"type": "divider"})
+        oncall_lines = [
+            f"• *#{eng.get('ticket_id')}* – {eng.get('created_at_local', 'N/A')} – {eng.get('customer', '')} – _{eng.get('subject', '')[:25]}_"
+            for eng in oncall_engagements[:5]  # Max 5
+        ]
+        oncall_blocks = [
+            {
+                "type": "section",
+                "text": {"type": "mrkdwn", "text": f"*🚨 On-Call Engagements* ({oncall_start % 12 or 12} PM - {oncall_end} AM or weekends, {customer_desc}): {len(oncall_engagements)}"},
+            },
+            {
+                "type": "section",
+                "text": {"type": "mrkdwn", "text": "\n".join(oncall_lines)},
+            },
+            _DIVIDER,
+        ]
 
-    # Add customer stats
-    blocks.extend([
-        {
-            "type": "section",
-            "text": {"type": "mrkdwn", "text": "*🏢 Tickets & Messages per Customer*"},
-        },
+    # Assemble all sections in display order
+    blocks: list[dict[str, Any]] = [
+        _HEADER_BLOCK,
+        *period_blocks,
+        *overview_blocks,
+        *metrics_blocks,
+        *call_blocks,
+        *status_blocks,
+        *priority_blocks,
+        *business_hours_blocks,
+        *oncall_blocks,
+        _CUSTOMERS_TITLE,
         {
             "type": "section",
             "fields": customer_fields,
         },
-        {"type": "divider"},
-        {
-            "type": "section",
-            "text": {"type": "mrkdwn", "text": "*🎫 Top Tickets by Activity*"},
-        },
+        _DIVIDER,
+        _TOP_TICKETS_TITLE,
         {
             "type": "section",
             "text": {"type": "mrkdwn", "text": "\n".join(ticket_lines)},
         },
-        {
-            "type": "context",
-            "elements": [
-                {
-                    "type": "mrkdwn",
-                    "text": "📞 = Call detected (best-effort from keywords) | Generated by Zendesk CLI Skill",
-                },
-            ],
-        },
-    ])
+        _FOOTER_CONTEXT,
+    ]
+    return blocks
+
+
+async def _post_blocks(
+    webhook_url: str,
+    channel: str,
+    blocks_json: bytes,
+) -> dict[str, Any]:
+    """Post report blocks to a Slack webhook.
+
+    Args:
+        webhook_url: Slack incoming webhook URL
+        channel: Target channel
+        blocks_json: The blocks list, already JSON-encoded
+
+    Returns:
+        Dict with success status
+    """
+    if not channel.startswith("#"):
+        channel = f"#{channel}"
 
-    payload = {"channel": channel, "blocks": blocks}
+    # Splice the pre-encoded blocks in rather than re-serializing them per channel
+    body = b'{"channel":' + jsonio.dumps(channel) + b',"blocks":' + blocks_json + b"}"
 
+    client = get_slack_http()
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                webhook_url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=30.0,
-            )
-            if response.text != "ok":
-                return {
-                    "success": False,
-                    "error": f"Slack API error: {response.text}",
-                }
+        response = await client.post(
+            webhook_url,
+            content=body,
+            headers={"Content-Type": "application/json"},
+            timeout=30.0,
+        )
+        if response.content != b"ok":
+            return {
+                "success": False,
+                "error": f"Slack API error: {response.text}",
+            }
     except httpx.RequestError as e:
         return {
             "success": False,
@@ -417,21 +614,22 @@ async def send_slack_report(
     }
 
 
-def generate_markdown_report(report_data: dict) -> str:
+def generate_markdown_report(report_data: dict[str, Any], prepared: PreparedReport | None = None) -> str:
     """Generate a detailed markdown support metrics report.
 
     Args:
         report_data: Dict with ticket_analysis, customer_stats, summary,
                      status_breakdown, priority_breakdown, frt_by_priority,
                      resolution_stats, period, business_hours, oncall, call_analysis
+        prepared: prepare_report_view(report_data), if already built
 
     Returns:
         Markdown formatted report string
     """
     # Extract report data
+    prepared = prepared or prepare_report_view(report_data)
     summary = report_data.get("summary", {})
     customer_stats = report_data.get("customer_stats", {})
-    ticket_analysis = report_data.get("ticket_analysis", [])
     status_breakdown = report_data.get("status_breakdown", {})
     priority_breakdown = report_data.get("priority_breakdown", {})
     frt_by_priority = report_data.get("frt_by_priority", {})
@@ -446,7 +644,7 @@ def generate_markdown_report(report_data: dict) -> str:
     total_tickets = summary.get("total_tickets", 0)
     total_replies = summary.get("total_replies", 0) or summary.get("total_messages", 0)
 
-    lines = ["# Support Metrics Report", ""]
+    lines: list[str] = ["# Support Metrics Report", ""]
 
     # Period header
     if period:
@@ -454,33 +652,43 @@ def generate_markdown_report(report_data: dict) -> str:
         end = period.get("end_date", "")
         days = period.get("days", 0)
         if start and end:
-            lines.append(f"**Period:** {start} – {end} ({days} days)")
-            lines.append("")
+            lines.extend([
+                f"**Period:** {start} – {end} ({days} days)",
+                "",
+            ])
 
     lines.extend(["---", "", "## Executive Summary", ""])
 
     # Executive summary table
-    lines.append("| Metric | Value |")
-    lines.append("|--------|-------|")
+    lines.extend([
+        "| Metric | Value |",
+        "|--------|-------|",
+    ])
     new_tickets = summary.get("new_tickets", total_tickets)
     existing_tickets = summary.get("existing_tickets", 0)
-    lines.append(f"| New Tickets Created | {new_tickets} |")
-    lines.append(f"| Total Tickets (incl. older active) | {total_tickets} |")
-    lines.append(f"| Total Agent Replies | {total_replies} |")
+    lines.extend([
+        f"| New Tickets Created | {new_tickets} |",
+        f"| Total Tickets (incl. older active) | {total_tickets} |",
+        f"| Total Agent Replies | {total_replies} |",
+    ])
 
     # Call stats
     tickets_with_calls = summary.get("tickets_with_calls", 0)
     if call_analysis:
-        confirmed = call_analysis.get("confirmed_calls", 0)
-        likely = call_analysis.get("likely_calls", 0)
-        total_calls = confirmed + likely
-        lines.append(f"| Tickets with Calls/Meetings | {tickets_with_calls} |")
-        lines.append(f"| Total Calls Estimated | {total_calls} ({confirmed} confirmed, {likely} likely) |")
+        confirmed = prepared.confirmed_calls
+        likely = prepared.likely_calls
+        total_calls = prepared.total_calls
+        lines.extend([
+            f"| Tickets with Calls/Meetings | {tickets_with_calls} |",
+            f"| Total Calls Estimated | {total_calls} ({confirmed} confirmed, {likely} likely) |",
+        ])
     elif tickets_with_calls:
         lines.append(f"| Tickets with Calls/Meetings | {tickets_with_calls} |")
 
-    lines.append(f"| Unique Customers | {summary.get('unique_customers', 0)} |")
-    lines.extend(["", "---", ""])
+    lines.extend([
+        f"| Unique Customers | {summary.get('unique_customers', 0)} |",
+        "", "---", "",
+    ])
 
     # FRT by Priority section
     if frt_by_priority:
@@ -497,35 +705,27 @@ def generate_markdown_report(report_data: dict) -> str:
 
         if oncall_customers:
             lines.append(f"*{', '.join(oncall_customers)} urgent tickets measured in calendar time (24/7 on-call coverage)*")
-        lines.append(f"*All other tickets measured in business hours only ({start_h} AM – {end_h % 12 or 12} PM {tz_name})*")
-        lines.append("")
-
-        lines.append("| Category | Tickets | Avg FRT | Median FRT | Min | Max |")
-        lines.append("|----------|---------|---------|------------|-----|-----|")
-
-        # Map key names (support both analyze_support_metrics.py output and alternative names)
-        priority_labels = [
-            (["oncall", "oncall_urgent"], "**URGENT (on-call)** - 24/7", True),
-            (["urgent", "other_urgent"], "**URGENT (other)** - biz hrs", True),
-            (["high"], "**HIGH** - biz hrs", False),
-            (["normal"], "**NORMAL** - biz hrs", False),
-            (["low"], "**LOW** - biz hrs", False),
-        ]
+        lines.extend([
+            f"*All other tickets measured in business hours only ({start_h} AM – {end_h % 12 or 12} PM {tz_name})*",
+            "",
+        ])
+
+        lines.extend([
+            "| Category | Tickets | Avg FRT | Median FRT | Min | Max |",
+            "|----------|---------|---------|------------|-----|-----|",
+        ])
+
+        frt_labels = {
+            "oncall": ("**URGENT (on-call)** - 24/7", True),
+            "urgent": ("**URGENT (other)** - biz hrs", True),
+            "high": ("**HIGH** - biz hrs", False),
+            "normal": ("**NORMAL** - biz hrs", False),
+            "low": ("**LOW** - biz hrs", False),
+        }
 
-        for keys, label, is_urgent in priority_labels:
-            # Find the first matching key
-            stats = None
-            for key in keys:
-                if key in frt_by_priority:
-                    stats = frt_by_priority[key]
-                    break
-            if not stats:
-                continue
-            count = stats.get("count", 0)
-            if count == 0:
-                continue
+        for category, count, med_frt, stats in prepared.frt_lines_data:
+            label = frt_labels[category][0]
             avg_frt = mins_to_human(stats.get("avg_mins"))
-            med_frt = mins_to_human(stats.get("median_mins"))
             min_frt = mins_to_human(stats.get("min_mins"))
             max_frt = mins_to_human(stats.get("max_mins"))
             lines.append(f"| {label} | {count} | {avg_frt} | **{med_frt}** | {min_frt} | {max_frt} |")
@@ -533,178 +733,192 @@ def generate_markdown_report(report_data: dict) -> str:
         lines.append("")
 
         # SLA Achievement tables for each category
-        for keys, label, is_urgent in priority_labels:
-            # Find the first matching key
-            stats = None
-            matched_key = None
-            for key in keys:
-                if key in frt_by_priority:
-                    stats = frt_by_priority[key]
-                    matched_key = key
-                    break
-            if not stats:
-                continue
-            count = stats.get("count", 0)
-            if count == 0:
-                continue
-
+        for category, count, _, stats in prepared.frt_lines_data:
+            label, is_urgent = frt_labels[category]
             u30 = stats.get("under_30m", 0)
             u1h = stats.get("under_1h", 0)
             u4h = stats.get("under_4h", 0)
             u8h = stats.get("under_8h", 0)
 
             clean_label = label.replace("**", "").split(" - ")[0]
-            lines.extend([f"### {clean_label} Response Time", ""])
-            lines.append("| SLA Target | Achievement |")
-            lines.append("|------------|-------------|")
+            lines.extend([
+                f"### {clean_label} Response Time", "",
+                "| SLA Target | Achievement |",
+                "|------------|-------------|",
+            ])
 
             if is_urgent:
-                lines.append(f"| Under 30 min | {100*u30//count}% ({u30}/{count}) |")
-                lines.append(f"| Under 1 hour | {100*u1h//count}% ({u1h}/{count}) |")
-            lines.append(f"| Under 4 hours | {100*u4h//count}% ({u4h}/{count}) |")
-            if matched_key in ["normal", "high"]:
-                lines.append(f"| Under 8 hours (1 biz day) | {100*u8h//count}% ({u8h}/{count}) |")
+                lines.extend([
+                    f"| Under 30 min | {_pct(u30, count)}% ({u30}/{count}) |",
+                    f"| Under 1 hour | {_pct(u1h, count)}% ({u1h}/{count}) |",
+                ])
+            lines.append(f"| Under 4 hours | {_pct(u4h, count)}% ({u4h}/{count}) |")
+            if category in ["normal", "high"]:
+                lines.append(f"| Under 8 hours (1 biz day) | {_pct(u8h, count)}% ({u8h}/{count}) |")
             lines.append("")
 
         lines.extend(["---", ""])
 
     # Resolution Metrics
     if resolution_stats or reopen_count:
-        lines.extend(["## Resolution Metrics", ""])
-        lines.append("| Metric | Value |")
-        lines.append("|--------|-------|")
+        lines.extend([
+            "## Resolution Metrics", "",
+            "| Metric | Value |",
+            "|--------|-------|",
+        ])
 
         if resolution_stats:
             avg_res = mins_to_human(resolution_stats.get("avg_mins"))
             med_res = mins_to_human(resolution_stats.get("median_mins"))
             resolved = resolution_stats.get("count", 0)
-            res_rate = 100 * resolved // total_tickets if total_tickets else 0
-            lines.append(f"| **Average Resolution Time** | {avg_res} |")
-            lines.append(f"| **Median Resolution Time** | {med_res} |")
-            lines.append(f"| **Resolution Rate** | {res_rate}% ({resolved}/{total_tickets}) |")
+            lines.extend([
+                f"| **Average Resolution Time** | {avg_res} |",
+                f"| **Median Resolution Time** | {med_res} |",
+                f"| **Resolution Rate** | {prepared.res_pct}% ({resolved}/{total_tickets}) |",
+            ])
 
-        reopen_rate = 100 * reopen_count // total_tickets if total_tickets else 0
-        lines.append(f"| **Reopen Rate** | {reopen_rate}% ({reopen_count}/{total_tickets}) |")
-        lines.append("")
+        lines.extend([
+            f"| **Reopen Rate** | {prepared.reopen_pct}% ({reopen_count}/{total_tickets}) |",
+            "",
+        ])
 
         # Reply statistics
         if summary.get("avg_replies_per_ticket"):
-            lines.extend(["### Reply Statistics", ""])
-            lines.append("| Metric | Value |")
-            lines.append("|--------|-------|")
-            lines.append(f"| Average replies per ticket | {summary.get('avg_replies_per_ticket', 0):.1f} |")
-            lines.append(f"| Median replies per ticket | {summary.get('median_replies_per_ticket', 0):.1f} |")
-            lines.append(f"| Max replies on single ticket | {summary.get('max_replies_per_ticket', 0)} |")
-            lines.append("")
+            lines.extend([
+                "### Reply Statistics", "",
+                "| Metric | Value |",
+                "|--------|-------|",
+                f"| Average replies per ticket | {summary.get('avg_replies_per_ticket', 0):.1f} |",
+                f"| Median replies per ticket | {summary.get('median_replies_per_ticket', 0):.1f} |",
+                f"| Max replies on single ticket | {summary.get('max_replies_per_ticket', 0)} |",
+                "",
+            ])
 
         lines.extend(["---", ""])
 
     # Status Breakdown
     if status_breakdown:
-        lines.extend(["## Status Breakdown", ""])
-        lines.append("| Status | Count | Percentage |")
-        lines.append("|--------|-------|------------|")
-
-        sorted_status = sorted(status_breakdown.items(), key=lambda x: x[1], reverse=True)
-        for status, count in sorted_status:
-            pct = 100 * count / total_tickets if total_tickets else 0
-            lines.append(f"| {status.title()} | {count} | {pct:.1f}% |")
+        lines.extend([
+            "## Status Breakdown", "",
+            "| Status | Count | Percentage |",
+            "|--------|-------|------------|",
+        ])
+
+        sorted_status = sorted(status_breakdown.items(), key=itemgetter(1), reverse=True)
+        lines.extend(
+            f"| {status.title()} | {count} | {(100 * count / total_tickets if total_tickets else 0):.1f}% |"
+            for status, count in sorted_status
+        )
 
         lines.extend(["", "---", ""])
 
     # Priority Breakdown
     if priority_breakdown:
-        lines.extend(["## Priority Breakdown", ""])
-        lines.append("| Priority | Count | Percentage |")
-        lines.append("|----------|-------|------------|")
-
-        priority_order = ["urgent", "high", "normal", "low"]
-        sorted_priority = sorted(
-            priority_breakdown.items(),
-            key=lambda x: priority_order.index(x[0]) if x[0] in priority_order else 99
+        lines.extend([
+            "## Priority Breakdown", "",
+            "| Priority | Count | Percentage |",
+            "|----------|-------|------------|",
+        ])
+
+        sorted_priority = sorted(priority_breakdown.items(), key=_priority_key)
+        lines.extend(
+            f"| {priority.title()} | {count} | {(100 * count / total_tickets if total_tickets else 0):.1f}% |"
+            for priority, count in sorted_priority
         )
-        for priority, count in sorted_priority:
-            pct = 100 * count / total_tickets if total_tickets else 0
-            lines.append(f"| {priority.title()} | {count} | {pct:.1f}% |")
 
         lines.extend(["", "---", ""])
 
     # Tickets by Customer
     if customer_stats:
-        lines.extend(["## Tickets by Customer", ""])
-        lines.append("| Customer | Tickets | Agent Replies |")
-        lines.append("|----------|---------|---------------|")
-
-        sorted_customers = sorted(
-            customer_stats.items(),
-            key=lambda x: x[1].get("tickets", 0),
-            reverse=True
+        lines.extend([
+            "## Tickets by Customer", "",
+            "| Customer | Tickets | Agent Replies |",
+            "|----------|---------|---------------|",
+        ])
+
+        lines.extend(
+            f"| {customer} | {stats.get('tickets', 0)} | {stats.get('replies', 0) or stats.get('messages', 0)} |"
+            for customer, stats in prepared.top_customers
         )
-        for customer, stats in sorted_customers:
-            tickets = stats.get("tickets", 0)
-            replies = stats.get("replies", 0) or stats.get("messages", 0)
-            lines.append(f"| {customer} | {tickets} | {replies} |")
 
         lines.extend(["", "---", ""])
 
     # Call/Meeting Analysis
     if call_analysis or summary.get("tickets_with_calls"):
-        lines.extend(["## Call/Meeting Analysis", ""])
-        lines.append("*Calls detected by analyzing ticket comments for meeting links (Zoom, Teams, Meet) and call-related keywords*")
-        lines.append("")
-        lines.append("> **Note:** Call detection is performed on a best-effort basis and most likely **underestimates** the actual number of calls. Calls scheduled via email, direct calendar invites, or mentioned using non-standard terminology may not be detected.")
-        lines.append("")
+        lines.extend([
+            "## Call/Meeting Analysis", "",
+            "*Calls detected by analyzing ticket comments for meeting links (Zoom, Teams, Meet) and call-related keywords*",
+            "",
+            "> **Note:** Call detection is performed on a best-effort basis and most likely **underestimates** the actual number of calls. Calls scheduled via email, direct calendar invites, or mentioned using non-standard terminology may not be detected.",
+            "",
+        ])
 
         if call_analysis:
-            lines.extend(["### Summary", ""])
-            lines.append("| Category | Count |")
-            lines.append("|----------|-------|")
+            lines.extend([
+                "### Summary", "",
+                "| Category | Count |",
+                "|----------|-------|",
+            ])
 
             tickets_with = call_analysis.get("tickets_with_calls", summary.get("tickets_with_calls", 0))
-            confirmed = call_analysis.get("confirmed_calls", 0)
-            likely = call_analysis.get("likely_calls", 0)
-            total_calls = confirmed + likely
+            confirmed = prepared.confirmed_calls
+            likely = prepared.likely_calls
+            total_calls = prepared.total_calls
 
             pct = 100 * tickets_with / total_tickets if total_tickets else 0
-            lines.append(f"| Tickets with calls/meetings | {tickets_with} ({pct:.1f}%) |")
-            lines.append(f"| **Confirmed calls** (evidence call happened) | {confirmed} |")
-            lines.append(f"| **Likely calls** (meeting link + setup discussion) | {likely} |")
-            lines.append(f"| Total estimated calls | **{total_calls}** |")
-            lines.append("")
+            lines.extend([
+                f"| Tickets with calls/meetings | {tickets_with} ({pct:.1f}%) |",
+                f"| **Confirmed calls** (evidence call happened) | {confirmed} |",
+                f"| **Likely calls** (meeting link + setup discussion) | {likely} |",
+                f"| Total estimated calls | **{total_calls}** |",
+                "",
+            ])
 
             # Confirmed calls detail if available
             confirmed_detail = call_analysis.get("confirmed_detail", [])
             if confirmed_detail:
-                lines.extend(["### Confirmed Calls (evidence in comments)", ""])
-                lines.append("| Ticket | Calls | Date(s) | Duration | Evidence |")
-                lines.append("|--------|-------|---------|----------|----------|")
+                lines.extend([
+                    "### Confirmed Calls (evidence in comments)", "",
+                    "| Ticket | Calls | Date(s) | Duration | Evidence |",
+                    "|--------|-------|---------|----------|----------|",
+                ])
                 for item in confirmed_detail:
-                    dates = ", ".join(item.get("dates", [])) or "—"
-                    duration = item.get("duration") or "—"
-                    lines.append(f"| #{item.get('ticket_id')} | {item.get('count', 1)} | {dates} | {duration} | {item.get('evidence', 'N/A')} |")
+                    get = item.get
+                    dates = ", ".join(get("dates", [])) or "—"
+                    lines.append(
+                        f"| #{get('ticket_id')} | {get('count', 1)} | {dates} | {get('duration') or '—'} | {get('evidence', 'N/A')} |"
+                    )
                 lines.append("")
 
             # Likely calls detail if available
             likely_detail = call_analysis.get("likely_detail", [])
             if likely_detail:
-                lines.extend(["### Likely Calls (meeting link shared with setup)", ""])
-                lines.append("| Ticket | Platform | Date | Link |")
-                lines.append("|--------|----------|------|------|")
+                lines.extend([
+                    "### Likely Calls (meeting link shared with setup)", "",
+                    "| Ticket | Platform | Date | Link |",
+                    "|--------|----------|------|------|",
+                ])
                 for item in likely_detail:
-                    date = item.get("date", "—") or "—"
-                    lines.append(f"| #{item.get('ticket_id')} | {item.get('platform', 'N/A')} | {date} | {item.get('link', 'N/A')} |")
+                    get = item.get
+                    lines.append(
+                        f"| #{get('ticket_id')} | {get('platform', 'N/A')} | {get('date', '—') or '—'} | {get('link', 'N/A')} |"
+                    )
                 lines.append("")
 
             # Call rate by customer if available
             call_by_customer = call_analysis.get("by_customer", {})
             if call_by_customer:
-                lines.extend(["### Call Rate by Customer", ""])
-                lines.append("| Customer | Tickets | Calls | Call Rate |")
-                lines.append("|----------|---------|-------|-----------|")
-                sorted_call_cust = sorted(call_by_customer.items(), key=lambda x: x[1].get("calls", 0), reverse=True)
-                for cust, cstats in sorted_call_cust:
+                lines.extend([
+                    "### Call Rate by Customer", "",
+                    "| Customer | Tickets | Calls | Call Rate |",
+                    "|----------|---------|-------|-----------|",
+                ])
+                sorted_call_cust = [
+                    (cust, cstats, cstats.get("calls", 0)) for cust, cstats in call_by_customer.items()
+                ]
+                sorted_call_cust.sort(key=itemgetter(2), reverse=True)
+                for cust, cstats, cust_calls in sorted_call_cust:
                     cust_tickets = cstats.get("tickets", 0)
-                    cust_calls = cstats.get("calls", 0)
                     rate = 100 * cust_calls / cust_tickets if cust_tickets else 0
                     lines.append(f"| {cust} | {cust_tickets} | {cust_calls} | {rate:.1f}% |")
                 lines.append("")
@@ -718,21 +932,25 @@ def generate_markdown_report(report_data: dict) -> str:
         end_h = bh_cfg.get("end_hour", 18)
         tz_name = bh_cfg.get("timezone", "Europe/Berlin")
 
-        lines.extend(["## Business Hours Analysis", ""])
-        lines.append(f"*Business hours: {start_h} AM – {end_h % 12 or 12} PM {tz_name}, Monday–Friday*")
-        lines.append("")
-        lines.append("| Metric | Count |")
-        lines.append("|--------|-------|")
+        lines.extend([
+            "## Business Hours Analysis", "",
+            f"*Business hours: {start_h} AM – {end_h % 12 or 12} PM {tz_name}, Monday–Friday*",
+            "",
+            "| Metric | Count |",
+            "|--------|-------|",
+        ])
 
         tickets_ooh = business_hours.get("tickets_outside_hours", 0)
         cust_msgs_ooh = business_hours.get("customer_msgs_outside_hours", 0)
         support_ooh = business_hours.get("support_replies_outside_hours", 0)
 
         pct = 100 * tickets_ooh / total_tickets if total_tickets else 0
-        lines.append(f"| Tickets created outside business hours | {tickets_ooh} ({pct:.1f}%) |")
-        lines.append(f"| Customer messages outside business hours | {cust_msgs_ooh} |")
-        lines.append(f"| Support replies outside business hours | {support_ooh} |")
-        lines.extend(["", "---", ""])
+        lines.extend([
+            f"| Tickets created outside business hours | {tickets_ooh} ({pct:.1f}%) |",
+            f"| Customer messages outside business hours | {cust_msgs_ooh} |",
+            f"| Support replies outside business hours | {support_ooh} |",
+            "", "---", "",
+        ])
 
     # On-Call Engagements
     oncall_engagements = oncall_data.get("engagements", []) if oncall_data else []
@@ -741,11 +959,13 @@ def generate_markdown_report(report_data: dict) -> str:
         oncall_customers = oncall_cfg.get("customers", [])
         customer_desc = f"tracked for {', '.join(oncall_customers)} urgent tickets" if oncall_customers else "tracked for urgent tickets"
 
-        lines.extend(["## On-Call Engagements", ""])
-        lines.append(f"*On-call window: 7 PM – 9 AM or weekends, {customer_desc}*")
-        lines.append("")
-        lines.append("| Ticket | Date/Time | Subject |")
-        lines.append("|--------|-----------|---------|")
+        lines.extend([
+            "## On-Call Engagements", "",
+            f"*On-call window: 7 PM – 9 AM or weekends, {customer_desc}*",
+            "",
+            "| Ticket | Date/Time | Subject |",
+            "|--------|-----------|---------|",
+        ])
 
         for eng in oncall_engagements:
             tid = eng.get("ticket_id")
@@ -755,9 +975,11 @@ def generate_markdown_report(report_data: dict) -> str:
                 subj += "..."
             lines.append(f"| #{tid} | {dt} | {subj} |")
 
-        lines.append("")
-        lines.append(f"**Total on-call engagements:** {len(oncall_engagements)}")
-        lines.extend(["", "---", ""])
+        lines.extend([
+            "",
+            f"**Total on-call engagements:** {len(oncall_engagements)}",
+            "", "---", "",
+        ])
 
     # Key Observations (summary section)
     lines.extend(["## Key Observations", ""])
@@ -771,7 +993,7 @@ def generate_markdown_report(report_data: dict) -> str:
             med = mins_to_human(oncall_stats["median_mins"])
             u30 = oncall_stats.get("under_30m", 0)
             count = oncall_stats.get("count", 1)
-            lines.append(f"- **On-call urgent tickets**: **{100*u30//count}% responded within 30 minutes** (median {med}) with 24/7 coverage")
+            lines.append(f"- **On-call urgent tickets**: **{_pct(u30, count)}% responded within 30 minutes** (median {med}) with 24/7 coverage")
 
         # Check for other urgent stats (may be "urgent" or "other_urgent")
         other_urgent_stats = frt_by_priority.get("urgent") or frt_by_priority.get("other_urgent")
@@ -795,8 +1017,7 @@ def generate_markdown_report(report_data: dict) -> str:
     # Top customers
     if customer_stats:
         lines.extend(["### Top Customers by Volume", ""])
-        sorted_cust = sorted(customer_stats.items(), key=lambda x: x[1].get("tickets", 0), reverse=True)[:3]
-        for i, (cust, cstats) in enumerate(sorted_cust, 1):
+        for i, (cust, cstats) in enumerate(prepared.leading_customers(3), 1):
             tickets = cstats.get("tickets", 0)
             replies = cstats.get("replies", 0) or cstats.get("messages", 0)
             pct = 100 * tickets / total_tickets if total_tickets else 0
@@ -811,8 +1032,10 @@ def generate_markdown_report(report_data: dict) -> str:
         med_res = mins_to_human(resolution_stats.get("median_mins"))
         reopen_rate = 100 * reopen_count / total_tickets if total_tickets else 0
         avg_replies = summary.get("avg_replies_per_ticket", 0)
-        lines.append(f"- **{res_rate:.1f}% resolution rate** with median resolution time of {med_res}")
-        lines.append(f"- **{reopen_rate:.1f}% reopen rate** ({reopen_count} tickets reopened at least once)")
+        lines.extend([
+            f"- **{res_rate:.1f}% resolution rate** with median resolution time of {med_res}",
+            f"- **{reopen_rate:.1f}% reopen rate** ({reopen_count} tickets reopened at least once)",
+        ])
         if avg_replies:
             lines.append(f"- Average of **{avg_replies:.1f} replies per ticket** indicates thorough multi-touch resolution")
         lines.append("")
@@ -834,24 +1057,16 @@ def generate_markdown_report(report_data: dict) -> str:
         pct = 100 * tickets_with / total_tickets if total_tickets else 0
         lines.append(f"- **{tickets_with} tickets ({pct:.1f}%)** involved calls or video meetings")
         if call_analysis:
-            confirmed = call_analysis.get("confirmed_calls", 0)
-            likely = call_analysis.get("likely_calls", 0)
-            total_calls = confirmed + likely
+            confirmed = prepared.confirmed_calls
+            likely = prepared.likely_calls
+            total_calls = prepared.total_calls
             lines.append(f"- **{total_calls} total calls** estimated ({confirmed} confirmed, {likely} likely)")
         lines.append("")
 
     lines.extend(["---", ""])
 
     # Footer
-    now = datetime.now().strftime("%B %d, %Y")
-    lines.extend([
-        f"*Report generated: {now}*",
-        "*Data source: Zendesk API via zendesk-skill*",
-        "*Methodology:*",
-        "- *Tickets with ≥1 agent reply*",
-        "- *FRT from Zendesk Ticket Metrics API: calendar time for on-call urgent (24/7 coverage), business hours for all others*",
-        "- *Call detection: Searches comments for meeting links (Zoom, Teams, Meet) and call-related patterns. \"Confirmed\" calls have evidence (e.g., \"following our call\", \"meeting notes\"). \"Likely\" calls have meeting links + setup discussion.*",
-        "",
-    ])
+    lines.append(f"*Report generated: {_date_label(date.today())}*")
+    lines.extend(_FOOTER_STATIC)
 
     return "\n".join(lines)
@@ -21,18 +21,30 @@ Default period is 2 weeks ending today.
 """
 
 import argparse
-import json
+import asyncio
 import re
-import subprocess
 import sys
 import tempfile
-from collections import defaultdict
+from bisect import bisect_right
+from collections import Counter, defaultdict, deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from statistics import mean, median
 from zoneinfo import ZoneInfo
 
-from zendesk_skill.client import get_business_hours_config
+from zendesk_skill.client import (
+    ZendeskClientError,
+    close_client,
+    get_business_hours_config,
+    get_client,
+    reset_client,
+)
+from zendesk_skill.queries import get_queries_for_tool
+from zendesk_skill.storage import save_response
+from zendesk_skill.utils import jsonio
 from zendesk_skill.utils.time import mins_to_human
 
 
@@ -43,40 +55,53 @@ def get_domain(email: str) -> str:
     return email.split("@")[1].lower()
 
 
+@lru_cache(maxsize=65536)
 def parse_timestamp(ts: str, tz: ZoneInfo) -> datetime | None:
-    """Parse ISO timestamp and convert to specified timezone."""
+    """Parse ISO timestamp and convert to specified timezone.
+
+    Memoized: the same comment timestamps are parsed for the period filter and
+    again for the FRT lookup, and datetimes are immutable so sharing is safe.
+    """
     if not ts:
         return None
     try:
-        dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-        return dt.astimezone(tz)
+        # fromisoformat accepts the trailing "Z" itself on Python 3.11+
+        return datetime.fromisoformat(ts).astimezone(tz)
     except (ValueError, TypeError):
         return None
 
 
-def is_business_hours(dt: datetime, config: dict, tz: ZoneInfo) -> bool:
-    """Check if datetime is within business hours.
+def business_hours_mask(config: dict) -> int:
+    """Build a weekly bitmap of business hours from config.
+
+    Bit weekday * 24 + hour (weekday 0=Monday) is set for every hour inside
+    business hours, so classifying a datetime is a single bit test.
 
     Args:
-        dt: Datetime to check
         config: Business hours config with start_hour, end_hour, workdays
-        tz: Timezone for conversion
     """
-    if dt is None:
-        return True  # Assume business hours if unknown
-    local_dt = dt.astimezone(tz) if dt.tzinfo else dt
-
     start_hour = config.get("start_hour", 9)
     end_hour = config.get("end_hour", 18)
     workdays = config.get("workdays", [0, 1, 2, 3, 4])  # Mon-Fri default
 
-    # Check if workday
-    if local_dt.weekday() not in workdays:
-        return False
-    # Check if within hours
-    if local_dt.hour < start_hour or local_dt.hour >= end_hour:
-        return False
-    return True
+    mask = 0
+    for day in workdays:
+        for hour in range(start_hour, end_hour):
+            mask |= 1 << (day * 24 + hour)
+    return mask
+
+
+def is_business_hours(dt: datetime, mask: int) -> bool:
+    """Check if datetime is within business hours.
+
+    Args:
+        dt: Datetime to check, already in the business hours timezone
+            (parse_timestamp localizes to it)
+        mask: Bitmap from business_hours_mask
+    """
+    if dt is None:
+        return True  # Assume business hours if unknown
+    return bool(mask >> (dt.weekday() * 24 + dt.hour) & 1)
 
 
 def is_oncall_hours(dt: datetime, config: dict, tz: ZoneInfo, workdays: list[int]) -> bool:
@@ -90,7 +115,7 @@ def is_oncall_hours(dt: datetime, config: dict, tz: ZoneInfo, workdays: list[int
     """
     if dt is None:
         return False
-    local_dt = dt.astimezone(tz) if dt.tzinfo else dt
+    local_dt = dt.astimezone(tz) if dt.tzinfo and dt.tzinfo is not tz else dt
 
     start_hour = config.get("start_hour", 19)
     end_hour = config.get("end_hour", 9)
@@ -104,12 +129,31 @@ def is_oncall_hours(dt: datetime, config: dict, tz: ZoneInfo, workdays: list[int
     return False
 
 
+def _business_overlap_minutes(
+    day_start: datetime, day_end: datetime | None, start_hour: int, end_hour: int, workdays: list[int]
+) -> float:
+    """Minutes of [day_start, day_end) inside the business window of day_start's date.
+
+    day_end=None means the interval runs past the end of the business day.
+    """
+    if day_start.weekday() not in workdays:
+        return 0.0
+    biz_start = day_start.replace(hour=start_hour, minute=0, second=0, microsecond=0)
+    biz_end = day_start.replace(hour=end_hour, minute=0, second=0, microsecond=0)
+    overlap_start = max(day_start, biz_start)
+    overlap_end = biz_end if day_end is None else min(day_end, biz_end)
+    if overlap_start < overlap_end:
+        return (overlap_end - overlap_start).total_seconds() / 60
+    return 0.0
+
+
 def _calculate_business_minutes(start: datetime, end: datetime, config: dict, tz: ZoneInfo) -> float:
     """Calculate minutes between two datetimes counting only business hours.
 
-    Walks through each minute from start to end and counts only those
-    that fall within business hours. For accuracy without excessive iteration,
-    we walk day-by-day and calculate overlap with business hours per day.
+    Works on local wall-clock time. Only the first and last day need their
+    overlap with the business window computed; every workday in between
+    contributes a full business day, so those are counted arithmetically
+    from the date ordinals instead of walked one by one.
     """
     start_hour = config.get("start_hour", 9)
     end_hour = config.get("end_hour", 18)
@@ -121,32 +165,71 @@ def _calculate_business_minutes(start: datetime, end: datetime, config: dict, tz
     if start_local >= end_local:
         return 0.0
 
-    total_minutes = 0.0
-    current = start_local
-
-    while current < end_local:
-        # If not a workday, skip to next day
-        if current.weekday() not in workdays:
-            next_day = current.replace(hour=0, minute=0, second=0) + timedelta(days=1)
-            current = next_day
-            continue
-
-        # Business window for this day
-        biz_start = current.replace(hour=start_hour, minute=0, second=0, microsecond=0)
-        biz_end = current.replace(hour=end_hour, minute=0, second=0, microsecond=0)
+    start_ord = start_local.toordinal()
+    end_ord = end_local.toordinal()
+    if start_ord == end_ord:
+        return _business_overlap_minutes(start_local, end_local, start_hour, end_hour, workdays)
 
-        # Overlap between [current, end_local] and [biz_start, biz_end]
-        overlap_start = max(current, biz_start)
-        overlap_end = min(end_local, biz_end)
+    # Whole days strictly between the first and last day; ordinal o falls on weekday (o - 1) % 7
+    is_workday = [day in workdays for day in range(7)]
+    full_weeks, extra_days = divmod(end_ord - start_ord - 1, 7)
+    full_workdays = full_weeks * sum(is_workday) + sum(
+        is_workday[(start_ord + i) % 7] for i in range(extra_days)
+    )
 
-        if overlap_start < overlap_end:
-            total_minutes += (overlap_end - overlap_start).total_seconds() / 60
+    last_day = end_local.replace(hour=0, minute=0, second=0, microsecond=0)
+    return (
+        _business_overlap_minutes(start_local, None, start_hour, end_hour, workdays)
+        + full_workdays * max(end_hour - start_hour, 0) * 60
+        + _business_overlap_minutes(last_day, end_local, start_hour, end_hour, workdays)
+    )
 
-        # Move to next day
-        next_day = current.replace(hour=0, minute=0, second=0) + timedelta(days=1)
-        current = next_day
 
-    return total_minutes
+# Call detection patterns, compiled once at import rather than per ticket.
+
+# Patterns indicating a call was set up or requested
+_SETUP_RE = re.compile(
+    r'quick call|set ?up a call|scheduled? (?:a )?call|'
+    r'let.*s call|call to discuss|join.*(?:call|zoom|meeting)|'
+    r'meeting invitation|(?:video|phone) call|can.*call|available for.*call|'
+    r'connect (?:in|on)',
+    re.IGNORECASE
+)
+
+# Patterns indicating a call actually happened (with capture for evidence)
+_HAPPENED_RE = re.compile(
+    r'((?:we |our )?(?:call|meeting) (?:closed|ended|finished)|'
+    r'we closed our call|after (?:the|our) (?:call|meeting)|'
+    r'meeting notes|following (?:the|our) (?:call|meeting)|'
+    r'spoke (?:on|with|to|about)|talked (?:on|with|to)|'
+    r'on (?:the|our) call|during (?:the|our) call|state after.*call)',
+    re.IGNORECASE
+)
+
+# Meeting link patterns with platform detection
+_ZOOM_RE = re.compile(r'(zoom\.us/[jm]/\d+)', re.IGNORECASE)
+_TEAMS_RE = re.compile(r'(teams\.microsoft\.com[^\s]*)', re.IGNORECASE)
+_MEET_RE = re.compile(r'(meet\.google\.com[^\s]*)', re.IGNORECASE)
+
+# Duration patterns (e.g., "4.5-hour call", "2.5 hours", "45 minute call")
+_DURATION_RE = re.compile(
+    r'(\d+(?:\.\d+)?)\s*[-.]?\s*hours?\s*(?:call|meeting)|'
+    r'(\d+(?:\.\d+)?)\s*[-.]?\s*minutes?\s*(?:call|meeting)|'
+    r'(?:call|meeting)\s*(?:lasted|took|was)\s*(?:about\s*)?(\d+(?:\.\d+)?)\s*hours?|'
+    r'(?:call|meeting)\s*(?:lasted|took|was)\s*(?:about\s*)?(\d+)\s*minutes?',
+    re.IGNORECASE
+)
+
+# False positive patterns to exclude
+_EXCLUDE_RE = re.compile(
+    r'callback|recall|localhost|api\.call|function.?call|method.?call|system.?call',
+    re.IGNORECASE
+)
+
+# Every setup, happened, link and duration pattern above contains one of these
+# words, so a thread without any of them can't count toward a call. Keep in step
+# with the patterns; test_detect_calls_hint_covers_patterns has a sample of each.
+_CALL_HINT_RE = re.compile(r'call|meet|zoom|spoke|talked|connect|teams\.microsoft', re.IGNORECASE)
 
 
 def detect_calls(comments: list) -> dict:
@@ -162,45 +245,6 @@ def detect_calls(comments: list) -> dict:
         - evidence: list - evidence phrases found for confirmed calls
         - link_details: list - dict with platform and link for likely calls
     """
-    # Patterns indicating a call was set up or requested
-    setup_patterns = re.compile(
-        r'quick call|setup a call|set up a call|schedule[d]? (?:a )?call|'
-        r'let.*s call|call to discuss|join.*(?:the |this )?(?:call|zoom|meeting)|'
-        r'meeting invitation|video call|phone call|can.*call|available for.*call|'
-        r'connect (?:in|on)',
-        re.IGNORECASE
-    )
-
-    # Patterns indicating a call actually happened (with capture for evidence)
-    happened_patterns = re.compile(
-        r'((?:we |our )?(?:call|meeting) (?:closed|ended|finished)|'
-        r'we closed our call|after (?:the|our) (?:call|meeting)|'
-        r'meeting notes|following (?:the|our) (?:call|meeting)|'
-        r'spoke (?:on|with|to|about)|talked (?:on|with|to)|'
-        r'on (?:the|our) call|during (?:the|our) call|state after.*call)',
-        re.IGNORECASE
-    )
-
-    # Meeting link patterns with platform detection
-    zoom_pattern = re.compile(r'(zoom\.us/[jm]/\d+)', re.IGNORECASE)
-    teams_pattern = re.compile(r'(teams\.microsoft\.com[^\s]*)', re.IGNORECASE)
-    meet_pattern = re.compile(r'(meet\.google\.com[^\s]*)', re.IGNORECASE)
-
-    # Duration patterns (e.g., "4.5-hour call", "2.5 hours", "45 minute call")
-    duration_pattern = re.compile(
-        r'(\d+(?:\.\d+)?)\s*[-.]?\s*hours?\s*(?:call|meeting)|'
-        r'(\d+(?:\.\d+)?)\s*[-.]?\s*minutes?\s*(?:call|meeting)|'
-        r'(?:call|meeting)\s*(?:lasted|took|was)\s*(?:about\s*)?(\d+(?:\.\d+)?)\s*hours?|'
-        r'(?:call|meeting)\s*(?:lasted|took|was)\s*(?:about\s*)?(\d+)\s*minutes?',
-        re.IGNORECASE
-    )
-
-    # False positive patterns to exclude
-    exclude_patterns = re.compile(
-        r'callback|recall|localhost|api\.call|function.?call|method.?call|system.?call',
-        re.IGNORECASE
-    )
-
     setup_count = 0
     happened_count = 0
     links = set()
@@ -209,18 +253,24 @@ def detect_calls(comments: list) -> dict:
     call_dates = []  # Dates when call evidence was found
     call_durations = []  # Durations mentioned (in minutes)
 
-    for comment in comments:
-        body = comment.get("plain_body") or comment.get("body") or ""
-        comment_date = (comment.get("created_at") or "")[:10]  # YYYY-MM-DD
+    bodies = [comment.get("plain_body") or comment.get("body") or "" for comment in comments]
+    # One scan over the whole thread skips the per-comment passes when no
+    # comment mentions anything call related
+    if not _CALL_HINT_RE.search("\n".join(bodies)):
+        bodies = []
 
-        if exclude_patterns.search(body):
+    for comment, body in zip(comments, bodies):
+        # Comments without any call keyword can't match the patterns below
+        if not _CALL_HINT_RE.search(body) or _EXCLUDE_RE.search(body):
             continue
 
-        if setup_patterns.search(body):
+        comment_date = (comment.get("created_at") or "")[:10]  # YYYY-MM-DD
+
+        if _SETUP_RE.search(body):
             setup_count += 1
 
         # Capture call durations
-        dur_matches = duration_pattern.findall(body)
+        dur_matches = _DURATION_RE.findall(body)
         for dur_match in dur_matches:
             # Groups: (hours, minutes, hours_alt, minutes_alt)
             hours = dur_match[0] or dur_match[2]
@@ -231,7 +281,7 @@ def detect_calls(comments: list) -> dict:
                 call_durations.append(float(minutes))
 
         # Capture evidence phrases
-        happened_matches = happened_patterns.findall(body)
+        happened_matches = _HAPPENED_RE.findall(body)
         if happened_matches:
             happened_count += len(happened_matches)
             evidence_phrases.extend(happened_matches)
@@ -239,14 +289,14 @@ def detect_calls(comments: list) -> dict:
                 call_dates.append(comment_date)
 
         # Capture links with platform info
-        for match in zoom_pattern.findall(body):
+        for match in _ZOOM_RE.findall(body):
             links.add(match)
             link_details.append({"platform": "Zoom", "link": match, "date": comment_date})
-        for match in teams_pattern.findall(body):
+        for match in _TEAMS_RE.findall(body):
             link = match.split()[0]  # Take just the URL part
             links.add(link)
             link_details.append({"platform": "Teams", "link": link, "date": comment_date})
-        for match in meet_pattern.findall(body):
+        for match in _MEET_RE.findall(body):
             link = match.split()[0]
             links.add(link)
             link_details.append({"platform": "Meet", "link": link, "date": comment_date})
@@ -292,63 +342,207 @@ def detect_calls(comments: list) -> dict:
 
 
 
-def fetch_ticket_metrics(ticket_ids: list[int], base_dir: Path, skill_dir: Path) -> dict[int, dict]:
+# Threads used to read ticket details files (I/O bound); each may be one file
+# ahead of the analysis loop, so this also bounds the parsed files held at once
+DETAILS_READ_WORKERS = 32
+
+# users/show_many accepts at most 100 IDs per request
+SHOW_MANY_LIMIT = 100
+
+
+async def _fetch_user_emails(user_ids: list[int]) -> dict[int, str]:
+    """Fetch emails for users via the show_many endpoint, 100 IDs per request.
+
+    Each user found is saved like `zd-cli user` output, so later runs find it
+    with index_user_emails instead of fetching it again.
+
+    Args:
+        user_ids: User IDs to look up
+
+    Returns:
+        Dict mapping user_id -> email for the users that were found
+    """
+    client = get_client()
+    chunks = [user_ids[i:i + SHOW_MANY_LIMIT] for i in range(0, len(user_ids), SHOW_MANY_LIMIT)]
+    try:
+        responses = await asyncio.gather(
+            *(client.get("users/show_many.json", params={"ids": ",".join(map(str, chunk))}) for chunk in chunks),
+            return_exceptions=True,
+        )
+    finally:
+        await close_client()
+        reset_client()  # Bound to this event loop, as in _fetch_ticket_metrics
+
+    suggested = get_queries_for_tool("user")
+    emails = {}
+    for response in responses:
+        if isinstance(response, Exception):
+            print(f"Warning: Failed to fetch users: {response}", file=sys.stderr)
+            continue
+        for user in response.get("users", []):
+            emails[user["id"]] = user.get("email", "")
+            save_response("user", {"user_id": str(user["id"])}, {"user": user}, suggested)
+    return emails
+
+
+def read_ahead(paths: list[Path | None], workers: int) -> Iterator[dict | None]:
+    """Parse JSON files on a thread pool, yielding them in order.
+
+    Only a window of 2 * workers files is read ahead of the consumer, so
+    memory holds a bounded number of documents rather than all of them.
+
+    Args:
+        paths: Files to read; None entries yield None
+        workers: Thread pool size
+
+    Yields:
+        Parsed contents of each file, or None for a None path
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        window: deque[Future | None] = deque()
+        for path in paths:
+            window.append(pool.submit(jsonio.load_file, path) if path else None)
+            if len(window) > 2 * workers:
+                future = window.popleft()
+                yield future.result() if future else None
+        while window:
+            future = window.popleft()
+            yield future.result() if future else None
+
+
+def index_ticket_files(base_dir: Path) -> dict[str, dict[str, Path]]:
+    """Find saved ticket details and metrics files with a single scan.
+
+    Args:
+        base_dir: Storage directory holding one subdirectory per ticket
+
+    Returns:
+        Dict mapping ticket ID (directory name) -> {"details": path, "metrics": path},
+        with only the kinds that exist; the first file of each kind wins
+    """
+    index: dict[str, dict[str, Path]] = defaultdict(dict)
+    for path in base_dir.glob("*/ticket_*.json"):
+        if path.name.startswith("ticket_details_"):
+            index[path.parent.name].setdefault("details", path)
+        elif path.name.startswith("ticket_metrics_"):
+            index[path.parent.name].setdefault("metrics", path)
+    return index
+
+
+def index_user_emails(base_dir: Path) -> dict[int, str]:
+    """Map user ID -> email from the user files saved under base_dir.
+
+    Saved user files are named user_{hash}_{timestamp}.json, so the ID is
+    read from each file's contents rather than its name.
+
+    Args:
+        base_dir: Storage directory to search recursively
+
+    Returns:
+        Dict mapping user_id -> email; the first file found for a user wins
+    """
+    emails: dict[int, str] = {}
+    for path in base_dir.glob("**/user_*.json"):
+        try:
+            user = jsonio.load_file(path).get("data", {}).get("user", {})
+        except (OSError, ValueError, AttributeError):
+            continue  # Unreadable or not a saved user response
+        if user.get("id") is not None:
+            emails.setdefault(user["id"], user.get("email", ""))
+    return emails
+
+
+def summarize_metric(tid: int, metric: dict) -> dict:
+    """Reduce a ticket_metric API object to the fields the analysis uses."""
+    # Zendesk returns each time metric as a {"calendar", "business"} object or null
+    reply_time = metric.get("reply_time_in_minutes") or {}
+    resolution_time = metric.get("full_resolution_time_in_minutes") or {}
+    return {
+        "ticket_id": tid,
+        "replies": metric.get("replies", 0),
+        "frt_calendar": reply_time.get("calendar"),
+        "frt_business": reply_time.get("business"),
+        "resolution_calendar": resolution_time.get("calendar"),
+        "resolution_business": resolution_time.get("business"),
+        "reopens": metric.get("reopens", 0),
+    }
+
+
+async def _fetch_ticket_metrics(ticket_ids: list[int]) -> dict[int, dict]:
+    """Fetch metrics for tickets concurrently, saving each response like `zd-cli ticket-metrics`.
+
+    The shared client caps requests in flight (ZENDESK_MAX_CONCURRENCY).
+
+    Args:
+        ticket_ids: Ticket IDs to fetch metrics for
+
+    Returns:
+        Dict mapping ticket_id -> raw ticket_metric object for the tickets that were fetched
+    """
+    client = get_client()
+    try:
+        responses = await asyncio.gather(
+            *(client.get(f"tickets/{tid}/metrics.json") for tid in ticket_ids),
+            return_exceptions=True,
+        )
+    finally:
+        await close_client()
+        # The client's request semaphore is now bound to this event loop;
+        # the user lookup runs in a new one and needs a fresh client
+        reset_client()
+
+    suggested = get_queries_for_tool("ticket_metrics")
+    metrics = {}
+    for tid, response in zip(ticket_ids, responses):
+        if isinstance(response, Exception):
+            print(f"Warning: Failed to fetch metrics for ticket {tid}: {response}", file=sys.stderr)
+            continue
+        save_response("ticket_metrics", {"ticket_id": str(tid)}, response, suggested, ticket_id=str(tid))
+        metrics[tid] = response.get("ticket_metric") or {}
+    return metrics
+
+
+def fetch_ticket_metrics(
+    ticket_ids: list[int],
+    base_dir: Path,
+    ticket_files: dict[str, dict[str, Path]] | None = None,
+) -> dict[int, dict]:
     """Fetch ticket metrics for all tickets to get accurate reply counts and FRT.
 
+    Metrics already saved locally are reused; the rest are fetched from the
+    API concurrently and saved for later runs.
+
     Args:
         ticket_ids: List of ticket IDs to fetch metrics for
         base_dir: Directory where metrics will be saved
-        skill_dir: Path to zendesk-skill directory (for running uv commands)
+        ticket_files: Index from index_ticket_files (built from base_dir if omitted)
 
     Returns:
         Dict mapping ticket_id -> metrics dict
     """
+    if ticket_files is None:
+        ticket_files = index_ticket_files(base_dir)
     all_metrics = {}
-    total = len(ticket_ids)
-
-    for i, tid in enumerate(ticket_ids):
-        if i % 20 == 0:
-            print(f"Fetching metrics: {i}/{total}...")
+    missing = []
 
+    for tid in ticket_ids:
         # Check if already fetched
-        ticket_dir = base_dir / str(tid)
-        existing_metrics = list(ticket_dir.glob("ticket_metrics_*.json")) if ticket_dir.exists() else []
+        existing_metrics = ticket_files.get(str(tid), {}).get("metrics")
         if existing_metrics:
-            with open(existing_metrics[0]) as f:
-                data = json.load(f)
-                metric = data.get("data", {}).get("ticket_metric", {})
-                all_metrics[tid] = {
-                    "ticket_id": tid,
-                    "replies": metric.get("replies", 0),
-                    "frt_calendar": metric.get("reply_time_in_minutes", {}).get("calendar"),
-                    "frt_business": metric.get("reply_time_in_minutes", {}).get("business"),
-                    "resolution_calendar": metric.get("full_resolution_time_in_minutes", {}).get("calendar"),
-                    "resolution_business": metric.get("full_resolution_time_in_minutes", {}).get("business"),
-                    "reopens": metric.get("reopens", 0),
-                }
-            continue
-
-        # Fetch from API
-        result = subprocess.run(
-            ["uv", "run", "zd-cli", "ticket-metrics", str(tid)],
-            capture_output=True, text=True, cwd=str(skill_dir)
-        )
-        if result.returncode == 0:
-            try:
-                # The CLI saves to file, but we parse stdout for consistency
-                output = json.loads(result.stdout)
-                metric = output.get("data", {}).get("ticket_metric", {})
-                all_metrics[tid] = {
-                    "ticket_id": tid,
-                    "replies": metric.get("replies", 0),
-                    "frt_calendar": metric.get("reply_time_in_minutes", {}).get("calendar"),
-                    "frt_business": metric.get("reply_time_in_minutes", {}).get("business"),
-                    "resolution_calendar": metric.get("full_resolution_time_in_minutes", {}).get("calendar"),
-                    "resolution_business": metric.get("full_resolution_time_in_minutes", {}).get("business"),
-                    "reopens": metric.get("reopens", 0),
-                }
-            except json.JSONDecodeError:
-                print(f"Warning: Failed to parse metrics for ticket {tid}", file=sys.stderr)
+            data = jsonio.load_file(existing_metrics)
+            all_metrics[tid] = summarize_metric(tid, data.get("data", {}).get("ticket_metric", {}))
+        else:
+            missing.append(tid)
+
+    if missing:
+        print(f"Fetching metrics for {len(missing)} tickets from the API...")
+        try:
+            fetched = asyncio.run(_fetch_ticket_metrics(missing))
+        except ZendeskClientError as e:
+            print(f"Warning: Could not fetch metrics for {len(missing)} tickets: {e}", file=sys.stderr)
+        else:
+            for tid, metric in fetched.items():
+                all_metrics[tid] = summarize_metric(tid, metric)
 
     print(f"Fetched metrics for {len(all_metrics)} tickets")
     return all_metrics
@@ -445,21 +639,22 @@ def calculate_frt_by_priority(
             results[cat_name] = {"count": 0}
             continue
 
-        frt_list = [d["frt"] for d in cat_data if d["frt"] is not None]
+        frt_list = sorted(d["frt"] for d in cat_data if d["frt"] is not None)
         if not frt_list:
             results[cat_name] = {"count": len(cat_data)}
             continue
 
+        # Sorted once: min/max are the ends, threshold counts are bisections
         results[cat_name] = {
             "count": len(cat_data),
             "avg_mins": mean(frt_list),
             "median_mins": median(frt_list),
-            "min_mins": min(frt_list),
-            "max_mins": max(frt_list),
-            "under_30m": sum(1 for f in frt_list if f <= 30),
-            "under_1h": sum(1 for f in frt_list if f <= 60),
-            "under_4h": sum(1 for f in frt_list if f <= 240),
-            "under_8h": sum(1 for f in frt_list if f <= 480),
+            "min_mins": frt_list[0],
+            "max_mins": frt_list[-1],
+            "under_30m": bisect_right(frt_list, 30),
+            "under_1h": bisect_right(frt_list, 60),
+            "under_4h": bisect_right(frt_list, 240),
+            "under_8h": bisect_right(frt_list, 480),
         }
 
     return results
@@ -491,11 +686,10 @@ def main():
     if args.search_file:
         search_file = Path(args.search_file)
     else:
-        search_files = list(base_dir.glob("search_*.json"))
-        if not search_files:
+        search_file = max(base_dir.glob("search_*.json"), key=lambda f: f.stat().st_mtime, default=None)
+        if search_file is None:
             print("No search results found")
             raise SystemExit(1)
-        search_file = max(search_files, key=lambda f: f.stat().st_mtime)
 
     output_dir = Path(args.output) if args.output else base_dir
 
@@ -526,6 +720,8 @@ def main():
     else:
         tz = ZoneInfo("UTC")
 
+    bh_mask = business_hours_mask(bh_settings) if track_business_hours else 0
+
     # Make period dates timezone-aware for comment filtering
     period_start = start_date.replace(tzinfo=tz)
     period_end = (end_date + timedelta(days=1)).replace(tzinfo=tz)  # End of end_date (inclusive)
@@ -539,21 +735,20 @@ def main():
     print(f"Using search file: {search_file}")
     print(f"Period: {period_info['start_date']} – {period_info['end_date']} ({period_info['days']} days)")
 
-    with open(search_file) as f:
-        search_data = json.load(f)
-
-    tickets = search_data.get("data", {}).get("results", [])
+    # Only the results list is kept; the rest of the document is freed right away
+    tickets = jsonio.load_file(search_file).get("data", {}).get("results", [])
     print(f"Found {len(tickets)} tickets in search results")
 
-    # Skill directory for running uv commands
-    skill_dir = Path(__file__).parent.parent.parent.parent
+    # Saved details/metrics files per ticket, found in one directory scan
+    ticket_files = index_ticket_files(base_dir)
 
     # Fetch metrics for all tickets if requested (enables accurate reply counts)
     all_metrics = {}
     if args.fetch_metrics:
         print("\nFetching ticket metrics for accurate reply counts...")
         ticket_ids = [t.get("id") for t in tickets if t.get("id")]
-        all_metrics = fetch_ticket_metrics(ticket_ids, base_dir, skill_dir)
+        all_metrics = fetch_ticket_metrics(ticket_ids, base_dir, ticket_files)
+        ticket_files = index_ticket_files(base_dir)  # Pick up newly saved metrics files
 
     # Filter to tickets with replies (unless --include-untouched)
     if not args.include_untouched:
@@ -568,23 +763,13 @@ def main():
             filtered = []
             for t in tickets:
                 tid = t.get("id")
-                ticket_dir = base_dir / str(tid)
-                metrics_files = list(ticket_dir.glob("ticket_metrics_*.json")) if ticket_dir.exists() else []
-                if metrics_files:
-                    with open(metrics_files[0]) as f:
-                        data = json.load(f)
-                        replies = data.get("data", {}).get("ticket_metric", {}).get("replies", 0)
-                        if replies > 0:
-                            filtered.append(t)
-                            all_metrics[tid] = {
-                                "ticket_id": tid,
-                                "replies": replies,
-                                "frt_calendar": data.get("data", {}).get("ticket_metric", {}).get("reply_time_in_minutes", {}).get("calendar"),
-                                "frt_business": data.get("data", {}).get("ticket_metric", {}).get("reply_time_in_minutes", {}).get("business"),
-                                "resolution_calendar": data.get("data", {}).get("ticket_metric", {}).get("full_resolution_time_in_minutes", {}).get("calendar"),
-                                "resolution_business": data.get("data", {}).get("ticket_metric", {}).get("full_resolution_time_in_minutes", {}).get("business"),
-                                "reopens": data.get("data", {}).get("ticket_metric", {}).get("reopens", 0),
-                            }
+                metrics_path = ticket_files.get(str(tid), {}).get("metrics")
+                if metrics_path:
+                    data = jsonio.load_file(metrics_path)
+                    metric = summarize_metric(tid, data.get("data", {}).get("ticket_metric", {}))
+                    if metric["replies"] > 0:
+                        filtered.append(t)
+                        all_metrics[tid] = metric
                 else:
                     # If no metrics, include ticket (can't verify reply count)
                     filtered.append(t)
@@ -597,30 +782,37 @@ def main():
     requester_ids = set(t.get("requester_id") for t in tickets if t.get("requester_id"))
     print(f"Unique requesters: {len(requester_ids)}")
 
+    # Emails from saved user files, indexed once; only the rest are fetched
+    saved_emails = index_user_emails(base_dir)
     user_emails = {}
+    missing = []
     for rid in requester_ids:
-        user_files = list(base_dir.glob(f"**/user_*{rid}*.json"))
-        if user_files:
-            with open(user_files[0]) as f:
-                user_data = json.load(f)
-                user_emails[rid] = user_data.get("data", {}).get("user", {}).get("email", "")
+        if rid in saved_emails:
+            user_emails[rid] = saved_emails[rid]
         else:
-            result = subprocess.run(
-                ["uv", "run", "zd-cli", "user", str(rid)],
-                capture_output=True, text=True,
-                cwd=str(Path(__file__).parent.parent.parent.parent)
-            )
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                user_emails[rid] = data.get("email", "")
+            missing.append(rid)
+
+    if missing:
+        try:
+            user_emails.update(asyncio.run(_fetch_user_emails(missing)))
+        except ZendeskClientError as e:
+            print(f"Warning: Could not fetch {len(missing)} users: {e}", file=sys.stderr)
 
     print(f"Resolved {len(user_emails)} user emails")
 
+    # Read the ticket details files concurrently, a bounded window ahead of the
+    # analysis loop below, which stays sequential
+    details_docs = read_ahead(
+        [ticket_files.get(str(t.get("id")), {}).get("details") for t in tickets],
+        DETAILS_READ_WORKERS,
+    )
+
     # Analyze tickets
     ticket_analysis = []
     customer_stats = defaultdict(lambda: {"tickets": 0, "messages": 0, "replies": 0, "calls": 0, "ticket_ids": []})
-    status_counts = defaultdict(int)
-    priority_counts = defaultdict(int)
+    # Counted in one pass each (Counter counts iterables in C) rather than per ticket below
+    status_counts = Counter(ticket.get("status", "unknown") for ticket in tickets)
+    priority_counts = Counter(ticket.get("priority", "normal") for ticket in tickets)
     frt_values = []
     resolution_values = []
     reopen_count = 0
@@ -634,15 +826,25 @@ def main():
     customer_msgs_outside_hours = 0
     support_replies_outside_hours = 0
     oncall_engagements = []
-
-    for ticket in tickets:
+    track_oncall = bool(track_business_hours and oncall_settings and oncall_settings.get("enabled"))
+    if track_oncall:
+        oncall_priorities = oncall_settings.get("priorities", ["urgent"])
+        oncall_customers = oncall_settings.get("customers", [])
+
+    # Report totals, accumulated per ticket so no pass over ticket_analysis is needed
+    total_messages = 0
+    total_replies = 0  # Agent replies from comments in period
+    tickets_with_calls = 0
+    total_calls_confirmed = 0
+    total_calls_likely = 0
+    total_calls_estimated = 0
+
+    for ticket, details in zip(tickets, details_docs):
         tid = ticket.get("id")
         rid = ticket.get("requester_id")
         status = ticket.get("status", "unknown")
         priority = ticket.get("priority", "normal")
-
-        status_counts[status] += 1
-        priority_counts[priority] += 1
+        subject = ticket.get("subject", "")[:40]
 
         # Classify as new (created in period) or existing (created before period)
         created_at = parse_timestamp(ticket.get("created_at"), tz)
@@ -655,20 +857,12 @@ def main():
         # Check if ticket created outside business hours (only for new tickets)
         ticket_outside_hours = False
         if track_business_hours and created_at and is_new_ticket:
-            ticket_outside_hours = not is_business_hours(created_at, bh_settings, tz)
+            ticket_outside_hours = not is_business_hours(created_at, bh_mask)
 
         # Find ticket details file
-        ticket_dir = base_dir / str(tid)
-        details_file = None
-        metrics_file = None
-
-        if ticket_dir.exists():
-            for f in ticket_dir.glob("ticket_details_*.json"):
-                details_file = f
-                break
-            for f in ticket_dir.glob("ticket_metrics_*.json"):
-                metrics_file = f
-                break
+        files = ticket_files.get(str(tid), {})
+        details_file = files.get("details")
+        metrics_file = files.get("metrics")
 
         # Analyze comments
         msg_count = 0
@@ -680,42 +874,42 @@ def main():
         ticket_support_replies_ooh = 0
 
         if details_file:
-            with open(details_file) as f:
-                details = json.load(f)
             all_comments = details.get("data", {}).get("comments", [])
 
-            # Filter comments to only those within the reporting period
+            # Filter comments to only those within the reporting period,
+            # keeping the parsed times for the business hours pass below
             comments = []
+            comment_times = []
             for c in all_comments:
                 c_time = parse_timestamp(c.get("created_at"), tz)
                 if c_time and period_start <= c_time < period_end:
                     comments.append(c)
+                    comment_times.append(c_time)
 
             msg_count = len(comments)
-            public_count = sum(1 for c in comments if c.get("public", True))
-            private_count = msg_count - public_count
-            # Count agent replies: public comments not from the requester
-            agent_reply_count = sum(
-                1 for c in comments
-                if c.get("public", True) and c.get("author_id") != rid
-            )
             call_info = detect_calls(comments)
 
-            # Analyze each comment for business hours (only if configured)
-            if track_business_hours:
-                for comment in comments:
-                    comment_time = parse_timestamp(comment.get("created_at"), tz)
-                    is_public = comment.get("public", True)
-                    author_id = comment.get("author_id")
-
-                    if comment_time and not is_business_hours(comment_time, bh_settings, tz):
-                        # Check if customer (requester) or support
-                        if author_id == rid:
-                            ticket_customer_msgs_ooh += 1
-                            customer_msgs_outside_hours += 1
-                        elif is_public:  # Support reply (public, not from requester)
-                            ticket_support_replies_ooh += 1
-                            support_replies_outside_hours += 1
+            # Classify each comment once: public/private, agent reply (public,
+            # not from the requester) and, if configured, outside business hours.
+            # comment_times are already localized to tz by parse_timestamp.
+            for comment, comment_time in zip(comments, comment_times):
+                is_requester = comment.get("author_id") == rid
+                is_public = comment.get("public", True)
+                if is_public:
+                    public_count += 1
+                    if not is_requester:
+                        agent_reply_count += 1
+
+                if not track_business_hours or is_business_hours(comment_time, bh_mask):
+                    continue
+                # Check if customer (requester) or support
+                if is_requester:
+                    ticket_customer_msgs_ooh += 1
+                    customer_msgs_outside_hours += 1
+                elif is_public:  # Support reply (public, not from requester)
+                    ticket_support_replies_ooh += 1
+                    support_replies_outside_hours += 1
+            private_count = msg_count - public_count
 
         # Calculate FRT from comments for new tickets
         frt_calendar = None
@@ -726,14 +920,20 @@ def main():
         replies = 0
 
         if is_new_ticket and details_file and created_at:
-            # Find first public agent reply from ALL comments (not filtered by period)
+            # Find first public agent reply from ALL comments (not filtered by period).
+            # Only the earliest one is needed, so track the minimum in one pass
+            # instead of sorting the whole thread.
             first_agent_reply_time = None
-            for c in sorted(all_comments, key=lambda x: x.get("created_at", "")):
+            first_reply_key = None
+            for c in all_comments:
                 if c.get("public", True) and c.get("author_id") != rid:
-                    reply_time = parse_timestamp(c.get("created_at"), tz)
+                    c_created = c.get("created_at", "")
+                    if first_reply_key is not None and c_created >= first_reply_key:
+                        continue
+                    reply_time = parse_timestamp(c_created, tz)
                     if reply_time and reply_time > created_at:
+                        first_reply_key = c_created
                         first_agent_reply_time = reply_time
-                        break
 
             if first_agent_reply_time:
                 # Calendar FRT = wall clock difference in minutes
@@ -747,30 +947,19 @@ def main():
 
         # Fallback to metrics API if available and no comment-based FRT
         if frt_calendar is None:
-            if tid in all_metrics:
-                metric = all_metrics[tid]
-                frt_calendar = metric.get("frt_calendar")
-                frt_business = metric.get("frt_business")
-                resolution = metric.get("resolution_calendar")
-                reopens = metric.get("reopens", 0)
-                replies = metric.get("replies", 0)
-            elif metrics_file:
-                with open(metrics_file) as f:
-                    metrics_data = json.load(f)
-                metric = metrics_data.get("data", {}).get("ticket_metric", {})
-                frt_calendar = metric.get("reply_time_in_minutes", {}).get("calendar")
-                frt_business = metric.get("reply_time_in_minutes", {}).get("business")
-                resolution = metric.get("full_resolution_time_in_minutes", {}).get("calendar")
-                reopens = metric.get("reopens", 0)
-                replies = metric.get("replies", 0)
-
-        # Determine FRT based on on-call status
-        oncall_priorities_list = oncall_settings.get("priorities", ["urgent"]) if oncall_settings else ["urgent"]
-        oncall_customers_list = oncall_settings.get("customers", []) if oncall_settings else []
-
-        priority_match = priority in oncall_priorities_list
-        # Customer is set below, so we'll calculate FRT after customer is resolved
-        # For now, store both values
+            metric = all_metrics.get(tid)
+            if metric is None and metrics_file:
+                metrics_data = jsonio.load_file(metrics_file)
+                metric = summarize_metric(tid, metrics_data.get("data", {}).get("ticket_metric", {}))
+            if metric is not None:
+                frt_calendar = metric["frt_calendar"]
+                frt_business = metric["frt_business"]
+                resolution = metric["resolution_calendar"]
+                reopens = metric["reopens"]
+                replies = metric["replies"]
+
+        # FRT time basis depends on on-call status, which needs the customer;
+        # calculate_frt_by_priority picks it after the loop. For now, store both values
         frt = frt_calendar  # Will be recalculated later with proper time basis
 
         if frt_calendar is not None:
@@ -787,7 +976,7 @@ def main():
         ticket_analysis.append({
             "ticket_id": tid,
             "requester_id": rid,
-            "subject": ticket.get("subject", "")[:40],
+            "subject": subject,
             "status": status,
             "priority": priority,
             "messages": msg_count,
@@ -812,17 +1001,14 @@ def main():
         if track_business_hours and ticket_outside_hours:
             tickets_outside_hours.append({
                 "ticket_id": tid,
-                "subject": ticket.get("subject", "")[:40],
+                "subject": subject,
                 "created_at": ticket.get("created_at"),
                 "priority": priority,
                 "customer": customer,
             })
 
         # Check for on-call engagement (only if configured and enabled)
-        if track_business_hours and oncall_settings and oncall_settings.get("enabled"):
-            oncall_priorities = oncall_settings.get("priorities", ["urgent"])
-            oncall_customers = oncall_settings.get("customers", [])
-
+        if track_oncall:
             # Check if priority matches
             priority_match = priority in oncall_priorities
             # Empty customers = all customers; otherwise check if in list
@@ -831,7 +1017,7 @@ def main():
             if priority_match and customer_match and is_oncall_hours(created_at, oncall_settings, tz, workdays) and is_new_ticket:
                 oncall_engagements.append({
                     "ticket_id": tid,
-                    "subject": ticket.get("subject", "")[:40],
+                    "subject": subject,
                     "created_at": ticket.get("created_at"),
                     "created_at_local": created_at.strftime("%Y-%m-%d %H:%M %Z") if created_at else None,
                     "customer": customer,
@@ -839,20 +1025,30 @@ def main():
                 })
 
         # Customer stats
-        customer_stats[customer]["tickets"] += 1
-        customer_stats[customer]["messages"] += msg_count
-        customer_stats[customer]["replies"] += agent_reply_count
-        customer_stats[customer]["ticket_ids"].append(tid)
-        customer_stats[customer]["calls"] += call_info["total_estimated"]
+        stats = customer_stats[customer]
+        stats["tickets"] += 1
+        stats["messages"] += msg_count
+        stats["replies"] += agent_reply_count
+        stats["ticket_ids"].append(tid)
+        stats["calls"] += call_info["total_estimated"]
+
+        total_messages += msg_count
+        total_replies += agent_reply_count
+        total_calls_confirmed += call_info["confirmed"]
+        total_calls_likely += call_info["likely"]
+        total_calls_estimated += call_info["total_estimated"]
+        if call_info["total_estimated"] > 0:
+            tickets_with_calls += 1
 
     # Calculate FRT stats (overall - using calendar time for backward compatibility)
     frt_stats = {}
     if frt_values:
+        frt_sorted = sorted(frt_values)
         frt_stats = {
             "avg_mins": sum(frt_values) / len(frt_values),
-            "min_mins": min(frt_values),
-            "max_mins": max(frt_values),
-            "median_mins": sorted(frt_values)[len(frt_values) // 2],
+            "min_mins": frt_sorted[0],
+            "max_mins": frt_sorted[-1],
+            "median_mins": frt_sorted[len(frt_sorted) // 2],
             "count": len(frt_values),
         }
 
@@ -872,9 +1068,6 @@ def main():
             "count": len(resolution_values),
         }
 
-    # Calculate total replies from comments (agent replies in period)
-    total_replies = sum(t.get("agent_replies", 0) for t in ticket_analysis)
-
     # Build output (period_info comes from command line args)
     output = {
         "ticket_analysis": ticket_analysis,
@@ -883,12 +1076,12 @@ def main():
             "total_tickets": len(tickets),
             "new_tickets": new_ticket_count,
             "existing_tickets": existing_ticket_count,
-            "total_messages": sum(t["messages"] for t in ticket_analysis),
+            "total_messages": total_messages,
             "total_replies": total_replies,
-            "tickets_with_calls": sum(1 for t in ticket_analysis if t["call_info"]["total_estimated"] > 0),
-            "total_calls_confirmed": sum(t["call_info"]["confirmed"] for t in ticket_analysis),
-            "total_calls_likely": sum(t["call_info"]["likely"] for t in ticket_analysis),
-            "total_calls_estimated": sum(t["call_info"]["total_estimated"] for t in ticket_analysis),
+            "tickets_with_calls": tickets_with_calls,
+            "total_calls_confirmed": total_calls_confirmed,
+            "total_calls_likely": total_calls_likely,
+            "total_calls_estimated": total_calls_estimated,
             "unique_customers": len(customer_stats),
         },
         "period": period_info,
@@ -1093,8 +1286,7 @@ def main():
 
     # Save output
     output_file = output_dir / "support_analysis.json"
-    with open(output_file, "w") as f:
-        json.dump(output, f, indent=2)
+    output_file.write_bytes(jsonio.dumps(output, indent=True))
     print(f"\n\nAnalysis saved to: {output_file}")
 
 
@@ -1,13 +1,14 @@
 """Zendesk MCP Server - Thin wrapper around operations module."""
 
 import json
+from contextlib import asynccontextmanager
 
 from mcp.server.fastmcp import FastMCP
 from pydantic import BaseModel, ConfigDict, Field
 
 from zendesk_skill import operations
-from zendesk_skill.client import ZendeskAuthError, ZendeskAPIError
-from zendesk_skill.queries import execute_jq, get_query
+from zendesk_skill.client import ZendeskAuthError, ZendeskAPIError, close_client
+from zendesk_skill.queries import execute_jq, get_query, precompile_all
 from zendesk_skill.storage import load_response
 from zendesk_skill.utils.security import generate_markers, security_instructions, wrap_external_data, is_security_enabled
 
@@ -17,8 +18,21 @@ from zendesk_skill.utils.security import generate_markers, security_instructions
 _START, _END = generate_markers()
 operations.set_session_markers(_START, _END)
 
+# The server is long-lived, so compile the stored jq queries up front.
+precompile_all()
+
+
+@asynccontextmanager
+async def _lifespan(server: FastMCP):
+    """Close the pooled HTTP connections on shutdown, while the server's loop still runs."""
+    try:
+        yield
+    finally:
+        await close_client()
+
+
 # Initialize the MCP server with security instructions in the system prompt
-mcp = FastMCP("zendesk_skill", instructions=security_instructions(_START, _END))
+mcp = FastMCP("zendesk_skill", instructions=security_instructions(_START, _END), lifespan=_lifespan)
 
 
 # =============================================================================
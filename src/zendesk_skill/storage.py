@@ -5,15 +5,20 @@ import json
 import os
 import tempfile
 import time
+from collections.abc import Sequence
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from zendesk_skill.utils import jsonio
 from zendesk_skill.utils.security import is_security_enabled
 
 # Default storage directory (cross-platform, per-user to avoid conflicts)
 DEFAULT_STORAGE_DIR = Path(tempfile.gettempdir()) / f"zd-cli-{os.getuid()}"
 
+# Directories this process has already created (skips a mkdir per save)
+_known_dirs: set[Path] = set()
+
 
 def _get_storage_dir(ticket_id: str | None = None) -> Path:
     """Get and ensure storage directory exists.
@@ -28,7 +33,9 @@ def _get_storage_dir(ticket_id: str | None = None) -> Path:
         storage_dir = DEFAULT_STORAGE_DIR / str(ticket_id)
     else:
         storage_dir = DEFAULT_STORAGE_DIR
-    storage_dir.mkdir(parents=True, exist_ok=True)
+    if storage_dir not in _known_dirs:
+        storage_dir.mkdir(parents=True, exist_ok=True)
+        _known_dirs.add(storage_dir)
     return storage_dir
 
 
@@ -250,7 +257,7 @@ def save_response(
     tool_name: str,
     params: dict[str, Any],
     data: Any,
-    suggested_queries: list[dict[str, str]] | None = None,
+    suggested_queries: Sequence[dict[str, str]] | None = None,
     output_path: str | None = None,
     ticket_id: str | None = None,
 ) -> tuple[str, dict[str, Any]]:
@@ -299,8 +306,13 @@ def save_response(
         stored_data["metadata"]["security_detections"] = detections
 
     # Write to file
-    with open(file_path, "w") as f:
-        json.dump(stored_data, f, indent=2, default=str)
+    content = jsonio.dumps(stored_data, indent=True)
+    try:
+        file_path.write_bytes(content)
+    except FileNotFoundError:
+        # Directory removed since it was created (e.g. temp cleanup); recreate once
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_bytes(content)
 
     return str(file_path), stored_data
 
@@ -318,8 +330,7 @@ def load_response(file_path: str) -> dict[str, Any]:
         FileNotFoundError: If file doesn't exist
         json.JSONDecodeError: If file is not valid JSON
     """
-    with open(file_path) as f:
-        return json.load(f)
+    return jsonio.load_file(file_path)
 
 
 def format_save_result(file_path: str, stored_data: dict[str, Any]) -> str:
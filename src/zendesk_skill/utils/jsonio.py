@@ -0,0 +1,57 @@
+"""JSON encoding helpers that use orjson when it is installed."""
+
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Optional speedup (pip install zd-cli[fast]); stdlib json otherwise
+    orjson = None
+
+# Below this size a plain read is cheaper than setting up a mapping
+MMAP_THRESHOLD = 1024 * 1024
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 encoded JSON.
+
+    Values JSON can't represent are converted with str(), like json.dumps(default=str).
+
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with 2-space indentation
+
+    Returns:
+        JSON document as bytes
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=str, option=option)
+    return json.dumps(
+        obj, indent=2 if indent else None, default=str, ensure_ascii=False
+    ).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse a JSON document from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_file(path: str | Path) -> Any:
+    """Parse a JSON file.
+
+    With orjson, files of MMAP_THRESHOLD bytes or more are parsed straight
+    from a read-only memory map instead of being copied into a bytes object.
+    """
+    with open(path, "rb") as f:
+        if orjson is None or os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            return loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
@@ -107,6 +107,35 @@ def test_storage_save_response():
         Path(output_path).unlink(missing_ok=True)
 
 
+def test_storage_round_trip_without_orjson(monkeypatch, tmp_path):
+    """Test that stored responses round-trip with the stdlib json fallback."""
+    from zendesk_skill.storage import save_response, load_response
+    from zendesk_skill.utils import jsonio
+
+    monkeypatch.setattr(jsonio, "orjson", None)
+    data = {"ticket": {"id": 1, "subject": "Café – naïve"}}
+
+    file_path, _ = save_response(
+        "test_tool", {"ticket_id": "1"}, data, output_path=str(tmp_path / "r.json")
+    )
+
+    assert load_response(file_path)["data"] == data
+
+
+def test_jsonio_load_file_maps_large_files(monkeypatch, tmp_path):
+    """Files over the mmap threshold parse the same as small ones."""
+    from zendesk_skill.utils import jsonio
+
+    monkeypatch.setattr(jsonio, "MMAP_THRESHOLD", 16)
+    path = tmp_path / "big.json"
+    data = {"rows": ["naïve"] * 50}
+    path.write_text(json.dumps(data))
+
+    assert jsonio.load_file(path) == data
+    monkeypatch.setattr(jsonio, "orjson", None)
+    assert jsonio.load_file(path) == data
+
+
 def test_structure_extraction():
     """Test structure extraction from responses."""
     from zendesk_skill.storage import _extract_structure
@@ -144,6 +173,11 @@ def test_queries_for_tool():
     assert "comments_slim" in query_names
     assert "attachments" in query_names
 
+    # Built once and shared: repeated lookups return the same immutable tuple
+    assert isinstance(queries, tuple)
+    assert get_queries_for_tool("ticket_details") is queries
+    assert get_queries_for_tool("no_such_tool") == ()
+
 
 def test_get_named_query():
     """Test getting a specific named query."""
@@ -154,6 +188,305 @@ def test_get_named_query():
     assert query is not None
     assert ".data.comments" in query
 
+    # MCP-style names resolve to the same category; unknown names miss cleanly
+    assert get_query("zendesk_get_ticket_details", "comments_slim") == query
+    assert get_query("ticket_details", "no_such_query") is None
+    assert get_query("no_such_tool", "comments_slim") is None
+
+
+def test_execute_jq_in_process_matches_cli(tmp_path, monkeypatch):
+    """The in-process jq path formats output like the jq CLI fallback."""
+    import shutil
+
+    from zendesk_skill import queries
+
+    if queries.jq is None or shutil.which("jq") is None:
+        pytest.skip("needs both the jq binding and the jq CLI")
+
+    path = tmp_path / "resp.json"
+    path.write_text(json.dumps({"data": {"comments": [
+        {"id": 1, "author_id": 3, "created_at": "t1", "body": "héllo", "public": True, "attachments": []},
+        {"id": 2, "author_id": 4, "created_at": "t2", "body": "x", "public": False, "attachments": []},
+    ]}}))
+    query = queries.get_query("ticket_details", "comments_full")
+
+    in_process = queries.execute_jq(str(path), query)
+    monkeypatch.setattr(queries, "jq", None)
+    via_cli = queries.execute_jq(str(path), query)
+
+    assert in_process == via_cli
+    assert in_process[0] is True
+
+
+def test_execute_jq_reuses_loaded_document(tmp_path):
+    """Repeated queries reuse the cached file until it changes on disk."""
+    import os
+
+    from zendesk_skill import queries
+
+    if queries.jq is None:
+        pytest.skip("needs the jq binding")
+
+    count = queries.get_query("ticket_details", "comment_count")
+    path = tmp_path / "resp.json"
+    path.write_text(json.dumps({"data": {"comments": [{"public": True}]}}))
+    assert json.loads(queries.execute_jq(str(path), count)[1])["total"] == 1
+    cached = len(queries._DOC_CACHE)
+    assert queries.execute_jq(str(path), queries.get_query("ticket_details", "attachments")) == (True, "[]")
+    assert len(queries._DOC_CACHE) == cached
+
+    path.write_text(json.dumps({"data": {"comments": [{"public": True}, {"public": False}]}}))
+    os.utime(path, ns=(0, 1))
+    assert json.loads(queries.execute_jq(str(path), count)[1])["total"] == 2
+
+
+def test_load_bounds_document_cache_bytes(tmp_path, monkeypatch):
+    """The document cache evicts least recently used files to stay under its byte budget."""
+    from collections import OrderedDict
+
+    from zendesk_skill import queries
+
+    monkeypatch.setattr(queries, "_DOC_CACHE", OrderedDict())
+    monkeypatch.setattr(queries, "_doc_cache_bytes", 0)
+    monkeypatch.setattr(queries, "_DOC_CACHE_MAX_BYTES", 100)
+
+    paths = []
+    for name, size in (("a", 40), ("b", 40), ("c", 40), ("big", 150)):
+        path = tmp_path / f"{name}.json"
+        path.write_text(json.dumps({"x": "y" * (size - 9)}))
+        paths.append(str(path))
+    a, b, c, big = paths
+
+    queries._load(a)
+    queries._load(b)
+    queries._load(a)  # b is now least recently used
+    queries._load(c)
+    assert [key[0] for key in queries._DOC_CACHE] == [a, c]
+    assert queries._doc_cache_bytes == Path(a).stat().st_size + Path(c).stat().st_size
+
+    # Too big to cache at all
+    assert queries._load(big) == Path(big).read_text()
+    assert [key[0] for key in queries._DOC_CACHE] == [a, c]
+
+
+def test_execute_jq_runs_custom_queries_with_timeout(tmp_path, monkeypatch):
+    """Custom queries go through the jq CLI, so a runaway query is killed."""
+    import shutil
+
+    from zendesk_skill import queries
+
+    if shutil.which("jq") is None:
+        pytest.skip("needs the jq CLI")
+
+    path = tmp_path / "resp.json"
+    path.write_text(json.dumps({"data": {}}))
+    monkeypatch.setattr(queries, "_compile", lambda *a: pytest.fail("custom query ran in-process"))
+
+    assert queries.execute_jq(str(path), "last(range(1e12))", timeout=0.5) == (
+        False,
+        "jq query timed out after 0.5 seconds.",
+    )
+
+
+def _run_stored(tmp_path, tool, name, data):
+    """Run a stored query against a throwaway response file and parse its output."""
+    from zendesk_skill.queries import execute_jq, get_query
+
+    path = tmp_path / f"{tool}.json"
+    path.write_text(json.dumps({"data": data}))
+    success, result = execute_jq(str(path), get_query(tool, name))
+    assert success, result
+    return json.loads(result)
+
+
+def test_stored_comment_queries(tmp_path):
+    """Single-pass comment queries keep their original output shape."""
+    import shutil
+
+    from zendesk_skill import queries
+
+    if queries.jq is None and shutil.which("jq") is None:
+        pytest.skip("needs jq")
+
+    comments = [
+        {"id": 1, "author_id": 7, "body": "We CALLED them", "public": True, "via": {"channel": "web"}},
+        {"id": 2, "author_id": 8, "plain_body": "internal", "body": "x", "public": False, "via": {"channel": "api"}},
+        {"id": 3, "author_id": 7, "body": "thanks", "public": True, "via": {"channel": "web"}},
+    ]
+    data = {"comments": comments, "ticket": {"requester_id": 7}}
+
+    assert _run_stored(tmp_path, "ticket_details", "comment_count", data) == {"total": 3, "public": 2, "private": 1}
+    assert _run_stored(tmp_path, "ticket_details", "conversation_stats", data) == {
+        "total_messages": 3,
+        "public_messages": 2,
+        "private_notes": 1,
+        "unique_authors": 2,
+        "requester_id": 7,
+    }
+    assert _run_stored(tmp_path, "ticket_details", "channel_analysis", data) == [
+        {"channel": "api", "count": 1},
+        {"channel": "web", "count": 2},
+    ]
+    mentions = _run_stored(tmp_path, "ticket_details", "call_mentions", data)
+    assert [m["id"] for m in mentions] == [1]
+    assert mentions[0]["snippet"] == "We CALLED them"
+
+
+@pytest.mark.parametrize(
+    "name,original",
+    [
+        (
+            "comment_count",
+            "{total: (.data.comments | length), public: ([.data.comments[] | select(.public == true)] | length), "
+            "private: ([.data.comments[] | select(.public == false)] | length)}",
+        ),
+        (
+            "conversation_stats",
+            "{total_messages: (.data.comments | length), public_messages: ([.data.comments[] | select(.public == true)] | length), "
+            "private_notes: ([.data.comments[] | select(.public == false)] | length), "
+            "unique_authors: ([.data.comments[].author_id] | unique | length), requester_id: .data.ticket.requester_id}",
+        ),
+    ],
+)
+@pytest.mark.parametrize(
+    "comments",
+    [
+        [],
+        [{"author_id": 1, "public": True}, {"author_id": 2, "public": False}, {"author_id": 1, "public": None}, {"author_id": 3}],
+        [{"author_id": 5, "public": "yes"}, {"author_id": None, "public": True}],
+    ],
+)
+def test_comment_stat_queries_match_original(tmp_path, name, original, comments):
+    """Comment count queries that bind the array once give the original queries' output."""
+    import shutil
+
+    from zendesk_skill import queries
+
+    if queries.jq is None and shutil.which("jq") is None:
+        pytest.skip("needs jq")
+
+    data = {"comments": comments, "ticket": {"requester_id": 9}}
+    path = tmp_path / "ticket_details.json"
+    path.write_text(json.dumps({"data": data}))
+    success, expected = queries.execute_jq(str(path), original)
+    assert success, expected
+
+    assert _run_stored(tmp_path, "ticket_details", name, data) == json.loads(expected)
+
+
+def test_execute_jq_batch_matches_single_queries(tmp_path, monkeypatch):
+    """A batch run returns the same results as running each query alone."""
+    import shutil
+
+    from zendesk_skill import queries
+
+    if queries.jq is None and shutil.which("jq") is None:
+        pytest.skip("needs jq")
+
+    path = tmp_path / "ticket_details.json"
+    path.write_text(json.dumps({"data": {
+        "ticket": {"id": 1, "subject": "s", "requester_id": 7},
+        "comments": [{"id": 1, "author_id": 7, "body": "hi", "public": True, "attachments": []}],
+    }}))
+
+    names = ["comment_count", "nope", "latest_comment"]
+    batch = queries.execute_jq_batch(str(path), "ticket_details", names)
+    assert list(batch) == names
+    assert batch["nope"][0] is False
+    for name in ("comment_count", "latest_comment"):
+        assert batch[name] == queries.execute_jq(str(path), queries.get_query("ticket_details", name))
+
+    # Without the binding, the whole batch is one jq subprocess
+    if shutil.which("jq") is not None:
+        import subprocess
+
+        monkeypatch.setattr(queries, "jq", None)
+        runs = []
+        real_run = subprocess.run
+        monkeypatch.setattr(queries.subprocess, "run", lambda *a, **kw: runs.append(a) or real_run(*a, **kw))
+        assert queries.execute_jq_batch(str(path), "ticket_details", names) == batch
+        assert len(runs) == 1
+
+
+def test_execute_jq_batch_reports_timeout(tmp_path, monkeypatch):
+    """A timed-out batch is reported per query, with a size-derived timeout, not rerun."""
+    import subprocess
+
+    from zendesk_skill import queries
+
+    path = tmp_path / "ticket_details.json"
+    path.write_bytes(b'{"data": {"comments": []}}' + b" " * (30 * 1024 * 1024))
+    monkeypatch.setattr(queries, "jq", None)
+    timeouts = []
+
+    def fake_run(cmd, **kw):
+        timeouts.append(kw["timeout"])
+        raise subprocess.TimeoutExpired(cmd, kw["timeout"])
+
+    monkeypatch.setattr(queries.subprocess, "run", fake_run)
+    batch = queries.execute_jq_batch(str(path), "ticket_details", ["comment_count", "attachments"])
+
+    assert timeouts == [queries._cli_timeout(path.stat().st_size)]
+    assert timeouts[0] > queries.JQ_MIN_TIMEOUT
+    message = f"jq query timed out after {timeouts[0]:g} seconds."
+    assert batch == {"comment_count": (False, message), "attachments": (False, message)}
+
+
+def test_execute_jq_many_keeps_order(tmp_path, monkeypatch):
+    """execute_jq_many returns per-item results in input order on both paths."""
+    import shutil
+
+    from zendesk_skill import queries
+
+    if shutil.which("jq") is None:
+        pytest.skip("needs the jq CLI")
+
+    paths = []
+    for n in range(3):
+        path = tmp_path / f"r{n}.json"
+        path.write_text(json.dumps({"data": {"n": n}}))
+        paths.append(str(path))
+    items = [(p, ".data.n") for p in paths] + [(str(tmp_path / "missing.json"), ".")]
+    expected = [(True, "0"), (True, "1"), (True, "2"), (False, f"File not found: {tmp_path / 'missing.json'}")]
+
+    assert queries.execute_jq_many(items) == expected
+    monkeypatch.setattr(queries, "jq", None)
+    assert queries.execute_jq_many(items) == expected
+
+
+def test_execute_jq_binds_variables(tmp_path, monkeypatch):
+    """Variables are bound as $name, like jq --argjson."""
+    import shutil
+
+    from zendesk_skill import queries
+
+    if shutil.which("jq") is None:
+        pytest.skip("needs the jq CLI")
+
+    path = tmp_path / "search.json"
+    path.write_text(json.dumps({"data": {"results": [{"id": i} for i in range(5)]}}))
+    query = ".data.results[0:$k] | map(.id)"
+
+    expected = (True, "[\n  0,\n  1\n]")
+    assert queries.execute_jq(str(path), query, variables={"k": 2}) == expected
+    monkeypatch.setattr(queries, "jq", None)
+    assert queries.execute_jq(str(path), query, variables={"k": 2}) == expected
+
+
+def test_format_query_result():
+    """Query results are pretty-printed and truncated with an accurate count."""
+    from zendesk_skill.queries import format_query_result
+
+    assert format_query_result(False, "boom") == "**Error:** boom"
+    assert format_query_result(True, '{"a":[1]}') == '```json\n{\n  "a": [\n    1\n  ]\n}\n```'
+    # Multi-value jq output isn't a single JSON document; shown as-is
+    assert format_query_result(True, "1\n2") == "```json\n1\n2\n```"
+
+    big = {"rows": [{"id": i, "name": "é" * 20} for i in range(2000)]}
+    truncated = format_query_result(True, json.dumps(big), max_length=300)
+    expected = json.dumps(big, indent=2, ensure_ascii=False)[:300]
+    assert truncated == f"```json\n{expected}\n\n... (truncated at 300 characters)\n```"
+
 
 def test_client_auth_header():
     """Test auth header building."""
@@ -593,6 +926,63 @@ def test_reporting_importable_directly():
     assert callable(generate_markdown_report)
 
 
+def test_prepare_report_view_derives_shared_values():
+    """Test the sorted/aggregated values shared by both reports."""
+    from zendesk_skill.reporting import prepare_report_view
+
+    report_data = {
+        "summary": {"total_tickets": 4},
+        "customer_stats": {"a.com": {"tickets": 1}, "b.com": {"tickets": 3}},
+        "ticket_analysis": [{"ticket_id": 1, "messages": 2}, {"ticket_id": 2, "messages": 9}],
+        "call_analysis": {"confirmed_calls": 2, "likely_calls": 1},
+        "resolution_stats": {"count": 3},
+        "reopen_count": 1,
+        "frt_by_priority": {"oncall_urgent": {"count": 2, "median_mins": 10}, "high": {"count": 0}},
+    }
+
+    view = prepare_report_view(report_data)
+    assert [c for c, _ in view.leading_customers(1)] == ["b.com"]
+    assert [c for c, _ in view.top_customers] == ["b.com", "a.com"]
+    assert [t["ticket_id"] for t in view.top_tickets] == [2, 1]
+    assert view.total_calls == 3
+    assert view.res_pct == 75
+    assert view.reopen_pct == 25
+    assert [(c, n) for c, n, _, _ in view.frt_lines_data] == [("oncall", 2)]
+
+    # The first key present wins, as in the original lookups
+    report_data["frt_by_priority"] = {"oncall": {}, "oncall_urgent": {"count": 2}}
+    assert prepare_report_view(report_data).frt_lines_data == []
+
+
+def test_slack_report_posts_plain_json(monkeypatch):
+    """Test that the Slack report is posted once as an uncompressed JSON body."""
+    import asyncio
+
+    import httpx
+
+    from zendesk_skill.reporting import send_slack_report
+
+    requests = []
+
+    async def fake_post(self, url, content=None, headers=None, timeout=None):
+        requests.append((content, headers))
+        return httpx.Response(200, text="ok")
+
+    monkeypatch.setattr(httpx.AsyncClient, "post", fake_post)
+
+    result = asyncio.get_event_loop().run_until_complete(
+        send_slack_report({}, channel="reports", webhook_url="https://hooks.example/x")
+    )
+
+    assert result["success"] is True
+    assert len(requests) == 1
+    content, headers = requests[0]
+    assert headers == {"Content-Type": "application/json"}
+    payload = json.loads(content)
+    assert payload["channel"] == "#reports"
+    assert isinstance(payload["blocks"], list)
+
+
 def test_mins_to_human_utility():
     """Test shared mins_to_human utility function."""
     from zendesk_skill.utils.time import mins_to_human
@@ -668,6 +1058,77 @@ def test_zendesk_client_http_client_reuse():
     assert http_client is http_client2
 
 
+def test_close_client_releases_singleton_pool(monkeypatch):
+    """Test that close_client closes the singleton's HTTP pool."""
+    import asyncio
+
+    import zendesk_skill.client as client_mod
+
+    client = client_mod.ZendeskClient(
+        email="test@example.com",
+        token="fake_token",
+        subdomain="test",
+    )
+    monkeypatch.setattr(client_mod, "_client", client)
+
+    http_client = client._get_http_client()
+    slack_http = client_mod.get_slack_http()
+    assert client_mod.get_slack_http() is slack_http
+    asyncio.get_event_loop().run_until_complete(client_mod.close_client())
+
+    assert http_client.is_closed
+    assert slack_http.is_closed
+    assert client_mod.get_client() is client
+
+
+def test_run_async_closes_keepalive_sockets(monkeypatch):
+    """Test that run_async closes pooled sockets before its event loop ends."""
+    import asyncio
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    import zendesk_skill.client as client_mod
+    from zendesk_skill.cli import run_async
+
+    disconnected = threading.Event()
+
+    class KeepAliveHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def finish(self):
+            super().finish()
+            disconnected.set()  # The client hung up
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(client_mod, "_slack_http", None)
+
+    async def post():
+        response = await client_mod.get_slack_http().post(f"http://127.0.0.1:{server.server_port}/", content=b"{}")
+        return response.text
+
+    loop = asyncio.get_event_loop()
+    try:
+        assert run_async(post()) == "ok"
+    finally:
+        # asyncio.run leaves no current loop; the other tests share this one
+        asyncio.set_event_loop(loop)
+        server.shutdown()
+
+    assert disconnected.wait(5)
+    assert client_mod._slack_http is None
+
+
 def test_storage_uses_sha256():
     """Test that storage uses SHA256 for file naming."""
     import hashlib
@@ -952,6 +1413,33 @@ def test_operations_get_user_wraps_name_and_email(monkeypatch):
     assert result["role"] == "end-user"
 
 
+def test_operations_get_ticket_details_fetches_concurrently(monkeypatch):
+    """Test that ticket and comments are requested concurrently."""
+    import asyncio
+
+    import zendesk_skill.operations as ops
+
+    comments_requested = asyncio.Event()
+
+    class MockClient:
+        async def get(self, endpoint, **kwargs):
+            if endpoint.endswith("comments.json"):
+                comments_requested.set()
+                return {"comments": [{"id": 1}, {"id": 2}]}
+            # Would deadlock if the comments request waited for this one
+            await asyncio.wait_for(comments_requested.wait(), timeout=5)
+            return {"ticket": {"id": 7, "subject": "Help", "status": "open"}}
+
+    monkeypatch.setattr(ops, "_get_client", lambda: MockClient())
+
+    result = asyncio.get_event_loop().run_until_complete(
+        ops.get_ticket_details("7", output_path="/dev/null")
+    )
+
+    assert result["id"] == 7
+    assert result["comment_count"] == 2
+
+
 def test_operations_search_users_wraps_names(monkeypatch):
     """Test that search_users wraps name/email per user."""
     import zendesk_skill.operations as ops
@@ -1137,3 +1625,723 @@ def test_download_attachment_binary_hint(tmp_path, monkeypatch):
     assert "security_note" in result
     assert "UNTRUSTED" in result["security_note"]
     assert "prompt-security-utils" in result["security_note"]
+
+
+def test_download_attachment_avoids_existing_names(tmp_path, monkeypatch):
+    """Duplicate filenames get the next free numeric suffix."""
+    from unittest.mock import MagicMock
+    import zendesk_skill.operations as ops
+
+    attachments_dir = tmp_path / "42" / "attachments"
+    attachments_dir.mkdir(parents=True)
+    for name in ("notes.txt", "notes_1.txt", "notes_3.txt"):
+        (attachments_dir / name).write_text("old")
+
+    async def fake_download(url, out_path):
+        out_path.write_bytes(b"new")
+        return out_path
+
+    mock_client = MagicMock()
+    mock_client.download_file = fake_download
+    monkeypatch.setattr(ops, "_get_client", lambda: mock_client)
+    monkeypatch.setattr(ops, "is_security_enabled", lambda: False)
+    monkeypatch.setattr(ops, "DEFAULT_STORAGE_DIR", tmp_path)
+
+    import asyncio
+    result = asyncio.get_event_loop().run_until_complete(
+        ops.download_attachment("https://example.com/file?name=notes.txt", ticket_id="42")
+    )
+    assert result["file_path"] == str(attachments_dir / "notes_2.txt")
+
+    result = asyncio.get_event_loop().run_until_complete(
+        ops.download_attachment("https://example.com/f?token=x&name=my%20report.pdf", ticket_id="42")
+    )
+    assert result["file_path"] == str(attachments_dir / "my report.pdf")
+
+
+def test_operations_get_ticket_metrics_summary(monkeypatch):
+    """Test that ticket metrics are summarized to calendar minutes."""
+    import zendesk_skill.operations as ops
+
+    class MockClient:
+        async def get(self, endpoint, **kwargs):
+            return {"ticket_metric": {
+                "replies": 3,
+                "reopens": 0,
+                "reply_time_in_minutes": {"calendar": 12, "business": 5},
+                "full_resolution_time_in_minutes": None,
+            }}
+
+    monkeypatch.setattr(ops, "_get_client", lambda: MockClient())
+
+    import asyncio
+    result = asyncio.get_event_loop().run_until_complete(
+        ops.get_ticket_metrics("5", output_path="/dev/null")
+    )
+    assert result["replies"] == 3
+    assert result["first_reply_time"] == 12
+    assert result["full_resolution_time"] is None
+    assert result["on_hold_time"] is None
+    assert result["file_path"] == "/dev/null"
+
+
+def test_operations_iter_search_tickets_prefetches(monkeypatch):
+    """Test that search paging requests the next page ahead of the caller."""
+    import asyncio
+
+    import zendesk_skill.operations as ops
+
+    requested = []
+
+    class MockClient:
+        async def get(self, endpoint, params=None, **kwargs):
+            page = params["page"]
+            requested.append(page)
+            return {
+                "results": [{"id": page}],
+                "next_page": f"https://x.zendesk.com/api/v2/search.json?page={page + 1}" if page < 3 else None,
+            }
+
+    monkeypatch.setattr(ops, "_get_client", lambda: MockClient())
+
+    async def consume():
+        pages = []
+        async for result in ops.iter_search_tickets("status:open"):
+            await asyncio.sleep(0)
+            # The following page is already in flight while this one is processed
+            assert len(requested) == min(result["results"][0]["id"] + 1, 3)
+            pages.append(result["results"][0]["id"])
+        return pages
+
+    pages = asyncio.get_event_loop().run_until_complete(consume())
+    assert pages == [1, 2, 3]
+    assert requested == [1, 2, 3]
+
+
+def test_operations_update_ticket_payload(monkeypatch, tmp_path):
+    """Test that update_ticket only sends provided fields."""
+    import asyncio
+
+    import zendesk_skill.operations as ops
+
+    sent = {}
+
+    class MockClient:
+        async def put(self, endpoint, json_data=None, **kwargs):
+            sent.update(json_data)
+            return {"ticket": {"id": 9, "status": "open"}}
+
+    monkeypatch.setattr(ops, "_get_client", lambda: MockClient())
+
+    asyncio.get_event_loop().run_until_complete(
+        ops.update_ticket("9", status="open", assignee_id="12", tags=[], output_path=str(tmp_path / "out.json"))
+    )
+    assert sent == {"ticket": {"status": "open", "assignee_id": 12, "tags": []}}
+
+    with pytest.raises(ValueError, match="No update fields"):
+        asyncio.get_event_loop().run_until_complete(ops.update_ticket("9", subject=""))
+
+
+def test_operations_get_tickets_bulk_limits_concurrency(monkeypatch, tmp_path):
+    """Test that get_tickets_bulk fans out within the concurrency limit."""
+    import asyncio
+
+    import zendesk_skill.operations as ops
+
+    in_flight = 0
+    peak = 0
+
+    class MockClient:
+        async def get(self, endpoint, params=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            ticket_id = int(endpoint.split("/")[1].split(".")[0])
+            if ticket_id == 3:
+                raise RuntimeError("not found")
+            return {"ticket": {"id": ticket_id, "subject": "s", "status": "open"}}
+
+    monkeypatch.setattr(ops, "_get_client", lambda: MockClient())
+
+    result = asyncio.get_event_loop().run_until_complete(
+        ops.get_tickets_bulk(
+            [str(i) for i in range(1, 7)], concurrency=2, output_path=str(tmp_path / "bulk.json")
+        )
+    )
+    assert peak == 2
+    assert result["count"] == 5
+    assert [t["id"] for t in result["tickets"]] == [1, 2, 4, 5, 6]
+    assert result["failed"] == {"3": "not found"}
+
+
+def test_client_download_file_streams_to_disk(tmp_path, monkeypatch):
+    """Test that download_file streams the body and reports HTTP errors."""
+    import asyncio
+
+    import httpx
+
+    import zendesk_skill.client as client_mod
+    from zendesk_skill.client import ZendeskAPIError, ZendeskClient
+
+    body = b"x" * (client_mod.DOWNLOAD_CHUNK_SIZE * 2 + 10)
+
+    def handler(request):
+        if request.url.path == "/missing":
+            return httpx.Response(404, json={"error": "RecordNotFound", "description": "gone"})
+        return httpx.Response(200, content=body)
+
+    real_async_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        client_mod.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_async_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    zd = ZendeskClient(email="a@b.com", token="t", subdomain="example")
+    loop = asyncio.get_event_loop()
+
+    out = loop.run_until_complete(zd.download_file("https://example.com/file", tmp_path / "a" / "f.bin"))
+    assert out.read_bytes() == body
+
+    with pytest.raises(ZendeskAPIError, match="gone"):
+        loop.run_until_complete(zd.download_file("https://example.com/missing", tmp_path / "m.bin"))
+    assert not (tmp_path / "m.bin").exists()
+
+
+def test_client_http_cache_revalidates_with_etag(tmp_path, monkeypatch):
+    """Test the opt-in GET cache: fresh hits skip the network, stale ones revalidate."""
+    import asyncio
+
+    import httpx
+
+    import zendesk_skill.client as client_mod
+    from zendesk_skill.client import ZendeskClient
+
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"ticket": {"id": 1}}, headers={"ETag": '"v1"'})
+
+    monkeypatch.setenv("ZENDESK_HTTP_CACHE", "1")
+    monkeypatch.setattr(client_mod, "HTTP_CACHE_DIR", tmp_path)
+    zd = ZendeskClient(email="a@b.com", token="t", subdomain="example")
+    zd._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    loop = asyncio.get_event_loop()
+
+    assert loop.run_until_complete(zd.get("tickets/1.json")) == {"ticket": {"id": 1}}
+    assert loop.run_until_complete(zd.get("tickets/1.json")) == {"ticket": {"id": 1}}
+    assert seen == [None]
+
+    monkeypatch.setattr(client_mod, "HTTP_CACHE_TTL", 0.0)
+    assert loop.run_until_complete(zd.get("tickets/1.json")) == {"ticket": {"id": 1}}
+    assert seen == [None, '"v1"']
+
+    # Writes are never cached
+    loop.run_until_complete(zd.put("tickets/1.json", json_data={}))
+    assert seen[-1] is None
+
+
+def test_client_http_cache_is_private_and_invalidated(tmp_path, monkeypatch):
+    """Test that cache entries are per-credential, owner-only, and dropped by writes."""
+    import asyncio
+    import stat
+
+    import httpx
+
+    import zendesk_skill.client as client_mod
+    from zendesk_skill.client import ZendeskClient
+
+    seen = []
+
+    def handler(request):
+        seen.append((request.method, request.url.path))
+        return httpx.Response(200, json={"n": len(seen)})
+
+    monkeypatch.setenv("ZENDESK_HTTP_CACHE", "1")
+    monkeypatch.setattr(client_mod, "HTTP_CACHE_DIR", tmp_path / "http_cache")
+    loop = asyncio.get_event_loop()
+
+    def client(email):
+        zd = ZendeskClient(email=email, token="t", subdomain="example")
+        zd._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return zd
+
+    alice, bob = client("alice@example.com"), client("bob@example.com")
+    assert loop.run_until_complete(alice.get("tickets/1/comments.json")) == {"n": 1}
+    assert loop.run_until_complete(alice.get("tickets.json")) == {"n": 2}
+    assert loop.run_until_complete(alice.get("users/7.json")) == {"n": 3}
+    # Another account doesn't see alice's entries
+    assert loop.run_until_complete(bob.get("tickets/1/comments.json")) == {"n": 4}
+
+    paths = list((tmp_path / "http_cache").rglob("*"))
+    assert paths
+    for path in paths:
+        assert stat.S_IMODE(path.stat().st_mode) & 0o077 == 0, path
+
+    # Updating the ticket drops its cached comments and the ticket list for every
+    # account, but not other resources
+    loop.run_until_complete(alice.put("tickets/1.json", json_data={}))
+    assert loop.run_until_complete(alice.get("tickets/1/comments.json")) == {"n": 6}
+    assert loop.run_until_complete(alice.get("tickets.json")) == {"n": 7}
+    assert loop.run_until_complete(bob.get("tickets/1/comments.json")) == {"n": 8}
+    assert loop.run_until_complete(alice.get("users/7.json")) == {"n": 3}
+
+
+def test_client_http_cache_prunes_and_ignores_bad_entries(tmp_path, monkeypatch):
+    """Test that expired entries are pruned on write and malformed ones are misses."""
+    import asyncio
+    import os
+    import time
+
+    import httpx
+
+    import zendesk_skill.client as client_mod
+    from zendesk_skill.client import ZendeskClient
+
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"n": len(calls)})
+
+    cache_dir = tmp_path / "http_cache"
+    monkeypatch.setenv("ZENDESK_HTTP_CACHE", "1")
+    monkeypatch.setattr(client_mod, "HTTP_CACHE_DIR", cache_dir)
+    monkeypatch.setattr(client_mod, "_http_cache_pruned_at", 0.0)
+    zd = ZendeskClient(email="a@b.com", token="t", subdomain="example")
+    zd._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    loop = asyncio.get_event_loop()
+
+    # An entry from an old credential, last written two days ago
+    stale = cache_dir / "old-identity" / "resource" / "entry.json"
+    stale.parent.mkdir(parents=True)
+    stale.write_text("{}")
+    os.utime(stale, (0, time.time() - 2 * client_mod.HTTP_CACHE_MAX_AGE))
+
+    assert loop.run_until_complete(zd.get("tickets/1.json")) == {"n": 1}
+    assert not (cache_dir / "old-identity").exists()
+    (entry,) = cache_dir.rglob("*.json")
+
+    for bad in ("[]", '{"stored_at": 1}', "not json"):
+        entry.write_text(bad)
+        assert loop.run_until_complete(zd.get("tickets/1.json"))["n"] == len(calls)
+    assert len(calls) == 4
+
+
+def test_operations_add_comment_payloads(monkeypatch, tmp_path):
+    """Test that notes are private and comments public."""
+    import asyncio
+
+    import zendesk_skill.operations as ops
+
+    sent = []
+
+    class MockClient:
+        async def put(self, endpoint, json_data=None, **kwargs):
+            sent.append((endpoint, json_data["ticket"]["comment"]["public"]))
+            return {"ticket": {"id": 5}}
+
+    monkeypatch.setattr(ops, "_get_client", lambda: MockClient())
+    loop = asyncio.get_event_loop()
+
+    note = loop.run_until_complete(
+        ops.add_private_note("5", "internal", output_path=str(tmp_path / "n.json"))
+    )
+    comment = loop.run_until_complete(
+        ops.add_public_comment("5", "hello", output_path=str(tmp_path / "c.json"))
+    )
+    assert sent == [("tickets/5.json", False), ("tickets/5.json", True)]
+    assert (note["public"], comment["public"]) == (False, True)
+
+
+def test_operations_bulk_config_snapshot(monkeypatch, tmp_path):
+    """Test that bulk_config_snapshot gathers all reads and isolates failures."""
+    import asyncio
+
+    import zendesk_skill.operations as ops
+    from zendesk_skill.client import ZendeskAPIError
+
+    class MockClient:
+        async def get(self, endpoint, **kwargs):
+            if endpoint == "tags.json":
+                raise ZendeskAPIError("Rate limit exceeded.", 429)
+            return {
+                "groups.json": {"groups": [{"id": 1, "name": "Support"}]},
+                "slas/policies.json": {"sla_policies": []},
+                "users/me.json": {"user": {"id": 7, "role": "agent"}},
+            }[endpoint]
+
+    monkeypatch.setattr(ops, "_get_client", lambda: MockClient())
+    monkeypatch.setattr("zendesk_skill.storage.DEFAULT_STORAGE_DIR", tmp_path)
+
+    snapshot = asyncio.get_event_loop().run_until_complete(ops.bulk_config_snapshot())
+    assert snapshot["groups"]["groups"] == [{"id": 1, "name": "Support"}]
+    assert snapshot["tags"] == {"error": "Rate limit exceeded."}
+    assert snapshot["sla_policies"]["count"] == 0
+    assert snapshot["current_user"]["role"] == "agent"
+
+
+def test_operations_list_sla_policies_first_reply_targets(monkeypatch, tmp_path):
+    """Test that SLA summaries keep only first reply time targets."""
+    import asyncio
+
+    import zendesk_skill.operations as ops
+
+    class MockClient:
+        async def get(self, endpoint, **kwargs):
+            return {"sla_policies": [{
+                "id": 1,
+                "title": "Default",
+                "policy_metrics": [
+                    {"metric": "first_reply_time", "priority": "urgent", "target": 60},
+                    {"metric": "next_reply_time", "priority": "urgent", "target": 120},
+                    {"metric": "first_reply_time", "target": 480},
+                ],
+            }, {"id": 2, "title": "Empty"}]}
+
+    monkeypatch.setattr(ops, "_get_client", lambda: MockClient())
+
+    result = asyncio.get_event_loop().run_until_complete(
+        ops.list_sla_policies(output_path=str(tmp_path / "sla.json"))
+    )
+    assert result["policies"] == [
+        {"id": 1, "title": "Default", "first_reply_targets_mins": {"urgent": 60, "unknown": 480}},
+        {"id": 2, "title": "Empty"},
+    ]
+
+
+def test_slack_report_cmd_shares_prepared_view(tmp_path, monkeypatch):
+    """Test that slack-report --markdown builds the prepared view once for both reports."""
+    import asyncio
+
+    from typer.testing import CliRunner
+
+    import zendesk_skill.cli as cli
+    import zendesk_skill.operations as ops
+
+    analysis = tmp_path / "support_analysis.json"
+    analysis.write_text(json.dumps({"summary": {"total_tickets": 0}}))
+    views = []
+
+    async def fake_send(report_data, channel=None, prepared=None):
+        views.append(prepared)
+        return {"success": True, "message": "sent", "channel": "#support"}
+
+    def fake_markdown(report_data, prepared=None):
+        views.append(prepared)
+        return "# Report"
+
+    monkeypatch.setattr(ops, "send_slack_report", fake_send)
+    monkeypatch.setattr(ops, "generate_markdown_report", fake_markdown)
+    # asyncio.run would close the loop the other tests share
+    monkeypatch.setattr(cli, "run_async", lambda coro: asyncio.get_event_loop().run_until_complete(coro))
+
+    md_path = tmp_path / "report.md"
+    result = CliRunner().invoke(cli.app, ["slack-report", str(analysis), "--markdown", str(md_path)])
+
+    assert result.exit_code == 0, result.output
+    assert md_path.read_text() == "# Report"
+    assert len(views) == 2 and views[0] is views[1] is not None
+
+
+def test_slack_report_multi_builds_once(monkeypatch):
+    """Test that send_slack_report_multi posts one set of blocks to every target."""
+    import asyncio
+
+    import httpx
+
+    import zendesk_skill.reporting as reporting
+
+    posted = []
+    builds = []
+    real_build = reporting._build_report_blocks
+
+    def counting_build(report_data, prepared):
+        builds.append(report_data)
+        return real_build(report_data, prepared)
+
+    async def fake_post(self, url, content=None, headers=None, timeout=None):
+        posted.append((url, json.loads(content)["channel"]))
+        if url.endswith("/bad"):
+            return httpx.Response(404, text="no_service")
+        return httpx.Response(200, text="ok")
+
+    monkeypatch.setattr(reporting, "_build_report_blocks", counting_build)
+    monkeypatch.setattr(httpx.AsyncClient, "post", fake_post)
+
+    results = asyncio.get_event_loop().run_until_complete(
+        reporting.send_slack_report_multi(
+            {}, [("https://hooks.example/a", "support"), ("https://hooks.example/bad", "#ops")]
+        )
+    )
+
+    assert len(builds) == 1
+    assert sorted(posted) == [("https://hooks.example/a", "#support"), ("https://hooks.example/bad", "#ops")]
+    assert results[0]["success"] is True
+    assert results[1] == {"success": False, "error": "Slack API error: no_service"}
+
+
+def test_client_caps_concurrent_requests(monkeypatch):
+    """Test that ZENDESK_MAX_CONCURRENCY bounds requests in flight."""
+    import asyncio
+
+    import httpx
+
+    from zendesk_skill.client import ZendeskClient
+
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={})
+
+    monkeypatch.setenv("ZENDESK_MAX_CONCURRENCY", "3")
+    monkeypatch.delenv("ZENDESK_HTTP_CACHE", raising=False)
+    zd = ZendeskClient(email="a@b.com", token="t", subdomain="example")
+    zd._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def fan_out():
+        await asyncio.gather(*(zd.get(f"tickets/{i}.json") for i in range(10)))
+
+    asyncio.get_event_loop().run_until_complete(fan_out())
+    assert peak == 3
+
+
+def test_storage_recreates_removed_directory(tmp_path, monkeypatch):
+    """Test that save_response recovers if its storage directory is deleted."""
+    import shutil
+
+    import zendesk_skill.storage as storage
+
+    monkeypatch.setattr(storage, "DEFAULT_STORAGE_DIR", tmp_path / "store")
+
+    first, _ = storage.save_response("tags", {"n": 1}, {"tags": []})
+    shutil.rmtree(tmp_path / "store")
+    second, _ = storage.save_response("tags", {"n": 2}, {"tags": []})
+
+    assert Path(second).exists()
+    assert Path(first).parent == Path(second).parent
+
+
+def test_operations_auth_login_returns_user_brief(monkeypatch, tmp_path):
+    """Test that auth_login validates via users/me and keeps only identity fields."""
+    import asyncio
+
+    import zendesk_skill.operations as ops
+
+    class FakeClient:
+        def __init__(self, **kwargs):
+            pass
+
+        async def get(self, endpoint, **kwargs):
+            assert endpoint == "users/me.json"
+            return {"user": {"id": 3, "name": "Ann", "email": "a@b.com", "role": "admin", "photo": {}}}
+
+        async def close(self):
+            closed.append(self)
+
+    closed = []
+    monkeypatch.setattr(ops, "ZendeskClient", FakeClient)
+    monkeypatch.setattr(ops, "save_credentials", lambda *args: tmp_path / "config.json")
+
+    result = asyncio.get_event_loop().run_until_complete(ops.auth_login("a@b.com", "t", "example"))
+    assert result["success"] is True
+    assert result["user"] == {"id": 3, "name": "Ann", "email": "a@b.com", "role": "admin"}
+    assert len(closed) == 1
+
+
+def test_operations_auth_login_reports_missing_credentials(monkeypatch):
+    """Test that auth_login returns an error dict when the client can't be built."""
+    import asyncio
+
+    import zendesk_skill.operations as ops
+    from zendesk_skill.client import ZendeskAuthError
+
+    def failing_client(**kwargs):
+        raise ZendeskAuthError("Zendesk credentials not configured.")
+
+    monkeypatch.setattr(ops, "ZendeskClient", failing_client)
+
+    result = asyncio.get_event_loop().run_until_complete(ops.auth_login("", "", ""))
+    assert result == {
+        "success": False,
+        "error": "Zendesk credentials not configured.",
+        "user": None,
+        "config_path": None,
+    }
+
+
+def test_operations_check_auth_status_reports_errors(monkeypatch):
+    """Test that check_auth_status reports API and unexpected errors."""
+    import asyncio
+
+    import zendesk_skill.operations as ops
+    from zendesk_skill.client import ZendeskAPIError
+
+    error = ZendeskAPIError("Authentication failed.", 401)
+
+    class MockClient:
+        async def get(self, endpoint, **kwargs):
+            raise error
+
+    monkeypatch.setattr(ops, "get_auth_status", lambda: {"configured": True, "config_path": "x"})
+    monkeypatch.setattr(ops, "_get_client", lambda: MockClient())
+    loop = asyncio.get_event_loop()
+
+    assert loop.run_until_complete(ops.check_auth_status())["error"] == "Authentication failed."
+    error = KeyError("user")
+    assert loop.run_until_complete(ops.check_auth_status())["error"] == "Unexpected error: 'user'"
+
+
+# Expected values computed with the original day-by-day loop, in Europe/Athens
+_WEEKDAYS_9_TO_18 = {"start_hour": 9, "end_hour": 18, "workdays": [0, 1, 2, 3, 4]}
+_EVERY_DAY_1_TO_18 = {"start_hour": 1, "end_hour": 18, "workdays": list(range(7))}
+
+
+@pytest.mark.parametrize(
+    "start,end,config,expected",
+    [
+        # Tue 17:30 -> Wed 10:15 local, across midnight
+        ("2026-03-10T15:30:00+00:00", "2026-03-11T08:15:00+00:00", _WEEKDAYS_9_TO_18, 105.0),
+        # Fri 16:00 -> Mon 12:45 local, across a weekend
+        ("2026-03-13T14:00:00+00:00", "2026-03-16T10:45:00+00:00", _WEEKDAYS_9_TO_18, 345.0),
+        # Across the spring-forward and fall-back changes (both on a Sunday)
+        ("2026-03-28T12:00:00+00:00", "2026-03-30T09:00:00+00:00", _EVERY_DAY_1_TO_18, 1920.0),
+        ("2026-10-24T12:00:00+00:00", "2026-10-26T09:00:00+00:00", _EVERY_DAY_1_TO_18, 1800.0),
+        # Start and end inside the same business window
+        ("2026-03-10T08:05:00+00:00", "2026-03-10T11:35:30+00:00", _WEEKDAYS_9_TO_18, 210.5),
+        # Start after end
+        ("2026-03-11T10:00:00+00:00", "2026-03-10T10:00:00+00:00", _WEEKDAYS_9_TO_18, 0.0),
+        # Several weeks, counted arithmetically
+        ("2026-02-27T16:20:00+00:00", "2026-03-18T07:10:00+00:00", _WEEKDAYS_9_TO_18, 6490.0),
+    ],
+)
+def test_calculate_business_minutes_matches_original(start, end, config, expected):
+    """Business minutes match the original day-by-day loop."""
+    from datetime import datetime
+    from zoneinfo import ZoneInfo
+
+    from zendesk_skill.scripts.analyze_support_metrics import _calculate_business_minutes
+
+    tz = ZoneInfo("Europe/Athens")
+    minutes = _calculate_business_minutes(datetime.fromisoformat(start), datetime.fromisoformat(end), config, tz)
+    assert minutes == expected
+
+
+@pytest.mark.parametrize(
+    "local,config,expected",
+    [
+        ("2026-03-09T09:00", _WEEKDAYS_9_TO_18, True),  # Monday, exactly at start
+        ("2026-03-09T08:59", _WEEKDAYS_9_TO_18, False),
+        ("2026-03-09T17:59", _WEEKDAYS_9_TO_18, True),  # one minute before end
+        ("2026-03-09T18:00", _WEEKDAYS_9_TO_18, False),
+        ("2026-03-14T10:00", _WEEKDAYS_9_TO_18, False),  # Saturday
+        ("2026-03-15T10:00", {"start_hour": 10, "end_hour": 14, "workdays": [5, 6]}, True),  # Sunday
+        ("2026-03-15T14:00", {"start_hour": 10, "end_hour": 14, "workdays": [5, 6]}, False),
+        ("2026-03-09T10:00", {"start_hour": 10, "end_hour": 14, "workdays": [5, 6]}, False),
+        ("2026-03-09T10:00", {}, True),  # defaults: Mon-Fri 9-18
+    ],
+)
+def test_is_business_hours_mask_boundaries(local, config, expected):
+    """The business hours bitmap agrees with the original hour/weekday checks."""
+    from datetime import datetime
+    from zoneinfo import ZoneInfo
+
+    from zendesk_skill.scripts.analyze_support_metrics import business_hours_mask, is_business_hours
+
+    dt = datetime.fromisoformat(local).replace(tzinfo=ZoneInfo("Europe/Athens"))
+    assert is_business_hours(dt, business_hours_mask(config)) is expected
+
+
+# One sample per alternative in the setup, happened, link and duration patterns
+_CALL_SAMPLES = [
+    "quick call?", "can we setup a call", "scheduled a call", "let's call", "a call to discuss",
+    "join the zoom", "meeting invitation", "phone call", "can you call", "available for a call",
+    "connect on Monday",
+    "our call ended", "we closed our call", "after the meeting", "meeting notes", "following our call",
+    "spoke with Bob", "talked to Ann", "on the call", "during our call", "state after the call",
+    "https://zoom.us/j/123", "https://teams.microsoft.com/l/x", "https://meet.google.com/abc",
+    "a 4.5-hour call", "a 45 minute meeting", "call lasted about 2 hours", "meeting took 30 minutes",
+]
+
+
+@pytest.mark.parametrize("sample", _CALL_SAMPLES)
+def test_detect_calls_hint_covers_patterns(monkeypatch, sample):
+    """The call keyword prefilter never hides a comment the full patterns would count."""
+    import re
+
+    from zendesk_skill.scripts import analyze_support_metrics as asm
+
+    comments = [{"body": "Thanks, closing this out."}, {"body": f"Hi, {sample}.", "created_at": "2026-03-10T10:00:00Z"}]
+    result = asm.detect_calls(comments)
+    assert result["detected"] or result["links"] or result["call_durations"], sample
+
+    monkeypatch.setattr(asm, "_CALL_HINT_RE", re.compile(""))
+    assert asm.detect_calls(comments) == result
+
+
+def test_fetch_user_emails_saves_users_for_later_runs(tmp_path, monkeypatch, capsys):
+    """Users from chunks that succeed are returned and saved; a failed chunk only warns."""
+    import asyncio
+
+    import zendesk_skill.storage as storage
+    from zendesk_skill.client import ZendeskAPIError
+    from zendesk_skill.scripts import analyze_support_metrics as asm
+
+    requested = []
+
+    class MockClient:
+        async def get(self, endpoint, params=None):
+            ids = params["ids"].split(",")
+            requested.append(len(ids))
+            if ids[0] == "100":
+                raise ZendeskAPIError("Rate limited.", 429)
+            return {"users": [{"id": 1, "email": "a@example.com"}, {"id": 2, "email": "b@example.com"}]}
+
+    async def close_client():
+        pass
+
+    monkeypatch.setattr(storage, "DEFAULT_STORAGE_DIR", tmp_path / "store")
+    monkeypatch.setattr(storage, "is_security_enabled", lambda: False)
+    monkeypatch.setattr(asm, "get_client", lambda: MockClient())
+    monkeypatch.setattr(asm, "close_client", close_client)
+    monkeypatch.setattr(asm, "reset_client", lambda: None)
+
+    emails = asyncio.get_event_loop().run_until_complete(asm._fetch_user_emails(list(range(150))))
+
+    assert sorted(requested) == [50, 100]
+    assert emails == {1: "a@example.com", 2: "b@example.com"}
+    assert "Warning: Failed to fetch users: Rate limited." in capsys.readouterr().err
+    assert asm.index_user_emails(tmp_path / "store") == emails
+
+
+def test_read_ahead_keeps_order_and_bounded_window(tmp_path, monkeypatch):
+    """read_ahead yields files in order and reads only a window ahead of the consumer."""
+    from zendesk_skill.scripts import analyze_support_metrics as asm
+
+    paths = []
+    for n in range(10):
+        path = tmp_path / f"t{n}.json"
+        path.write_text(json.dumps({"n": n}))
+        paths.append(path)
+    paths.insert(3, None)
+
+    read = []
+    real_load = asm.jsonio.load_file
+    monkeypatch.setattr(asm.jsonio, "load_file", lambda path: read.append(path) or real_load(path))
+
+    docs = asm.read_ahead(paths, workers=2)
+    assert next(docs) == {"n": 0}
+    assert len(read) <= 5  # the window of 2 * workers, plus the file just yielded
+    rest = list(docs)
+    assert rest[2] is None
+    assert [d["n"] for d in rest if d is not None] == list(range(1, 10))